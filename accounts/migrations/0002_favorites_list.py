@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_favorites_lists(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    WordList = apps.get_model('words', 'WordList')
+
+    for list_id, user_id in WordList.objects.filter(
+        name='Favorites', list_type='FAV'
+    ).values_list('id', 'user_id'):
+        CustomUser.objects.filter(id=user_id).update(favorites_list_id=list_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('words', '0012_word_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='favorites_list',
+            field=models.ForeignKey(blank=True, help_text="The user's Favorites list, created at signup", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='words.wordlist'),
+        ),
+        migrations.RunPython(link_favorites_lists, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,13 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class CustomUser(AbstractUser):
-    pass
+    favorites_list = models.ForeignKey(
+        "words.WordList",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="The user's Favorites list, created at signup",
+    )
@@ -1 +1,32 @@
-# Create your tests here.
+"""
+Tests for the accounts app.
+"""
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words.models import WordList
+
+
+class SignupTests(TestCase):
+    """Tests for account creation."""
+
+    def test_signup_creates_favorites_list(self):
+        """Test that a new user gets a Favorites list linked from the user row."""
+        user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+
+        user.refresh_from_db()
+        favorites = WordList.objects.get(user=user, name="Favorites")
+        self.assertEqual(user.favorites_list_id, favorites.id)
+        self.assertEqual(favorites.list_type, "FAV")
+
+    def test_signup_view_logs_in(self):
+        """Test that signing up through the form redirects to the dashboard."""
+        response = Client().post(
+            reverse("signup"),
+            {"username": "newuser", "password1": "Xk2!pass-word", "password2": "Xk2!pass-word"},
+        )
+
+        self.assertRedirects(response, reverse("dashboard"))
+        self.assertIsNotNone(CustomUser.objects.get(username="newuser").favorites_list_id)
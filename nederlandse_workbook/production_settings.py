@@ -26,6 +26,15 @@ DATABASES = {
     }
 }
 
+# CACHE (shared by all Gunicorn workers through the file system)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_DIR", os.path.join(BASE_DIR, ".cache")),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
 # STATIC FILES
 STATIC_ROOT = os.getenv("STATIC_ROOT", os.path.join(BASE_DIR, "staticfiles"))
 STATIC_URL = "/static/"
@@ -0,0 +1,29 @@
+"""
+Answer timing for review cards and quiz questions, kept in the user's session.
+
+The session stores ``[item, shown_at]`` under a caller-chosen key: the item
+being answered and when it was first shown. Showing the same item again keeps
+the original time, so a reload neither restarts nor games the clock.
+"""
+
+from datetime import datetime
+
+from django.utils import timezone
+
+
+def mark_shown(session, key, item, now=None):
+    """Remember when ``item`` was first put in front of the user and return that time."""
+    shown = session.get(key)
+    if shown and shown[0] == item:
+        return datetime.fromisoformat(shown[1])
+    now = now or timezone.now()
+    session[key] = [item, now.isoformat()]
+    return now
+
+
+def elapsed_ms(session, key, item, now):
+    """Milliseconds since ``item`` was shown, or None if it was not; clears the mark."""
+    shown = session.pop(key, None)
+    if not shown or shown[0] != item:
+        return None
+    return int((now - datetime.fromisoformat(shown[1])).total_seconds() * 1000)
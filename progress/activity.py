@@ -0,0 +1,100 @@
+"""
+Cached, bit-packed per-user activity calendar.
+
+Bit ``i`` of the bitmap is set when the user reviewed or took a quiz on
+``start + i days``. A year of history packs into 46 bytes; it is built from one
+range query on a cache miss and kept in the shared cache, so every worker sees
+the same bitmap. The first activity of a day drops it; patching it in place
+instead could lose a concurrent update from another worker.
+"""
+
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DailyActivity
+
+WINDOW_DAYS = 365
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _cache_key(user_id):
+    return f"progress:activity-bitmap:{user_id}"
+
+
+class ActivityBitmap:
+    def __init__(self, start, bits=0):
+        self.start = start
+        self.bits = bits
+
+    def _index(self, day):
+        index = (day - self.start).days
+        return index if 0 <= index < WINDOW_DAYS else None
+
+    def is_active(self, day):
+        index = self._index(day)
+        return index is not None and bool(self.bits >> index & 1)
+
+    def set(self, day):
+        index = self._index(day)
+        if index is not None:
+            self.bits |= 1 << index
+
+    def active_days(self):
+        return self.bits.bit_count()
+
+    def shifted_to(self, start):
+        """Move the window forward to ``start``, dropping days that fall out of it."""
+        shift = (start - self.start).days
+        if shift <= 0:
+            return self
+        return ActivityBitmap(start, self.bits >> shift)
+
+    def pack(self):
+        return self.start.toordinal(), self.bits.to_bytes((WINDOW_DAYS + 7) // 8, "little")
+
+    @classmethod
+    def unpack(cls, packed):
+        start_ordinal, data = packed
+        return cls(date.fromordinal(start_ordinal), int.from_bytes(data, "little"))
+
+
+def window_start(today):
+    return today - timedelta(days=WINDOW_DAYS - 1)
+
+
+def _load(user_id, start):
+    bitmap = ActivityBitmap(start)
+    active_dates = DailyActivity.objects.filter(
+        Q(words_reviewed__gt=0) | Q(quizzes_completed__gt=0),
+        user_id=user_id,
+        date__gte=start,
+    ).values_list("date", flat=True)
+    for day in active_dates:
+        bitmap.set(day)
+    return bitmap
+
+
+def get_bitmap(user, today=None):
+    """Return the user's activity bitmap for the year ending ``today``."""
+    today = today or timezone.now().date()
+    start = window_start(today)
+    key = _cache_key(user.pk)
+
+    packed = cache.get(key)
+    if packed is not None and packed[0] == start.toordinal():
+        return ActivityBitmap.unpack(packed)
+
+    if packed is not None and packed[0] < start.toordinal():
+        bitmap = ActivityBitmap.unpack(packed).shifted_to(start)
+    else:
+        bitmap = _load(user.pk, start)
+    cache.set(key, bitmap.pack(), CACHE_TIMEOUT)
+    return bitmap
+
+
+def invalidate(user_id):
+    """Drop the cached bitmap after new activity, so the next read rebuilds it."""
+    cache.delete(_cache_key(user_id))
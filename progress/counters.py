@@ -0,0 +1,121 @@
+"""
+Atomic counters for UserProgress and DailyActivity.
+
+Increments are applied as a single ``UPDATE ... SET field = field + n`` statement,
+so concurrent workers never lose updates and untouched columns are not rewritten.
+Inside ``coalesce()`` (enabled per request by CounterCoalescingMiddleware)
+increments are buffered and each row is flushed with one UPDATE at the end.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DailyActivity, UserProgress
+from .streaks import STREAK_FIELDS, touch_streak
+
+
+class _Buffer:
+    def __init__(self):
+        self.counters = {}
+        self.streaks = {}
+
+
+_buffer = ContextVar("progress_counter_buffer", default=None)
+
+
+def increment(model, lookup, **deltas):
+    """Add ``deltas`` to the counters of the row matching ``lookup``, creating it if needed."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    buffer = _buffer.get()
+    if buffer is not None:
+        key = (model, tuple(sorted(lookup.items())))
+        buffer.counters.setdefault(key, Counter()).update(deltas)
+        return
+
+    _apply(model, lookup, deltas)
+
+
+def _apply(model, lookup, deltas):
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another worker created the row first
+        model.objects.filter(**lookup).update(**updates)
+
+
+def add_progress(user, **deltas):
+    increment(UserProgress, {"user_id": user.pk}, **deltas)
+
+
+def add_activity(user, day=None, **deltas):
+    day = day or timezone.now().date()
+    increment(DailyActivity, {"user_id": user.pk, "date": day}, **deltas)
+    if any(deltas.get(field) for field in STREAK_FIELDS):
+        buffer = _buffer.get()
+        if buffer is not None:
+            buffer.streaks[(user.pk, day)] = user
+        else:
+            touch_streak(user, day)
+
+
+def record_quiz(user, score):
+    """Count a completed quiz and fold its score into the running average in one UPDATE."""
+    updates = {
+        "total_quizzes": F("total_quizzes") + 1,
+        "average_score": (F("average_score") * F("total_quizzes") + score)
+        / (F("total_quizzes") + 1.0),
+    }
+    if UserProgress.objects.filter(user=user).update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            UserProgress.objects.create(user=user, total_quizzes=1, average_score=score)
+    except IntegrityError:
+        UserProgress.objects.filter(user=user).update(**updates)
+
+
+@contextmanager
+def coalesce():
+    """Buffer increments made inside the block and flush them as one UPDATE per row."""
+    if _buffer.get() is not None:
+        yield
+        return
+
+    buffer = _Buffer()
+    token = _buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _buffer.reset(token)
+
+    _flush(buffer)
+
+
+def flush():
+    """Apply the increments buffered so far, e.g. to commit them in the caller's transaction."""
+    buffer = _buffer.get()
+    if buffer is not None:
+        _flush(buffer)
+
+
+def _flush(buffer):
+    counters, streaks = buffer.counters, buffer.streaks
+    buffer.counters, buffer.streaks = {}, {}
+    for (model, lookup), deltas in counters.items():
+        _apply(model, dict(lookup), dict(deltas))
+    for (_user_id, day), user in sorted(streaks.items(), key=lambda item: item[0][1]):
+        touch_streak(user, day)
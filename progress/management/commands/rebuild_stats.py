@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress.models import UserStats
+from progress.stats import COUNT_FIELDS, compute_stats, empty_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's UserStats row from flashcards, favorites and quizzes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report rows that have drifted from the source tables without saving",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        computed = compute_stats(now=now)
+        for user_id in CustomUser.objects.values_list("id", flat=True):
+            computed.setdefault(user_id, empty_stats(now))
+
+        to_update = []
+        drifted = []
+        for stats in UserStats.objects.all():
+            values = computed.pop(stats.user_id, None)
+            if values is None:
+                continue
+            diff = {
+                field: (getattr(stats, field), values[field])
+                for field in COUNT_FIELDS
+                if getattr(stats, field) != values[field]
+            }
+            if diff:
+                drifted.append((stats.user_id, diff))
+            for field, value in values.items():
+                setattr(stats, field, value)
+            to_update.append(stats)
+
+        to_create = [UserStats(user_id=user_id, **values) for user_id, values in computed.items()]
+
+        for user_id, diff in drifted:
+            changes = ", ".join(f"{field} {old} -> {new}" for field, (old, new) in diff.items())
+            self.stdout.write(f"User {user_id}: {changes}")
+
+        if options["check"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(drifted)} of {len(to_update)} stats rows have drifted")
+            )
+            return
+
+        with transaction.atomic():
+            UserStats.objects.bulk_update(
+                to_update, [*COUNT_FIELDS, "due_count", "due_valid_until"], batch_size=500
+            )
+            UserStats.objects.bulk_create(to_create, batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stats rebuilt: {len(to_update)} updated ({len(drifted)} drifted), "
+                f"{len(to_create)} created"
+            )
+        )
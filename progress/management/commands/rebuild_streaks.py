@@ -0,0 +1,98 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from progress.models import DailyActivity, UserProgress
+
+# Consecutive active days share the same (day number - row number) value, so each
+# streak is one group; the latest group per user is the current streak.
+STREAKS_SQL = """
+WITH active AS (
+    SELECT user_id, date,
+           {day_number} - ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY date) AS run
+    FROM {table}
+    WHERE words_reviewed > 0 OR quizzes_completed > 0
+), runs AS (
+    SELECT user_id, COUNT(*) AS length, MAX(date) AS last_day
+    FROM active
+    GROUP BY user_id, run
+), ranked AS (
+    SELECT user_id, length, last_day,
+           MAX(length) OVER (PARTITION BY user_id) AS longest,
+           ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY last_day DESC) AS position
+    FROM runs
+)
+SELECT user_id, length, longest, last_day FROM ranked WHERE position = 1
+"""
+
+DAY_NUMBER_SQL = {
+    "sqlite": "CAST(julianday(date) AS INTEGER)",
+    "postgresql": "(date - DATE '2000-01-01')",
+}
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's current and longest streak from DailyActivity"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many users would change without saving",
+        )
+
+    def handle(self, *args, **options):
+        day_number = DAY_NUMBER_SQL.get(connection.vendor, DAY_NUMBER_SQL["postgresql"])
+        sql = STREAKS_SQL.format(day_number=day_number, table=DailyActivity._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            streaks = {
+                user_id: (
+                    current,
+                    longest,
+                    date.fromisoformat(last_day) if isinstance(last_day, str) else last_day,
+                )
+                for user_id, current, longest, last_day in cursor.fetchall()
+            }
+
+        to_update = []
+        for progress in UserProgress.objects.only(
+            "user_id", "current_streak", "longest_streak", "last_activity"
+        ):
+            values = streaks.pop(progress.user_id, (0, 0, None))
+            current = (progress.current_streak, progress.longest_streak, progress.last_activity)
+            if current != values:
+                (
+                    progress.current_streak,
+                    progress.longest_streak,
+                    progress.last_activity,
+                ) = values
+                to_update.append(progress)
+
+        to_create = [
+            UserProgress(
+                user_id=user_id,
+                current_streak=current,
+                longest_streak=longest,
+                last_activity=last_day,
+            )
+            for user_id, (current, longest, last_day) in streaks.items()
+        ]
+
+        if not options["dry_run"]:
+            with transaction.atomic():
+                UserProgress.objects.bulk_update(
+                    to_update,
+                    ["current_streak", "longest_streak", "last_activity"],
+                    batch_size=500,
+                )
+                UserProgress.objects.bulk_create(to_create, batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Streaks rebuilt: {len(to_update)} updated, {len(to_create)} created"
+                + (" (dry run)" if options["dry_run"] else "")
+            )
+        )
@@ -0,0 +1,12 @@
+from .counters import coalesce
+
+
+class CounterCoalescingMiddleware:
+    """Flush all progress counter increments made during a request together."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with coalesce():
+            return self.get_response(request)
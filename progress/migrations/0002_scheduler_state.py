@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprogress',
+            name='scheduler',
+            field=models.CharField(choices=[('leitner', 'Leitner boxes'), ('sm2', 'SM-2'), ('fsrs', 'FSRS')], default='leitner', max_length=10),
+        ),
+    ]
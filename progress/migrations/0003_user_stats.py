@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0002_scheduler_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_cards', models.IntegerField(default=0)),
+                ('box_1', models.IntegerField(default=0)),
+                ('box_2', models.IntegerField(default=0)),
+                ('box_3', models.IntegerField(default=0)),
+                ('box_4', models.IntegerField(default=0)),
+                ('box_5', models.IntegerField(default=0)),
+                ('due_count', models.IntegerField(default=0)),
+                ('due_valid_until', models.DateTimeField(blank=True, null=True)),
+                ('favorites_count', models.IntegerField(default=0)),
+                ('quiz_count', models.IntegerField(default=0)),
+                ('quiz_score_sum', models.IntegerField(default=0)),
+                ('quiz_total_sum', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -1,10 +1,18 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
 
 class UserProgress(models.Model):
+    SCHEDULER_CHOICES = [
+        ("leitner", "Leitner boxes"),
+        ("sm2", "SM-2"),
+        ("fsrs", "FSRS"),
+    ]
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     words_learned = models.IntegerField(default=0)
     current_streak = models.IntegerField(default=0)
@@ -13,11 +21,20 @@ class UserProgress(models.Model):
     total_quizzes = models.IntegerField(default=0)
     average_score = models.FloatField(default=0.0)
     total_reviews = models.IntegerField(default=0)
+    scheduler = models.CharField(max_length=10, choices=SCHEDULER_CHOICES, default="leitner")
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.username} - {self.words_learned} words"
 
+    @property
+    def active_streak(self):
+        """The current streak, or 0 once a whole day has passed without activity."""
+        yesterday = timezone.now().date() - timedelta(days=1)
+        if self.last_activity is None or self.last_activity < yesterday:
+            return 0
+        return self.current_streak
+
 
 class DailyActivity(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -33,3 +50,41 @@ class DailyActivity(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.date}"
+
+
+class UserStats(models.Model):
+    """
+    Denormalized per-user counts read by the dashboards, maintained by progress.stats.
+
+    ``due_count`` is exact until ``due_valid_until`` (the next card to come due);
+    a null watermark means it must be recounted.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="stats")
+    total_cards = models.IntegerField(default=0)
+    box_1 = models.IntegerField(default=0)
+    box_2 = models.IntegerField(default=0)
+    box_3 = models.IntegerField(default=0)
+    box_4 = models.IntegerField(default=0)
+    box_5 = models.IntegerField(default=0)
+    due_count = models.IntegerField(default=0)
+    due_valid_until = models.DateTimeField(null=True, blank=True)
+    favorites_count = models.IntegerField(default=0)
+    quiz_count = models.IntegerField(default=0)
+    quiz_score_sum = models.IntegerField(default=0)
+    quiz_total_sum = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.total_cards} cards"
+
+    @property
+    def box_distribution(self):
+        return [self.box_1, self.box_2, self.box_3, self.box_4, self.box_5]
+
+    @property
+    def average_score(self):
+        """Percentage of quiz questions answered correctly."""
+        if not self.quiz_total_sum:
+            return 0.0
+        return self.quiz_score_sum / self.quiz_total_sum * 100
@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from words.models import Flashcard, WordList
+
+from . import stats
+
+
+@receiver(post_save, sender=Flashcard)
+def flashcard_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.card_added(instance)
+
+
+@receiver(post_delete, sender=Flashcard)
+def flashcard_deleted(sender, instance, **kwargs):
+    stats.card_removed(instance)
+
+
+@receiver(m2m_changed, sender=WordList.words.through)
+def favorites_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Only changes made through a favorites list are tracked; anything else is
+    # picked up by rebuild_stats
+    if reverse or instance.name != "Favorites" or instance.list_type != "FAV":
+        return
+
+    if action == "post_add":
+        stats.favorites_changed(instance.user_id, len(pk_set))
+    elif action == "post_remove":
+        stats.favorites_changed(instance.user_id, -len(pk_set))
+    elif action == "pre_clear":
+        stats.favorites_changed(instance.user_id, -instance.words.count())
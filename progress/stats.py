@@ -0,0 +1,167 @@
+"""
+Maintenance of the per-user UserStats rollup.
+
+Rows are built lazily by ``get_stats`` and then kept current with relative
+``UPDATE``s: card creation, deletion and favorites through the signals in
+progress.signals, box moves and quizzes from the views that cause them. Updates
+for a user without a row are dropped; the row is computed on its next read.
+The rebuild_stats command recomputes every row and reports drift.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q, Sum
+from django.utils import timezone
+
+from quiz.models import QuizSession
+from words.models import Flashcard, WordList
+
+from .models import UserStats
+
+# Recount due cards at least this often even if nothing comes due sooner
+DUE_RECHECK = timedelta(days=1)
+
+COUNT_FIELDS = (
+    "total_cards",
+    "box_1",
+    "box_2",
+    "box_3",
+    "box_4",
+    "box_5",
+    "favorites_count",
+    "quiz_count",
+    "quiz_score_sum",
+    "quiz_total_sum",
+)
+
+
+def _due_fields(due_count, next_due, now):
+    valid_until = now + DUE_RECHECK
+    if next_due is not None:
+        valid_until = min(valid_until, next_due)
+    return {"due_count": due_count, "due_valid_until": valid_until}
+
+
+def empty_stats(now):
+    return dict.fromkeys(COUNT_FIELDS, 0) | _due_fields(0, None, now)
+
+
+def compute_stats(user_ids=None, now=None):
+    """Return ``{user_id: field values}`` computed from the source tables."""
+    now = now or timezone.now()
+    cards = Flashcard.objects.all()
+    favorites = WordList.objects.filter(name="Favorites", list_type="FAV")
+    quizzes = QuizSession.objects.filter(completed_at__isnull=False)
+    if user_ids is not None:
+        cards = cards.filter(user_id__in=user_ids)
+        favorites = favorites.filter(user_id__in=user_ids)
+        quizzes = quizzes.filter(user_id__in=user_ids)
+
+    stats = {}
+
+    def row(user_id):
+        if user_id not in stats:
+            stats[user_id] = empty_stats(now)
+        return stats[user_id]
+
+    boxes = {f"box_{box}": Count("id", filter=Q(box=box)) for box in range(1, 6)}
+    for values in cards.values("user_id").annotate(
+        total_cards=Count("id"),
+        due_count=Count("id", filter=Q(next_review__lte=now)),
+        next_due=Min("next_review", filter=Q(next_review__gt=now)),
+        **boxes,
+    ):
+        user_id, next_due = values.pop("user_id"), values.pop("next_due")
+        row(user_id).update(values, **_due_fields(values["due_count"], next_due, now))
+
+    for values in favorites.values("user_id").annotate(favorites_count=Count("words")):
+        row(values["user_id"])["favorites_count"] = values["favorites_count"]
+
+    for values in quizzes.values("user_id").annotate(
+        quiz_count=Count("id"), quiz_score_sum=Sum("score"), quiz_total_sum=Sum("total")
+    ):
+        user_id = values.pop("user_id")
+        row(user_id).update(values)
+
+    if user_ids is not None:
+        for user_id in user_ids:
+            row(user_id)
+    return stats
+
+
+def get_stats(user, now=None):
+    """Return the user's UserStats row, building it or recounting due cards if needed."""
+    now = now or timezone.now()
+    stats = UserStats.objects.filter(user=user).first()
+
+    if stats is None:
+        values = compute_stats([user.pk], now)[user.pk]
+        try:
+            with transaction.atomic():
+                return UserStats.objects.create(user=user, **values)
+        except IntegrityError:
+            # Another request built it first
+            stats = UserStats.objects.get(user=user)
+
+    if stats.due_valid_until is None or stats.due_valid_until <= now:
+        counts = Flashcard.objects.filter(user=user).aggregate(
+            due_count=Count("id", filter=Q(next_review__lte=now)),
+            next_due=Min("next_review", filter=Q(next_review__gt=now)),
+        )
+        for field, value in _due_fields(counts["due_count"], counts["next_due"], now).items():
+            setattr(stats, field, value)
+        UserStats.objects.filter(pk=stats.pk).update(
+            due_count=stats.due_count, due_valid_until=stats.due_valid_until
+        )
+    return stats
+
+
+def _adjust(user_id, invalidate_due=False, **deltas):
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if invalidate_due:
+        updates["due_valid_until"] = None
+    if updates:
+        UserStats.objects.filter(user_id=user_id).update(**updates)
+
+
+def card_added(card, now=None):
+    now = now or timezone.now()
+    due = card.next_review is not None and card.next_review <= now
+    _adjust(
+        card.user_id,
+        invalidate_due=not due,
+        total_cards=1,
+        due_count=1 if due else 0,
+        **{f"box_{card.box}": 1},
+    )
+
+
+def card_removed(card, now=None):
+    # A removed future card may leave the watermark early, which only costs a recount
+    now = now or timezone.now()
+    due = card.next_review is not None and card.next_review <= now
+    _adjust(card.user_id, total_cards=-1, due_count=-1 if due else 0, **{f"box_{card.box}": -1})
+
+
+def cards_reviewed(user, box_moves):
+    """Record reviews given as ``(old_box, new_box)`` pairs; due cards are recounted lazily."""
+    deltas = Counter()
+    for old_box, new_box in box_moves:
+        deltas[f"box_{old_box}"] -= 1
+        deltas[f"box_{new_box}"] += 1
+    _adjust(user.pk, invalidate_due=True, **deltas)
+
+
+def favorites_changed(user_id, delta):
+    _adjust(user_id, favorites_count=delta)
+
+
+def record_quiz(user, score, total):
+    _adjust(user.pk, quiz_count=1, quiz_score_sum=score, quiz_total_sum=total)
+
+
+def invalidate(user):
+    """Drop the user's row so it is recomputed on the next read."""
+    UserStats.objects.filter(user=user).delete()
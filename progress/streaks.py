@@ -0,0 +1,58 @@
+"""
+Incremental maintenance of UserProgress.current_streak / longest_streak.
+
+The first review or quiz of a day advances the streak with one conditional
+UPDATE; later activity that day is skipped via a cache flag. The
+rebuild_streaks command recomputes everything from DailyActivity.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import activity
+from .models import UserProgress
+
+STREAK_FIELDS = ("words_reviewed", "quizzes_completed")
+
+
+def _touched_key(user_id, day):
+    return f"progress:streak-touched:{user_id}:{day.isoformat()}"
+
+
+def touch_streak(user, day=None):
+    """Count ``day`` towards the user's streak; a no-op if it was already counted."""
+    day = day or timezone.now().date()
+    key = _touched_key(user.pk, day)
+    if cache.get(key):
+        return
+
+    streak = Case(
+        When(last_activity=day - timedelta(days=1), then=F("current_streak") + 1),
+        default=Value(1),
+    )
+    updated = (
+        UserProgress.objects.filter(user=user)
+        .filter(Q(last_activity__lt=day) | Q(last_activity__isnull=True))
+        .update(
+            current_streak=streak,
+            longest_streak=Greatest(F("longest_streak"), streak),
+            last_activity=day,
+        )
+    )
+    if not updated:
+        try:
+            with transaction.atomic():
+                UserProgress.objects.create(
+                    user=user, current_streak=1, longest_streak=1, last_activity=day
+                )
+        except IntegrityError:
+            # The row exists and already counts this day (or a later one)
+            pass
+
+    activity.invalidate(user.pk)
+    cache.set(key, True, 60 * 60 * 48)
@@ -1 +1,402 @@
-# Create your tests here.
+"""
+Tests for the progress app.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress import activity, counters, stats, streaks
+from progress.models import DailyActivity, UserProgress, UserStats
+from quiz.models import QuizSession
+from words.models import Flashcard, Word, WordList
+
+
+class CounterTests(TestCase):
+    """Tests for the atomic progress counters."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+
+    def test_increment_creates_missing_row(self):
+        """Test that the first increment creates the counter row."""
+        counters.add_progress(self.user, words_learned=1)
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).words_learned, 1)
+
+    def test_increment_is_a_single_update(self):
+        """Test that incrementing an existing row is one UPDATE statement."""
+        UserProgress.objects.create(user=self.user, words_learned=4)
+
+        with CaptureQueriesContext(connection) as context:
+            counters.add_progress(self.user, words_learned=1, total_reviews=2)
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("UPDATE"))
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual((progress.words_learned, progress.total_reviews), (5, 2))
+
+    def test_increment_does_not_lose_concurrent_updates(self):
+        """Test that increments apply on top of values written by another worker."""
+        counters.add_activity(self.user, new_words=1)
+        DailyActivity.objects.filter(user=self.user).update(new_words=10)
+
+        counters.add_activity(self.user, new_words=1)
+
+        self.assertEqual(DailyActivity.objects.get(user=self.user).new_words, 11)
+
+    def test_coalesce_flushes_one_update_per_row(self):
+        """Test that buffered increments are written as one UPDATE per row."""
+        counters.add_activity(self.user, new_words=1)
+
+        with CaptureQueriesContext(connection) as context, counters.coalesce():
+            counters.add_activity(self.user, new_words=1)
+            counters.add_activity(self.user, words_reviewed=3)
+            counters.add_activity(self.user, new_words=1)
+            self.assertEqual(context.captured_queries, [])
+
+        activity_queries = [
+            q for q in context.captured_queries if "progress_dailyactivity" in q["sql"]
+        ]
+        self.assertEqual(len(activity_queries), 1)
+        daily = DailyActivity.objects.get(user=self.user, date=timezone.now().date())
+        self.assertEqual((daily.new_words, daily.words_reviewed), (3, 3))
+
+    def test_flush_inside_coalesce(self):
+        """Test that flush() writes buffered increments early without writing them twice."""
+        with counters.coalesce():
+            counters.add_activity(self.user, new_words=2)
+            counters.flush()
+            self.assertEqual(DailyActivity.objects.get(user=self.user).new_words, 2)
+            counters.add_activity(self.user, new_words=1)
+
+        self.assertEqual(DailyActivity.objects.get(user=self.user).new_words, 3)
+
+    def test_record_quiz_keeps_running_average(self):
+        """Test that quiz scores are averaged in a single update."""
+        counters.record_quiz(self.user, 8)
+        counters.record_quiz(self.user, 6)
+
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual(progress.total_quizzes, 2)
+        self.assertAlmostEqual(progress.average_score, 7.0)
+
+
+class CounterMiddlewareTests(TestCase):
+    """Tests for per-request counter coalescing."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+    def test_add_word_updates_counters(self):
+        """Test that counters incremented by a view are flushed before the response."""
+        self.client.post(
+            reverse("add_word"), {"dutch": "de hond", "translation": "the dog", "source": "EN"}
+        )
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).words_learned, 1)
+        self.assertEqual(DailyActivity.objects.get(user=self.user).new_words, 1)
+
+
+class StreakTests(TestCase):
+    """Tests for the incremental streak engine."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.today = timezone.now().date()
+
+    def test_consecutive_days_extend_streak(self):
+        """Test that activity on consecutive days extends the streak."""
+        for days_ago in (2, 1, 0):
+            streaks.touch_streak(self.user, self.today - timedelta(days=days_ago))
+
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual((progress.current_streak, progress.longest_streak), (3, 3))
+        self.assertEqual(progress.active_streak, 3)
+
+    def test_same_day_counts_once(self):
+        """Test that repeated activity on one day does not extend the streak."""
+        streaks.touch_streak(self.user, self.today)
+        cache.clear()
+        streaks.touch_streak(self.user, self.today)
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).current_streak, 1)
+
+    def test_gap_resets_current_but_keeps_longest(self):
+        """Test that a missed day starts a new streak."""
+        for days_ago in (5, 4, 3, 0):
+            streaks.touch_streak(self.user, self.today - timedelta(days=days_ago))
+
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual((progress.current_streak, progress.longest_streak), (1, 3))
+
+    def test_stale_streak_is_not_active(self):
+        """Test that a streak whose last day is before yesterday shows as 0."""
+        streaks.touch_streak(self.user, self.today - timedelta(days=3))
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).active_streak, 0)
+
+    def test_reviews_and_quizzes_touch_streak(self):
+        """Test that review and quiz counters advance the streak but new words do not."""
+        counters.add_activity(self.user, new_words=1)
+        self.assertFalse(UserProgress.objects.filter(user=self.user).exists())
+
+        counters.add_activity(self.user, words_reviewed=1)
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).current_streak, 1)
+
+
+class StreakViewTests(TestCase):
+    """Tests for the streak calendar and the cached activity bitmap."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+        self.today = timezone.now().date()
+
+        for days_ago in (0, 2, 200):
+            DailyActivity.objects.create(
+                user=self.user, date=self.today - timedelta(days=days_ago), words_reviewed=1
+            )
+        DailyActivity.objects.create(
+            user=self.user, date=self.today - timedelta(days=1), new_words=3
+        )
+
+    def test_calendar_uses_one_activity_query(self):
+        """Test that the 31-day calendar reads DailyActivity once, then from the cache."""
+        for expected in (1, 0):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse("streak"))
+            activity_queries = [
+                q for q in context.captured_queries if "progress_dailyactivity" in q["sql"]
+            ]
+            self.assertEqual(len(activity_queries), expected)
+
+        active = [day["active"] for day in response.context["streak_data"]]
+        self.assertEqual(active[-3:], [True, False, True])
+
+    def test_year_heatmap(self):
+        """Test that the year view lays out 365 days in Monday-first week columns."""
+        response = self.client.get(reverse("streak"), {"range": "year"})
+
+        weeks = response.context["heatmap_weeks"]
+        days = [day for week in weeks for day in week if day]
+        self.assertEqual(len(days), activity.WINDOW_DAYS)
+        self.assertEqual(days[0]["date"].weekday(), weeks[0].index(days[0]))
+        self.assertEqual(response.context["active_days"], 3)
+
+    def test_activity_refreshes_cached_bitmap(self):
+        """Test that new activity drops the cached bitmap and the next read sees it."""
+        yesterday = self.today - timedelta(days=1)
+        self.assertFalse(activity.get_bitmap(self.user, self.today).is_active(yesterday))
+
+        counters.add_activity(self.user, day=yesterday, words_reviewed=1)
+
+        self.assertTrue(activity.get_bitmap(self.user, self.today).is_active(yesterday))
+        with CaptureQueriesContext(connection) as context:
+            bitmap = activity.get_bitmap(self.user, self.today)
+        self.assertEqual(context.captured_queries, [])
+        self.assertTrue(bitmap.is_active(yesterday))
+
+    def test_bitmap_is_shared_between_workers(self):
+        """Test that a bitmap dropped through another cache connection is rebuilt."""
+        yesterday = self.today - timedelta(days=1)
+        activity.get_bitmap(self.user, self.today)
+
+        # Another worker records the activity and drops the shared entry
+        DailyActivity.objects.update_or_create(
+            user=self.user, date=yesterday, defaults={"words_reviewed": 1}
+        )
+        caches.create_connection("default").delete(f"progress:activity-bitmap:{self.user.pk}")
+
+        self.assertTrue(activity.get_bitmap(self.user, self.today).is_active(yesterday))
+
+    def test_bitmap_slides_with_the_window(self):
+        """Test that days older than a year drop out as the window moves forward."""
+        old_day = self.today - timedelta(days=200)
+        bitmap = activity.get_bitmap(self.user, self.today)
+        self.assertTrue(bitmap.is_active(old_day))
+
+        later = activity.get_bitmap(self.user, self.today + timedelta(days=170))
+
+        self.assertFalse(later.is_active(old_day))
+        self.assertTrue(later.is_active(self.today))
+
+
+class ProgressDashboardTests(TestCase):
+    """Tests for the aggregates on the progress dashboard."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+        now = timezone.now()
+
+        # (box, days until due): overdue, due today, in 3 days, in 10 days, in 40 days
+        for i, (box, days) in enumerate([(1, -2), (1, 0), (2, 3), (3, 10), (5, 40)]):
+            word = Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            Flashcard.objects.create(
+                user=self.user, word=word, box=box, next_review=now + timedelta(days=days)
+            )
+
+        for quiz_type, score, total in [("MC", 8, 10), ("MC", 6, 10), ("SP", 5, 5)]:
+            QuizSession.objects.create(
+                user=self.user, quiz_type=quiz_type, score=score, total=total, completed_at=now
+            )
+        QuizSession.objects.create(user=self.user, quiz_type="FL", score=0, total=10)
+
+    def test_card_aggregates(self):
+        """Test that box and due counts come from one aggregate over the deck."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("progress"))
+
+        flashcard_queries = [q for q in context.captured_queries if "words_flashcard" in q["sql"]]
+        self.assertEqual(len(flashcard_queries), 2)
+        self.assertEqual(response.context["box_distribution"], [2, 1, 1, 0, 1])
+        self.assertEqual(response.context["total_words"], 5)
+        self.assertEqual(response.context["due_today"], 2)
+        self.assertEqual(response.context["due_this_week"], 3)
+
+    def test_due_forecast(self):
+        """Test that the forecast covers 30 days and folds overdue cards into today."""
+        response = self.client.get(reverse("progress"))
+
+        forecast = response.context["due_forecast"]
+        self.assertEqual(len(forecast), 30)
+        self.assertEqual([day["count"] for day in forecast if day["count"]], [2, 1, 1])
+        self.assertEqual(forecast[3]["count"], 1)
+
+    def test_quiz_accuracy_by_type(self):
+        """Test that accuracy is grouped by quiz type over completed quizzes only."""
+        response = self.client.get(reverse("progress"))
+
+        accuracy = {row["label"]: row for row in response.context["quiz_accuracy"]}
+        self.assertEqual(set(accuracy), {"Multiple Choice", "Speed Round"})
+        self.assertEqual(accuracy["Multiple Choice"]["percentage"], 70)
+        self.assertEqual(accuracy["Speed Round"]["quizzes"], 1)
+
+
+class UserStatsTests(TestCase):
+    """Tests for the materialized per-user stats row."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+        self.words = [
+            Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            for i in range(3)
+        ]
+
+    def add_card(self, word, **fields):
+        fields.setdefault("next_review", timezone.now())
+        return Flashcard.objects.create(user=self.user, word=word, **fields)
+
+    def test_row_is_built_on_first_read(self):
+        """Test that a missing row is computed from the source tables."""
+        self.add_card(self.words[0], box=2)
+        self.add_card(self.words[1], next_review=timezone.now() + timedelta(days=2))
+
+        user_stats = stats.get_stats(self.user)
+
+        self.assertEqual(user_stats.total_cards, 2)
+        self.assertEqual(user_stats.box_distribution, [1, 1, 0, 0, 0])
+        self.assertEqual(user_stats.due_count, 1)
+
+    def test_write_paths_keep_row_current(self):
+        """Test that cards, reviews, favorites and quizzes update an existing row."""
+        stats.get_stats(self.user)
+        card = self.add_card(self.words[0])
+        self.add_card(self.words[1])
+
+        self.client.get(reverse("rate_card", args=[card.id, "good"]))
+        self.client.get(reverse("flashcards"))
+        self.client.get(reverse("toggle_favorite", args=[self.words[2].id]))
+        Flashcard.objects.filter(word=self.words[1]).delete()
+        stats.record_quiz(self.user, 7, 10)
+
+        user_stats = UserStats.objects.get(user=self.user)
+        self.assertEqual(user_stats.total_cards, 1)
+        self.assertEqual(user_stats.box_distribution, [0, 1, 0, 0, 0])
+        self.assertEqual(user_stats.favorites_count, 1)
+        self.assertAlmostEqual(user_stats.average_score, 70.0)
+        self.assertIsNone(user_stats.due_valid_until)
+        self.assertEqual(stats.get_stats(self.user).due_count, 0)
+
+    def test_dashboards_read_the_row(self):
+        """Test that a warm row serves the dashboard without counting flashcards."""
+        self.add_card(self.words[0])
+        self.client.get(reverse("dashboard"))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("dashboard"))
+
+        self.assertFalse(any("words_flashcard" in q["sql"] for q in context.captured_queries))
+        self.assertEqual(response.context["total_cards"], 1)
+        self.assertEqual(response.context["due_cards_count"], 1)
+
+    def test_rebuild_stats_reports_and_fixes_drift(self):
+        """Test that rebuild_stats --check reports drift and a plain run repairs it."""
+        self.add_card(self.words[0])
+        WordList.objects.get(user=self.user, name="Favorites").words.add(self.words[0])
+        stats.get_stats(self.user)
+        UserStats.objects.filter(user=self.user).update(total_cards=9, favorites_count=0)
+
+        out = StringIO()
+        call_command("rebuild_stats", check=True, stdout=out)
+        self.assertIn("total_cards 9 -> 1", out.getvalue())
+        self.assertEqual(UserStats.objects.get(user=self.user).total_cards, 9)
+
+        call_command("rebuild_stats", stdout=StringIO())
+        user_stats = UserStats.objects.get(user=self.user)
+        self.assertEqual((user_stats.total_cards, user_stats.favorites_count), (1, 1))
+
+
+class RebuildStreaksCommandTests(TestCase):
+    """Tests for the rebuild_streaks management command."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.other = CustomUser.objects.create_user(username="other", password="testpass123")
+        today = timezone.now().date()
+
+        for days_ago in (9, 8, 7, 6, 3, 1, 0):
+            DailyActivity.objects.create(
+                user=self.user, date=today - timedelta(days=days_ago), words_reviewed=1
+            )
+        DailyActivity.objects.create(user=self.user, date=today - timedelta(days=2), new_words=4)
+        DailyActivity.objects.create(
+            user=self.other, date=today - timedelta(days=5), quizzes_completed=1
+        )
+        UserProgress.objects.create(user=self.user, current_streak=40, longest_streak=40)
+
+    def test_rebuild_from_history(self):
+        """Test that streaks are recomputed from active days only."""
+        call_command("rebuild_streaks", stdout=StringIO())
+
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual((progress.current_streak, progress.longest_streak), (2, 4))
+        self.assertEqual(progress.last_activity, timezone.now().date())
+
+        other = UserProgress.objects.get(user=self.other)
+        self.assertEqual((other.current_streak, other.longest_streak), (1, 1))
+
+    def test_dry_run(self):
+        """Test that --dry-run does not save anything."""
+        call_command("rebuild_streaks", dry_run=True, stdout=StringIO())
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).current_streak, 40)
+        self.assertFalse(UserProgress.objects.filter(user=self.other).exists())
@@ -5,4 +5,5 @@ from . import views
 urlpatterns = [
     path("", views.progress_dashboard, name="progress"),
     path("streak/", views.streak_view, name="streak"),
+    path("scheduler/", views.set_scheduler, name="set_scheduler"),
 ]
@@ -1,14 +1,65 @@
+from collections import Counter
 from datetime import timedelta
 
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.shortcuts import redirect, render
 from django.utils import timezone
 
 from quiz.models import QuizSession
+from words import review
 from words.models import Flashcard
+from words.scheduling import reschedule_deck
 
+from . import activity, stats
 from .models import DailyActivity, UserProgress
 
+FORECAST_DAYS = 30
+
+
+def _due_forecast(user, tomorrow):
+    """Cards coming due on each of the next FORECAST_DAYS days; today includes overdue cards."""
+    rows = (
+        Flashcard.objects.filter(
+            user=user, next_review__lt=tomorrow + timedelta(days=FORECAST_DAYS - 1)
+        )
+        .annotate(day=TruncDate("next_review"))
+        .values("day")
+        .annotate(count=Count("id"))
+    )
+
+    today = tomorrow.date() - timedelta(days=1)
+    counts = Counter()
+    for row in rows:
+        counts[max(row["day"], today)] += row["count"]
+
+    return [
+        {"date": date, "count": counts[date]}
+        for date in (today + timedelta(days=i) for i in range(FORECAST_DAYS))
+    ]
+
+
+def _quiz_accuracy(user):
+    """Percentage of correct answers per quiz type over completed quizzes."""
+    rows = (
+        QuizSession.objects.filter(user=user, completed_at__isnull=False)
+        .values("quiz_type")
+        .annotate(correct=Sum("score"), answered=Sum("total"), quizzes=Count("id"))
+        .order_by("quiz_type")
+    )
+    labels = dict(QuizSession.QUIZ_TYPE_CHOICES)
+    return [
+        {
+            "label": labels.get(row["quiz_type"], row["quiz_type"]),
+            "quizzes": row["quizzes"],
+            "percentage": int(row["correct"] / row["answered"] * 100) if row["answered"] else 0,
+        }
+        for row in rows
+    ]
+
 
 @login_required
 def progress_dashboard(request):
@@ -44,11 +95,11 @@ def progress_dashboard(request):
                 }
             )
 
-    flashcards = Flashcard.objects.filter(user=request.user)
-    box_distribution = [0, 0, 0, 0, 0]
-    for card in flashcards:
-        if 1 <= card.box <= 5:
-            box_distribution[card.box - 1] += 1
+    now = timezone.now()
+    tomorrow = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow += timedelta(days=1)
+    user_stats = stats.get_stats(request.user, now)
+    due_forecast = _due_forecast(request.user, tomorrow)
 
     recent_quizzes = QuizSession.objects.filter(
         user=request.user, completed_at__isnull=False
@@ -63,35 +114,77 @@ def progress_dashboard(request):
     context = {
         "progress": progress,
         "chart_data": chart_data,
-        "box_distribution": box_distribution,
+        "stats": user_stats,
+        "box_distribution": user_stats.box_distribution,
         "recent_quizzes": quizzes_with_percentages,
-        "total_words": flashcards.count(),
+        "total_words": user_stats.total_cards,
+        "due_today": due_forecast[0]["count"],
+        "due_this_week": sum(day["count"] for day in due_forecast[:7]),
+        "due_forecast": due_forecast,
+        "forecast_peak": max(day["count"] for day in due_forecast),
+        "quiz_accuracy": _quiz_accuracy(request.user),
+        "scheduler_choices": UserProgress.SCHEDULER_CHOICES,
     }
     return render(request, "progress/dashboard.html", context)
 
 
+@login_required
+def set_scheduler(request):
+    if request.method == "POST":
+        scheduler = request.POST.get("scheduler", "")
+        progress, _ = UserProgress.objects.get_or_create(user=request.user)
+
+        if scheduler in dict(UserProgress.SCHEDULER_CHOICES) and scheduler != progress.scheduler:
+            with transaction.atomic():
+                card_count = reschedule_deck(request.user, scheduler)
+                progress.scheduler = scheduler
+                progress.save(update_fields=["scheduler", "updated_at"])
+                stats.invalidate(request.user)
+            review.reset_queue(request)
+            messages.success(
+                request,
+                f"Switched to {progress.get_scheduler_display()} and rescheduled {card_count} cards.",
+            )
+
+    return redirect("progress")
+
+
 @login_required
 def streak_view(request):
-    progress = UserProgress.objects.get(user=request.user)
+    progress, created = UserProgress.objects.get_or_create(user=request.user)
 
     today = timezone.now().date()
+    bitmap = activity.get_bitmap(request.user, today)
+    show_year = request.GET.get("range") == "year"
 
     streak_data = []
     for i in range(30, -1, -1):
         date = today - timedelta(days=i)
-        activity = DailyActivity.objects.filter(user=request.user, date=date).first()
-        has_activity = activity and (activity.words_reviewed > 0 or activity.quizzes_completed > 0)
         streak_data.append(
             {
                 "date": date,
                 "day": date.strftime("%d"),
                 "month": date.strftime("%b"),
-                "active": has_activity,
+                "active": bitmap.is_active(date),
             }
         )
 
+    # Year heatmap: one column per week, Monday to Sunday, padded before the first day
+    heatmap_weeks = []
+    if show_year:
+        first_day = activity.window_start(today)
+        days = [None] * first_day.weekday()
+        days += [{"date": first_day + timedelta(days=i)} for i in range(activity.WINDOW_DAYS)]
+        for day in days:
+            if day is not None:
+                day["active"] = bitmap.is_active(day["date"])
+        heatmap_weeks = [days[i : i + 7] for i in range(0, len(days), 7)]
+
     context = {
         "progress": progress,
         "streak_data": streak_data,
+        "show_year": show_year,
+        "heatmap_weeks": heatmap_weeks,
+        "active_days": bitmap.active_days(),
     }
     return render(request, "progress/streak.html", context)
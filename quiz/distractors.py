@@ -0,0 +1,133 @@
+"""
+Precomputed distractors for multiple-choice questions.
+
+``build_distractor_index`` groups the word bank by source and part of speech and
+stores, for every word, the words in its group that look most alike: close
+Dutch spelling (edit distance) and a similar translation length. Each worker
+loads the JSON file once and reloads it when the file changes, so picking
+distractors for a question is a dictionary lookup and a small sample.
+"""
+
+import json
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+from words.fuzzy import bounded_levenshtein
+from words.models import Word
+
+NEIGHBOURS = 8
+# Enough for one multiple-choice question
+MIN_NEIGHBOURS = 3
+WINDOW = 60
+MAX_DISTANCE = 4
+
+
+def index_path():
+    return Path(
+        getattr(settings, "QUIZ_DISTRACTOR_INDEX", settings.BASE_DIR / "quiz_distractors.json")
+    )
+
+
+def _score(word, other):
+    distance = bounded_levenshtein(word[1], other[1], MAX_DISTANCE)
+    if distance is None:
+        distance = MAX_DISTANCE + 1
+    return distance + abs(len(word[2]) - len(other[2])) / 4
+
+
+def _nearest(word, candidates):
+    # Words that mean the same thing or read the same would also be right answers
+    usable = [c for c in candidates if c[1] != word[1] and c[2] != word[2]]
+    usable.sort(key=lambda other: (_score(word, other), other[0]))
+    return [other[0] for other in usable[:NEIGHBOURS]]
+
+
+def _length_order(word):
+    return len(word[1]), word[0]
+
+
+def build_index(window=WINDOW):
+    """Return the index as a dict ready to be written out as JSON."""
+    rows = Word.objects.values_list(
+        "id", "dutch", "source", "part_of_speech", "dutch_normalized", "translation_normalized"
+    )
+    dutch = {}
+    groups = defaultdict(list)
+    by_source = defaultdict(list)
+    for word_id, text, source, part_of_speech, dutch_key, translation_key in rows.iterator():
+        dutch[word_id] = text
+        word = (word_id, dutch_key, translation_key)
+        groups[source, part_of_speech.strip().lower()].append(word)
+        by_source[source].append(word)
+
+    # Sorting by length keeps likely neighbours within a fixed window
+    source_positions = {}
+    for words in by_source.values():
+        words.sort(key=_length_order)
+        source_positions.update((word[0], position) for position, word in enumerate(words))
+
+    neighbours = {}
+    for (source, _), group in groups.items():
+        group.sort(key=_length_order)
+        for position, word in enumerate(group):
+            nearby = group[max(0, position - window) : position + window + 1]
+            nearest = _nearest(word, nearby)
+            if len(nearest) < MIN_NEIGHBOURS:
+                # Tiny groups borrow from the words of similar length in the source
+                pool = by_source[source]
+                position_in_source = source_positions[word[0]]
+                start = max(0, position_in_source - window)
+                extra = _nearest(word, pool[start : position_in_source + window + 1])
+                nearest += [other for other in extra if other not in nearest]
+            neighbours[word[0]] = nearest[:NEIGHBOURS]
+
+    return {
+        "dutch": {str(word_id): text for word_id, text in dutch.items()},
+        "neighbours": {str(word_id): ids for word_id, ids in neighbours.items()},
+    }
+
+
+def write_index(index, path=None):
+    path = Path(path or index_path())
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, separators=(",", ":")))
+    tmp.replace(path)
+    return path
+
+
+class DistractorIndex:
+    def __init__(self, data, stamp=None):
+        self.dutch = {int(word_id): text for word_id, text in data["dutch"].items()}
+        self.neighbours = {int(word_id): ids for word_id, ids in data["neighbours"].items()}
+        self.stamp = stamp
+
+    def pick(self, word_id, count, rng, exclude=()):
+        """Up to ``count`` ``[id, dutch]`` distractors for ``word_id``."""
+        candidates = [other for other in self.neighbours.get(word_id, ()) if other not in exclude]
+        chosen = rng.sample(candidates, min(count, len(candidates)))
+        return [[other, self.dutch[other]] for other in chosen]
+
+
+_EMPTY = DistractorIndex({"dutch": {}, "neighbours": {}})
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """Return this worker's index, reloaded when the file has been rebuilt."""
+    global _index
+    path = index_path()
+    try:
+        stamp = (path, path.stat().st_mtime_ns)
+    except OSError:
+        return _EMPTY
+    if _index is not None and _index.stamp == stamp:
+        return _index
+
+    with _lock:
+        if _index is None or _index.stamp != stamp:
+            _index = DistractorIndex(json.loads(path.read_text()), stamp)
+    return _index
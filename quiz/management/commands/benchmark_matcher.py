@@ -0,0 +1,73 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from quiz.matching import expected_keys, grade
+from words.models import Word
+
+SAMPLE_WORDS = [
+    "de fiets",
+    "het huis",
+    "de olifant",
+    "het ziekenhuis",
+    "lopen / rennen",
+    "de vergadering",
+    "één",
+    "'t kopje",
+]
+
+
+def _typo(text, rng):
+    if len(text) < 2:
+        return text + "x"
+    i = rng.randrange(len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+
+
+class Command(BaseCommand):
+    help = "Measure how many typed quiz answers the answer matcher grades per second"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--answers",
+            type=int,
+            default=20000,
+            help="Number of answers to grade (default: 20000)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed for the generated answers (default: 0)",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        words = list(Word.objects.values_list("dutch", flat=True)[:1000]) or SAMPLE_WORDS
+
+        # A mix of exact, re-cased, typo'd and wrong answers
+        cases = []
+        for _ in range(options["answers"]):
+            expected = rng.choice(words)
+            kind = rng.randrange(4)
+            if kind == 0:
+                answer = expected
+            elif kind == 1:
+                answer = expected.upper() + "!"
+            elif kind == 2:
+                answer = _typo(expected, rng)
+            else:
+                answer = rng.choice(words)
+            cases.append((answer, expected))
+
+        expected_keys.cache_clear()
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            accepted = sum(grade(answer, expected) is not None for answer, expected in cases)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label}: graded {len(cases)} answers in {elapsed * 1000:.1f} ms "
+                f"({len(cases) / elapsed:,.0f}/s, {elapsed / len(cases) * 1e6:.1f} µs each, "
+                f"{accepted} accepted)"
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from quiz.distractors import WINDOW, build_index, index_path, write_index
+
+
+class Command(BaseCommand):
+    help = "Precompute plausible multiple-choice distractors for every word"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            type=str,
+            help=f"Where to write the index (default: {index_path()})",
+        )
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=WINDOW,
+            help=f"Neighbours by length compared per word (default: {WINDOW})",
+        )
+
+    def handle(self, *args, **options):
+        index = build_index(options["window"])
+        path = write_index(index, options["output"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed distractors for {len(index['neighbours'])} words in {path}"
+            )
+        )
@@ -0,0 +1,62 @@
+"""
+Grading of typed quiz answers.
+
+Answers and expected words are reduced to the same key: case-folded, accents
+folded, a leading Dutch article dropped and punctuation removed. A key that is
+not an exact match may still pass if it is within a small edit distance, which
+grows with the word's length; swapping two neighbouring letters counts as one
+edit. Expected words may list alternatives separated by
+"/", "," or ";".
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from words.fuzzy import bounded_levenshtein
+from words.normalization import normalize_dutch
+
+ALTERNATIVES = re.compile(r"[/,;]")
+
+
+def normalize_answer(text):
+    # Articles go first, so "'t" is recognised before its apostrophe is removed
+    text = normalize_dutch(text)
+    cleaned = "".join(" " if unicodedata.category(c).startswith("P") else c for c in text)
+    return " ".join(cleaned.split())
+
+
+def max_typos(key):
+    if len(key) <= 3:
+        return 0
+    return 1 if len(key) <= 7 else 2
+
+
+@lru_cache(maxsize=4096)
+def expected_keys(expected):
+    keys = {normalize_answer(part) for part in ALTERNATIVES.split(expected)}
+    keys.discard("")
+    return tuple(sorted(keys))
+
+
+def grade(answer, expected):
+    """Return the number of typos in ``answer`` (0 for an exact match), or None if wrong."""
+    key = normalize_answer(answer)
+    if not key:
+        return None
+    keys = expected_keys(expected)
+    if key in keys:
+        return 0
+    best = None
+    for target in keys:
+        limit = max_typos(target) if best is None else min(best - 1, max_typos(target))
+        if limit < 1:
+            continue
+        distance = bounded_levenshtein(key, target, limit, transpositions=True)
+        if distance is not None:
+            best = distance
+    return best
+
+
+def is_correct(answer, expected):
+    return grade(answer, expected) is not None
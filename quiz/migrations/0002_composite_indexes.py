@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizanswer',
+            index=models.Index(fields=['session', 'is_correct'], name='quizanswer_session_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizsession',
+            index=models.Index(fields=['user', 'completed_at', 'started_at'], name='quizsession_user_history_idx'),
+        ),
+    ]
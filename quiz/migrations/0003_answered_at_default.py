@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quizanswer',
+            name='answered_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0003_answered_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizanswer',
+            name='response_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
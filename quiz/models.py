@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -17,6 +18,13 @@ class QuizSession(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "completed_at", "started_at"], name="quizsession_user_history_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.quiz_type} ({self.score}/{self.total})"
 
@@ -26,7 +34,13 @@ class QuizAnswer(models.Model):
     word = models.ForeignKey("words.Word", on_delete=models.CASCADE)
     user_answer = models.CharField(max_length=200)
     is_correct = models.BooleanField()
-    answered_at = models.DateTimeField(auto_now_add=True)
+    answered_at = models.DateTimeField(default=timezone.now)
+    response_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["session", "is_correct"], name="quizanswer_session_correct_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -0,0 +1,160 @@
+"""
+Quiz plans built once when a quiz starts.
+
+The targets, their shuffled options and the index of the correct option are
+fetched and decided in ``start_quiz`` and kept in the user's session, so showing
+a question and checking an answer read only the session. Answers are buffered in
+the session too and written with one bulk insert when the quiz is finished.
+
+Multiple choice questions carry their options; fill-in-the-blank and speed round
+questions carry the expected Dutch text, graded by ``quiz.matching``.
+"""
+
+import random
+import re
+from datetime import datetime
+
+from words.models import Word
+from words.normalization import DUTCH_ARTICLES
+
+from . import distractors
+from .models import QuizAnswer
+
+QUIZ_LENGTH = 10
+QUIZ_LENGTHS = {"MC": QUIZ_LENGTH, "FL": QUIZ_LENGTH, "SP": 20}
+TYPED_QUIZZES = ("FL", "SP")
+OPTION_COUNT = 4
+SPEED_SECONDS = 10
+# Allowance for the request round trip, so an answer sent by the countdown still counts
+SPEED_GRACE_MS = 1000
+BLANK = "_____"
+
+PLAN_KEY = "quiz_plan"
+CURRENT_KEY = "quiz_current"
+SCORE_KEY = "quiz_score"
+SESSION_KEY = "quiz_session_id"
+ANSWERS_KEY = "quiz_answers"
+TYPE_KEY = "quiz_type"
+SHOWN_KEY = "quiz_shown"
+
+
+def blank_out(dutch, example):
+    """Return ``example`` with ``dutch`` (without its article) blanked, or "" if absent."""
+    article, _, rest = dutch.partition(" ")
+    word = rest if article.casefold() in DUTCH_ARTICLES and rest else dutch
+    pattern = re.compile(rf"(?<!\w){re.escape(word)}(?!\w)", re.IGNORECASE)
+    blanked, count = pattern.subn(BLANK, example)
+    return blanked if count else ""
+
+
+def build_plan(word_ids, quiz_type="MC", rng=random):
+    """
+    Return one question per word id, in order.
+
+    Each question is ``[word_id, prompt, options, answer]``. For multiple choice
+    ``options`` is a list of ``[word_id, dutch]`` pairs and ``answer`` is the correct
+    option's index; wrong options come from the distractor index, topped up from
+    the other words in the quiz for words the index does not cover yet. For typed
+    quizzes ``options`` is the word's example sentence with the word blanked out
+    (or "") and ``answer`` is the expected Dutch text.
+    """
+    words = Word.objects.filter(id__in=word_ids).values_list(
+        "id", "dutch", "translation", "example"
+    )
+    found = {word_id: rest for word_id, *rest in words}
+    word_ids = [word_id for word_id in word_ids if word_id in found]
+
+    if quiz_type in TYPED_QUIZZES:
+        plan = []
+        for word_id in word_ids:
+            dutch, translation, example = found[word_id]
+            plan.append([word_id, translation, blank_out(dutch, example), dutch])
+        return plan
+
+    index = distractors.get_index()
+    plan = []
+    for word_id in word_ids:
+        options = index.pick(word_id, OPTION_COUNT - 1, rng, exclude={word_id})
+        if len(options) < OPTION_COUNT - 1:
+            taken = {word_id, *(option_id for option_id, _ in options)}
+            others = [other for other in word_ids if other not in taken]
+            extra = rng.sample(others, min(len(others), OPTION_COUNT - 1 - len(options)))
+            options += [[other, found[other][0]] for other in extra]
+        options.append([word_id, found[word_id][0]])
+        rng.shuffle(options)
+        answer = [option_id for option_id, _ in options].index(word_id)
+        plan.append([word_id, found[word_id][1], options, answer])
+    return plan
+
+
+def start(request, session, plan):
+    request.session[TYPE_KEY] = session.quiz_type
+    request.session[PLAN_KEY] = plan
+    request.session[CURRENT_KEY] = 0
+    request.session[SCORE_KEY] = 0
+    request.session[SESSION_KEY] = session.id
+    request.session[ANSWERS_KEY] = []
+
+
+def current_question(request):
+    """Return ``(index, question)``, or None when the quiz is over or not started."""
+    plan = request.session.get(PLAN_KEY, [])
+    current = request.session.get(CURRENT_KEY, 0)
+    if current >= len(plan):
+        return None
+    return current, plan[current]
+
+
+def for_display(question):
+    """Return the target and options in the shape the question template expects."""
+    word_id, prompt, options, _ = question
+    if not isinstance(options, list):
+        return {"id": word_id, "translation": prompt, "sentence": options}, []
+    return (
+        {"id": word_id, "translation": prompt},
+        [{"id": option_id, "dutch": dutch} for option_id, dutch in options],
+    )
+
+
+def check(question, answer_id):
+    """Return ``(is_correct, answer_text)`` for a submitted option id."""
+    _, _, options, answer = question
+    for option_id, dutch in options:
+        if str(option_id) == str(answer_id):
+            return option_id == options[answer][0], dutch
+    return False, f"Unknown word (ID: {answer_id})"
+
+
+def record_answer(request, question, user_answer, is_correct, now, response_ms=None):
+    """Buffer an answer in the session and move on to the next question."""
+    answers = request.session.get(ANSWERS_KEY, [])
+    answers.append([question[0], user_answer, is_correct, now.isoformat(), response_ms])
+    request.session[ANSWERS_KEY] = answers
+    if is_correct:
+        request.session[SCORE_KEY] = request.session.get(SCORE_KEY, 0) + 1
+    request.session[CURRENT_KEY] = request.session.get(CURRENT_KEY, 0) + 1
+
+
+def buffered_answers(request, session_id):
+    """Return the buffered answers as unsaved QuizAnswer rows for words that still exist."""
+    pending = request.session.get(ANSWERS_KEY, [])
+    existing = set(
+        Word.objects.filter(id__in={entry[0] for entry in pending}).values_list("id", flat=True)
+    )
+    return [
+        QuizAnswer(
+            session_id=session_id,
+            word_id=word_id,
+            user_answer=user_answer,
+            is_correct=is_correct,
+            answered_at=datetime.fromisoformat(answered_at),
+            response_ms=response_ms,
+        )
+        for word_id, user_answer, is_correct, answered_at, response_ms in pending
+        if word_id in existing
+    ]
+
+
+def finish(request):
+    for key in (PLAN_KEY, CURRENT_KEY, SCORE_KEY, SESSION_KEY, ANSWERS_KEY, TYPE_KEY, SHOWN_KEY):
+        request.session.pop(key, None)
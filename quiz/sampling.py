@@ -0,0 +1,331 @@
+"""
+Weakness-weighted choice of quiz words.
+
+Each flashcard's weight grows with its recent quiz error rate, with a low box
+and with the time since it was last reviewed. ``Flashcard.error_rate`` is a
+moving average updated from the answers of every finished quiz.
+
+Each worker keeps a ``WeightTable`` per user in memory: a Fenwick tree over
+integer weights, so a quiz draws k words in O(k log n) and changing one card's
+weight costs O(log n). Card changes are published to a per-user change log in
+the shared cache, one key per change number, and a table applies the entries
+it has not seen before the next draw. Publishers claim the next number with
+``cache.add``, so concurrent publishers never overwrite each other's entries.
+A table is only rebuilt from the database when the log moved to a new epoch
+(it was lost, or a whole deck was rescheduled), the table is more than
+``MAX_CHANGES`` entries behind, or it is older than ``TABLE_TTL``, which also
+refreshes the time-since-review part of the weights.
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from words.models import Flashcard
+
+# Weight of the newest answer in the error rate moving average
+ALPHA = 0.3
+BASE_WEIGHT = 0.2
+STALE_DAYS = 30
+# Weights are stored as integers so the tree sums stay exact
+SCALE = 1_000_000
+
+TABLE_TTL = 3600
+MAX_TABLES = 256
+MAX_CHANGES = 500
+LOG_TIMEOUT = 60 * 60 * 24
+# Change log entries fetched per cache round trip
+PROBE = 16
+
+
+def _epoch_key(user_id):
+    return f"quiz:weight-epoch:{user_id}"
+
+
+def _head_key(user_id, epoch):
+    return f"quiz:weight-head:{user_id}:{epoch}"
+
+
+def _change_key(user_id, epoch, seq):
+    return f"quiz:weight-change:{user_id}:{epoch}:{seq}"
+
+
+def weight(error_rate, box, last_reviewed, now):
+    box_factor = (6 - box) / 5
+    if last_reviewed is None:
+        days = STALE_DAYS
+    else:
+        days = min((now - last_reviewed).total_seconds() / 86400, STALE_DAYS)
+    return (BASE_WEIGHT + error_rate) * box_factor * (1 + days / STALE_DAYS)
+
+
+def scaled_weight(error_rate, box, last_reviewed, now):
+    """The weight as a positive integer, as stored in a ``WeightTable``."""
+    return max(round(weight(error_rate, box, last_reviewed, now) * SCALE), 1)
+
+
+class WeightTable:
+    """Weighted sampling over items whose weights can be changed in place."""
+
+    def __init__(self, items=(), weights=()):
+        self.items = list(items)
+        self.weights = list(weights)
+        self.positions = {item: position for position, item in enumerate(self.items)}
+        self.active = sum(1 for w in self.weights if w > 0)
+        self.lock = threading.Lock()
+
+        # tree[i] holds the sum of weights (i - lowbit(i), i], 1-based
+        self.tree = [0, *self.weights]
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return self.active
+
+    def _add(self, position, delta):
+        i = position + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, count):
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+
+    def _find(self, target):
+        # Descend the tree to the item whose cumulative range contains target
+        position = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            after = position + step
+            if after < len(self.tree) and self.tree[after] <= target:
+                position = after
+                target -= self.tree[after]
+            step >>= 1
+        return position
+
+    def _set(self, item, new_weight):
+        position = self.positions.get(item)
+        if position is None:
+            if new_weight <= 0:
+                return
+            position = len(self.items)
+            self.items.append(item)
+            self.positions[item] = position
+            self.weights.append(0)
+            i = position + 1
+            self.tree.append(self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        old_weight = self.weights[position]
+        self.active += (new_weight > 0) - (old_weight > 0)
+        self.weights[position] = new_weight
+        self._add(position, new_weight - old_weight)
+
+    def set(self, item, new_weight):
+        """Change an item's weight, adding it if new; a weight of 0 removes it."""
+        with self.lock:
+            self._set(item, new_weight)
+
+    def weight_of(self, item):
+        position = self.positions.get(item)
+        return 0 if position is None else self.weights[position]
+
+    def sample(self, k, rng=random):
+        """Up to ``k`` distinct items, each drawn in proportion to its weight."""
+        chosen = []
+        with self.lock:
+            drawn = []
+            while len(chosen) < k:
+                total = self._prefix(len(self.items))
+                if total <= 0:
+                    break
+                position = self._find(rng.randrange(total))
+                chosen.append(self.items[position])
+                # Zeroed until the sample is complete, so it cannot be drawn twice
+                drawn.append((position, self.weights[position]))
+                self._add(position, -self.weights[position])
+                self.weights[position] = 0
+            for position, drawn_weight in drawn:
+                self.weights[position] = drawn_weight
+                self._add(position, drawn_weight)
+        return chosen
+
+
+class _Entry:
+    def __init__(self, table, epoch, seq):
+        self.table = table
+        self.epoch = epoch
+        self.seq = seq
+        self.built_at = time.monotonic()
+
+
+_tables = OrderedDict()
+_lock = threading.Lock()
+
+
+def build_table(user_id, now=None):
+    now = now or timezone.now()
+    cards = Flashcard.objects.filter(user_id=user_id).values_list(
+        "word_id", "error_rate", "box", "last_reviewed"
+    )
+    word_ids, weights = [], []
+    for word_id, error_rate, box, last_reviewed in cards.iterator():
+        word_ids.append(word_id)
+        weights.append(scaled_weight(error_rate, box, last_reviewed, now))
+    return WeightTable(word_ids, weights)
+
+
+def new_epoch(user_id):
+    """Start a new change log for the user, so every worker rebuilds its table."""
+    epoch = uuid.uuid4().hex
+    cache.set(_head_key(user_id, epoch), 0, LOG_TIMEOUT)
+    cache.set(_epoch_key(user_id), epoch, LOG_TIMEOUT)
+    return epoch, 0
+
+
+def _head(user_id):
+    """The current epoch and a recent change number in it (newer ones may follow)."""
+    epoch = cache.get(_epoch_key(user_id))
+    seq = None if epoch is None else cache.get(_head_key(user_id, epoch))
+    if seq is None:
+        # Without the head a publisher could reuse numbers a table already applied
+        return new_epoch(user_id)
+    return epoch, seq
+
+
+def _changes_after(user_id, epoch, seq):
+    """``(seq, changes)`` entries published after ``seq``, or None if too far behind."""
+    found = []
+    while True:
+        keys = [_change_key(user_id, epoch, n) for n in range(seq + 1, seq + 1 + PROBE)]
+        entries = cache.get_many(keys)
+        for key in keys:
+            if key not in entries:
+                return found
+            seq += 1
+            found.append((seq, entries[key]))
+            if len(found) > MAX_CHANGES:
+                return None
+
+
+def publish(user_id, changes):
+    """Append ``(word_id, weight)`` changes to the user's log; weight 0 removes a card."""
+    changes = list(changes)
+    if not changes:
+        return
+    epoch, head = _head(user_id)
+    for seq in range(head + 1, head + 1 + MAX_CHANGES):
+        if cache.add(_change_key(user_id, epoch, seq), changes, LOG_TIMEOUT):
+            break
+    else:
+        new_epoch(user_id)
+        return
+    # Only a hint for the next publisher, so a stale value is harmless
+    cache.set(_head_key(user_id, epoch), seq, LOG_TIMEOUT)
+    cache.touch(_epoch_key(user_id), LOG_TIMEOUT)
+
+
+def card_changed(card):
+    """Publish a saved flashcard's new weight."""
+    now = timezone.now()
+    weight_now = scaled_weight(card.error_rate, card.box, card.last_reviewed, now)
+    publish(card.user_id, [(card.word_id, weight_now)])
+
+
+def card_removed(card):
+    publish(card.user_id, [(card.word_id, 0)])
+
+
+def cards_rescheduled(user_id, cards):
+    """Publish ``(word_id, error_rate, box, last_reviewed)`` updates made without post_save."""
+    if cards is None:
+        new_epoch(user_id)
+        return
+    now = timezone.now()
+    publish(
+        user_id,
+        [
+            (word_id, scaled_weight(error_rate, box, last_reviewed, now))
+            for word_id, error_rate, box, last_reviewed in cards
+        ],
+    )
+
+
+def _fresh(entry, epoch):
+    return (
+        entry is not None
+        and entry.epoch == epoch
+        and time.monotonic() - entry.built_at <= TABLE_TTL
+    )
+
+
+def get_table(user):
+    """Return this worker's table for ``user``, brought up to date with the change log."""
+    epoch, head = _head(user.pk)
+    with _lock:
+        entry = _tables.get(user.pk)
+        seq = entry.seq if _fresh(entry, epoch) else None
+
+    if seq is not None:
+        changes = _changes_after(user.pk, epoch, seq)
+        if changes is not None:
+            with _lock:
+                # Another thread may have applied some of them meanwhile
+                for change_seq, entry_changes in changes:
+                    if change_seq > entry.seq:
+                        for word_id, new_weight in entry_changes:
+                            entry.table.set(word_id, new_weight)
+                        entry.seq = change_seq
+                _tables[user.pk] = entry
+                _tables.move_to_end(user.pk)
+            return entry.table
+
+    # Changes published while the table is built are applied again on the next draw
+    changes = _changes_after(user.pk, epoch, head)
+    if changes:
+        head = changes[-1][0]
+    entry = _Entry(build_table(user.pk), epoch, head)
+    with _lock:
+        _tables[user.pk] = entry
+        _tables.move_to_end(user.pk)
+        while len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+    return entry.table
+
+
+def sample_words(user, k, rng=random):
+    """Word ids for a quiz of up to ``k`` words, weakest words most likely."""
+    return get_table(user).sample(k, rng)
+
+
+def record_answers(user, answers):
+    """Fold ``(word_id, is_correct)`` pairs into the user's card error rates."""
+    if not answers:
+        return
+    cards = {
+        card.word_id: card
+        for card in Flashcard.objects.filter(user=user, word_id__in={w for w, _ in answers})
+    }
+    for word_id, is_correct in answers:
+        card = cards.get(word_id)
+        if card is not None:
+            card.error_rate = (1 - ALPHA) * card.error_rate + ALPHA * (not is_correct)
+    Flashcard.objects.bulk_update(cards.values(), ["error_rate"])
+
+    now = timezone.now()
+    publish(
+        user.pk,
+        [
+            (word_id, scaled_weight(card.error_rate, card.box, card.last_reviewed, now))
+            for word_id, card in cards.items()
+        ],
+    )
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from words.models import Flashcard
+from words.signals import cards_rescheduled
+
+from . import sampling
+
+
+@receiver(post_save, sender=Flashcard)
+def flashcard_saved(sender, instance, **kwargs):
+    sampling.card_changed(instance)
+
+
+@receiver(post_delete, sender=Flashcard)
+def flashcard_deleted(sender, instance, **kwargs):
+    sampling.card_removed(instance)
+
+
+@receiver(cards_rescheduled)
+def flashcards_rescheduled(sender, user_id, cards, **kwargs):
+    sampling.cards_rescheduled(user_id, cards)
@@ -1 +1,462 @@
-# Create your tests here.
+"""
+Tests for the quiz flow.
+"""
+
+import json
+import random
+import tempfile
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress.models import DailyActivity, UserProgress
+from quiz import distractors, matching, plan, sampling
+from quiz.models import QuizAnswer, QuizSession
+from words import scheduling
+from words.models import Flashcard, Word
+
+
+@override_settings(QUIZ_DISTRACTOR_INDEX="/nonexistent/quiz_distractors.json")
+class QuizPlanTests(TestCase):
+    """Tests for the quiz plan built at start_quiz."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.words = []
+        for i in range(12):
+            word = Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            Flashcard.objects.create(user=self.user, word=word, next_review=timezone.now())
+            self.words.append(word)
+
+    def test_build_plan(self):
+        """Test that each question has four distinct options including the target."""
+        word_ids = [word.id for word in self.words[:5]]
+
+        quiz_plan = plan.build_plan(word_ids, rng=random.Random(1))
+
+        self.assertEqual([question[0] for question in quiz_plan], word_ids)
+        for word_id, prompt, options, answer in quiz_plan:
+            option_ids = [option_id for option_id, _ in options]
+            self.assertEqual(len(set(option_ids)), 4)
+            self.assertEqual(options[answer][0], word_id)
+            self.assertEqual(prompt, Word.objects.get(id=word_id).translation)
+
+    def test_questions_without_word_queries(self):
+        """Test that questions render and answers are checked from the stored plan."""
+        self.client.get(reverse("start_quiz", args=["MC"]))
+        quiz_plan = self.client.session[plan.PLAN_KEY]
+        self.assertEqual(len(quiz_plan), plan.QUIZ_LENGTH)
+
+        word_id, prompt, options, answer = quiz_plan[0]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("quiz_question"))
+            self.client.post(
+                reverse("submit_answer"), {"word_id": word_id, "answer_id": options[answer][0]}
+            )
+
+        self.assertContains(response, prompt)
+        word_queries = [q for q in context.captured_queries if '"words_word"' in q["sql"]]
+        self.assertEqual(word_queries, [])
+        writes = [
+            q["sql"]
+            for q in context.captured_queries
+            if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+            and '"django_session"' not in q["sql"]
+        ]
+        self.assertEqual(writes, [])
+        self.assertEqual(self.client.session[plan.SCORE_KEY], 1)
+        self.assertEqual(
+            self.client.session[plan.ANSWERS_KEY][0][:3], [word_id, options[answer][1], True]
+        )
+
+    def test_stale_submission_ignored(self):
+        """Test that resubmitting an earlier question does not record another answer."""
+        self.client.get(reverse("start_quiz", args=["MC"]))
+        word_id, _, options, answer = self.client.session[plan.PLAN_KEY][0]
+        data = {"word_id": word_id, "answer_id": options[answer][0]}
+
+        self.client.post(reverse("submit_answer"), data)
+        self.client.post(reverse("submit_answer"), data)
+
+        self.assertEqual(len(self.client.session[plan.ANSWERS_KEY]), 1)
+        self.assertEqual(self.client.session[plan.CURRENT_KEY], 1)
+
+    def test_full_quiz(self):
+        """Test that answering every question leads to saved results."""
+        self.client.get(reverse("start_quiz", args=["MC"]))
+        for word_id, _, options, answer in self.client.session[plan.PLAN_KEY]:
+            wrong = (answer + 1) % len(options) if word_id % 2 else answer
+            self.client.post(
+                reverse("submit_answer"), {"word_id": word_id, "answer_id": options[wrong][0]}
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("quiz_question"), follow=True)
+
+        session = QuizSession.objects.get()
+        self.assertIsNotNone(session.completed_at)
+        self.assertEqual(response.context["score"], session.score)
+        self.assertEqual(QuizAnswer.objects.filter(session=session).count(), plan.QUIZ_LENGTH)
+        self.assertEqual(session.score, QuizAnswer.objects.filter(is_correct=True).count())
+        self.assertNotIn(plan.PLAN_KEY, self.client.session)
+
+        inserts = [
+            q for q in context.captured_queries if 'INSERT INTO "quiz_quizanswer"' in q["sql"]
+        ]
+        self.assertEqual(len(inserts), 1)
+        activity = DailyActivity.objects.get(user=self.user)
+        self.assertEqual(activity.total_answers, plan.QUIZ_LENGTH)
+        self.assertEqual(activity.correct_answers, session.score)
+        self.assertEqual(UserProgress.objects.get(user=self.user).total_quizzes, 1)
+
+
+class DistractorIndexTests(TestCase):
+    """Tests for the precomputed distractor index."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "distractors.json"
+        settings_override = override_settings(QUIZ_DISTRACTOR_INDEX=self.path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        def word(dutch, translation, part_of_speech="noun", source="EN"):
+            return Word.objects.create(
+                dutch=dutch, translation=translation, source=source, part_of_speech=part_of_speech
+            )
+
+        self.huis = word("het huis", "the house")
+        self.nouns = [
+            word("de muis", "the mouse"),
+            word("de luis", "the louse"),
+            word("het thuis", "the home"),
+            word("de buis", "the tube"),
+        ]
+        self.far = word("de vergadering", "the meeting")
+        self.same_meaning = word("de woning", "the house")
+        self.verb = word("huilen", "to cry", part_of_speech="verb")
+        self.other_source = word("de kuis", "цнотливість", source="UK")
+
+    def test_neighbours(self):
+        """Test that neighbours share source and part of speech, closest spelling first."""
+        call_command("build_distractor_index", stdout=StringIO())
+
+        neighbours = distractors.get_index().neighbours[self.huis.id]
+
+        self.assertEqual(set(neighbours[:4]), {word.id for word in self.nouns})
+        self.assertEqual(neighbours[4], self.far.id)
+        self.assertNotIn(self.same_meaning.id, neighbours)
+        self.assertNotIn(self.verb.id, neighbours)
+        self.assertNotIn(self.other_source.id, neighbours)
+
+    def test_tiny_groups_borrow_words_of_similar_length(self):
+        """Test that a small part-of-speech group borrows from around its own length."""
+        vergaderen = Word.objects.create(
+            dutch="vergaderen", translation="to meet", source="EN", part_of_speech="verb"
+        )
+
+        neighbours = distractors.build_index(window=2)["neighbours"][str(vergaderen.id)]
+
+        self.assertIn(self.far.id, neighbours)
+        self.assertNotIn(self.nouns[0].id, neighbours)
+
+    def test_plan_uses_index(self):
+        """Test that quiz options come from the index rather than the quiz's own words."""
+        distractors.write_index(distractors.build_index())
+
+        quiz_plan = plan.build_plan([self.huis.id, self.verb.id], rng=random.Random(3))
+
+        _, _, options, answer = quiz_plan[0]
+        self.assertEqual(len(options), 4)
+        self.assertEqual(options[answer], [self.huis.id, "het huis"])
+        self.assertNotIn(self.verb.id, [option_id for option_id, _ in options])
+
+    def test_missing_index_falls_back(self):
+        """Test that without an index the other quiz words are used."""
+        quiz_plan = plan.build_plan([self.huis.id, self.verb.id], rng=random.Random(3))
+
+        option_ids = {option_id for option_id, _ in quiz_plan[0][2]}
+        self.assertEqual(option_ids, {self.huis.id, self.verb.id})
+
+
+class AnswerMatchingTests(TestCase):
+    """Tests for grading typed answers."""
+
+    def test_normalization(self):
+        """Test that case, articles, accents and punctuation are ignored."""
+        self.assertEqual(matching.grade("Fiets!", "de fiets"), 0)
+        self.assertEqual(matching.grade("het Cafe", "café"), 0)
+        self.assertEqual(matching.grade("'t kopje", "het kopje"), 0)
+        self.assertEqual(matching.grade("rennen", "lopen / rennen"), 0)
+
+    def test_typo_tolerance(self):
+        """Test that small typos pass, scaled by word length, and wrong words fail."""
+        self.assertEqual(matching.grade("fiest", "de fiets"), 1)
+        self.assertEqual(matching.grade("zeikenhius", "het ziekenhuis"), 2)
+        self.assertIsNone(matching.grade("kat", "de kar"))
+        self.assertIsNone(matching.grade("hond", "de kat"))
+        self.assertIsNone(matching.grade("", "de kat"))
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.fiets = Word.objects.create(
+            dutch="de fiets", translation="the bicycle", source="EN", example="Mijn fiets is rood."
+        )
+        Flashcard.objects.create(user=self.user, word=self.fiets, next_review=timezone.now())
+
+    def test_fill_in_the_blank(self):
+        """Test that the example is blanked and a typo'd answer counts as correct."""
+        self.client.get(reverse("start_quiz", args=["FL"]))
+
+        response = self.client.get(reverse("quiz_question"))
+        self.assertContains(response, "Mijn _____ is rood.")
+        self.assertContains(response, 'name="answer"')
+
+        self.client.post(reverse("submit_answer"), {"word_id": self.fiets.id, "answer": "Fiest"})
+        self.client.get(reverse("quiz_results"))
+
+        answer = QuizAnswer.objects.get()
+        self.assertTrue(answer.is_correct)
+        self.assertEqual(answer.user_answer, "Fiest")
+        self.assertEqual(QuizSession.objects.get().quiz_type, "FL")
+
+    def test_speed_round_records_latency(self):
+        """Test that speed round answers are timed and late ones are marked wrong."""
+        self.client.get(reverse("start_quiz", args=["SP"]))
+        response = self.client.get(reverse("quiz_question"))
+        self.assertEqual(response.context["time_limit"], plan.SPEED_SECONDS)
+
+        session = self.client.session
+        shown = timezone.now() - timedelta(seconds=plan.SPEED_SECONDS + 5)
+        session[plan.SHOWN_KEY] = [0, shown.isoformat()]
+        session.save()
+        self.client.post(reverse("submit_answer"), {"word_id": self.fiets.id, "answer": "fiets"})
+        response = self.client.get(reverse("quiz_results"))
+
+        answer = QuizAnswer.objects.get()
+        self.assertFalse(answer.is_correct)
+        self.assertGreaterEqual(answer.response_ms, (plan.SPEED_SECONDS + 5) * 1000)
+        self.assertIsNotNone(response.context["average_seconds"])
+
+    def test_reload_keeps_the_question_clock(self):
+        """Test that reloading a question does not restart its answer timer."""
+        self.client.get(reverse("start_quiz", args=["SP"]))
+        self.client.get(reverse("quiz_question"))
+
+        session = self.client.session
+        shown = timezone.now() - timedelta(seconds=plan.SPEED_SECONDS + 5)
+        session[plan.SHOWN_KEY] = [0, shown.isoformat()]
+        session.save()
+        response = self.client.get(reverse("quiz_question"))
+        self.assertEqual(response.context["time_remaining_ms"], 0)
+        self.client.post(reverse("submit_answer"), {"word_id": self.fiets.id, "answer": "fiets"})
+        self.client.get(reverse("quiz_results"))
+
+        self.assertFalse(QuizAnswer.objects.get().is_correct)
+
+    def test_countdown_resumes_after_reload(self):
+        """Test that a reloaded question shows the time left, not a fresh countdown."""
+        self.client.get(reverse("start_quiz", args=["SP"]))
+        self.client.get(reverse("quiz_question"))
+
+        session = self.client.session
+        session[plan.SHOWN_KEY][1] = (timezone.now() - timedelta(seconds=4)).isoformat()
+        session.save()
+        response = self.client.get(reverse("quiz_question"))
+
+        self.assertEqual(response.context["time_remaining"], plan.SPEED_SECONDS - 4)
+        self.assertContains(response, f'<span id="quiz-timer">{plan.SPEED_SECONDS - 4}</span>')
+
+    def test_answer_at_the_deadline_is_within_grace(self):
+        """Test that an answer arriving just after the countdown still counts."""
+        self.client.get(reverse("start_quiz", args=["SP"]))
+        self.client.get(reverse("quiz_question"))
+
+        session = self.client.session
+        shown = timezone.now() - timedelta(milliseconds=plan.SPEED_SECONDS * 1000 + 300)
+        session[plan.SHOWN_KEY] = [0, shown.isoformat()]
+        session.save()
+        self.client.post(reverse("submit_answer"), {"word_id": self.fiets.id, "answer": "fiets"})
+        self.client.get(reverse("quiz_results"))
+
+        self.assertTrue(QuizAnswer.objects.get().is_correct)
+
+    def test_unknown_quiz_type(self):
+        """Test that an unknown quiz type does not start a quiz."""
+        response = self.client.get(reverse("start_quiz", args=["XX"]))
+
+        self.assertRedirects(response, reverse("quiz_home"))
+        self.assertFalse(QuizSession.objects.exists())
+
+
+class AdaptiveSamplingTests(TestCase):
+    """Tests for weakness-weighted quiz word sampling."""
+
+    def setUp(self):
+        cache.clear()
+        sampling._tables.clear()
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.cards = []
+        for i in range(15):
+            word = Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            self.cards.append(
+                Flashcard.objects.create(user=self.user, word=word, next_review=timezone.now())
+            )
+
+    def card_queries(self, func):
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+        return result, [q for q in context.captured_queries if "words_flashcard" in q["sql"]]
+
+    def test_weight_table_follows_weights(self):
+        """Test that draws are proportional to the weights and follow weight changes."""
+        table = sampling.WeightTable(["a", "b", "c"], [1, 2, 7])
+        rng = random.Random(0)
+
+        draws = Counter(table.sample(1, rng)[0] for _ in range(20000))
+
+        self.assertAlmostEqual(draws["a"] / 20000, 0.1, delta=0.01)
+        self.assertAlmostEqual(draws["c"] / 20000, 0.7, delta=0.01)
+        self.assertEqual(sorted(table.sample(5, rng)), ["a", "b", "c"])
+        self.assertEqual(len(set(table.sample(2, rng))), 2)
+
+        table.set("c", 0)
+        table.set("d", 3)
+        draws = Counter(table.sample(1, rng)[0] for _ in range(6000))
+        self.assertEqual(draws["c"], 0)
+        self.assertAlmostEqual(draws["d"] / 6000, 0.5, delta=0.03)
+        self.assertEqual(len(table), 3)
+
+    def test_weights(self):
+        """Test that errors, low boxes and stale cards weigh more."""
+        now = timezone.now()
+
+        self.assertGreater(sampling.weight(0.5, 1, now, now), sampling.weight(0.0, 1, now, now))
+        self.assertGreater(sampling.weight(0.0, 1, now, now), sampling.weight(0.0, 4, now, now))
+        old = now - timedelta(days=20)
+        self.assertGreater(sampling.weight(0.0, 1, old, now), sampling.weight(0.0, 1, now, now))
+
+    def test_record_answers_patches_the_table(self):
+        """Test that quiz answers move the error rate and update the table in place."""
+        word_id = self.cards[0].word_id
+        table = sampling.get_table(self.user)
+        before = table.weight_of(word_id)
+
+        sampling.record_answers(self.user, [(word_id, False), (word_id, True)])
+
+        self.cards[0].refresh_from_db()
+        self.assertAlmostEqual(self.cards[0].error_rate, sampling.ALPHA * (1 - sampling.ALPHA))
+        patched, queries = self.card_queries(lambda: sampling.get_table(self.user))
+        self.assertIs(patched, table)
+        self.assertEqual(queries, [])
+        self.assertGreater(table.weight_of(word_id), before)
+
+    def test_weak_words_come_up_more(self):
+        """Test that a word with many errors is picked far more often than the rest."""
+        Flashcard.objects.filter(id=self.cards[0].id).update(error_rate=1.0, box=1)
+        Flashcard.objects.exclude(id=self.cards[0].id).update(box=5, last_reviewed=timezone.now())
+        table = sampling.build_table(self.user.pk)
+        rng = random.Random(1)
+
+        picks = Counter(word_id for _ in range(200) for word_id in table.sample(1, rng))
+
+        self.assertGreater(picks[self.cards[0].word_id], 150)
+
+    def test_start_quiz_from_cached_table(self):
+        """Test that a quiz is built without reading the user's whole deck again."""
+        sampling.get_table(self.user)
+
+        _, queries = self.card_queries(lambda: self.client.get(reverse("start_quiz", args=["MC"])))
+
+        self.assertEqual(queries, [])
+        self.assertEqual(len(self.client.session[plan.PLAN_KEY]), plan.QUIZ_LENGTH)
+
+    def test_card_changes_are_applied_without_rebuild(self):
+        """Test that added and removed flashcards patch the table instead of dropping it."""
+        table = sampling.get_table(self.user)
+        word = Word.objects.create(dutch="nieuw", translation="new", source="EN")
+
+        Flashcard.objects.create(user=self.user, word=word, next_review=timezone.now())
+        self.cards[0].delete()
+
+        patched, queries = self.card_queries(lambda: sampling.get_table(self.user))
+        self.assertIs(patched, table)
+        self.assertEqual(queries, [])
+        self.assertEqual(len(table), 15)
+        self.assertNotIn(self.cards[0].word_id, table.sample(20))
+
+    def test_rebuilt_when_behind_the_change_log(self):
+        """Test that a table too far behind the change log is rebuilt from the database."""
+        table = sampling.get_table(self.user)
+
+        for card in self.cards[:3]:
+            card.box = 3
+            card.save()
+
+        with mock.patch.object(sampling, "MAX_CHANGES", 2):
+            rebuilt, queries = self.card_queries(lambda: sampling.get_table(self.user))
+        self.assertIsNot(rebuilt, table)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(rebuilt), 15)
+
+    def test_publishers_with_a_stale_head_keep_both_changes(self):
+        """Test that two publishers starting from the same head both append their change."""
+        table = sampling.get_table(self.user)
+        first, second = self.cards[0].word_id, self.cards[1].word_id
+
+        epoch = sampling._tables[self.user.pk].epoch
+
+        with mock.patch.object(sampling, "_head", return_value=(epoch, 0)):
+            sampling.publish(self.user.pk, [(first, 0)])
+            sampling.publish(self.user.pk, [(second, 0)])
+
+        self.assertIs(sampling.get_table(self.user), table)
+        self.assertEqual((table.weight_of(first), table.weight_of(second)), (0, 0))
+
+    def test_review_ratings_patch_the_table(self):
+        """Test that rating a card and submitting a batch publish the new weights."""
+        table = sampling.get_table(self.user)
+        first, second = self.cards[0], self.cards[1]
+        before = table.weight_of(first.word_id)
+
+        self.client.get(reverse("rate_card", args=[first.id, "easy"]))
+        self.client.post(
+            reverse("submit_reviews"),
+            json.dumps({"reviews": [{"card_id": second.id, "rating": "easy"}]}),
+            content_type="application/json",
+        )
+
+        patched, queries = self.card_queries(lambda: sampling.get_table(self.user))
+        self.assertIs(patched, table)
+        self.assertEqual(queries, [])
+        self.assertLess(table.weight_of(first.word_id), before)
+        self.assertLess(table.weight_of(second.word_id), before)
+
+    def test_rescheduling_the_deck_rebuilds_the_table(self):
+        """Test that switching the scheduler starts a new log epoch."""
+        table = sampling.get_table(self.user)
+
+        scheduling.reschedule_deck(self.user, "sm2")
+
+        self.assertIsNot(sampling.get_table(self.user), table)
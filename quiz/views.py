@@ -1,78 +1,75 @@
-import random
+import math
 
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
-from progress.models import DailyActivity, UserProgress
-from words.models import Flashcard, Word
+from nederlandse_workbook.utils import timing
+from progress import counters, stats
 
+from . import matching, plan, sampling
 from .models import QuizAnswer, QuizSession
 
 
 @login_required
 def quiz_home(request):
-    flashcards = Flashcard.objects.filter(user=request.user)
-    word_count = flashcards.count()
-
     context = {
-        "word_count": word_count,
+        "word_count": stats.get_stats(request.user).total_cards,
+        "speed_length": plan.QUIZ_LENGTHS["SP"],
+        "speed_seconds": plan.SPEED_SECONDS,
     }
     return render(request, "quiz/home.html", context)
 
 
 @login_required
 def start_quiz(request, quiz_type):
-    flashcards = Flashcard.objects.filter(user=request.user)
+    if quiz_type not in dict(QuizSession.QUIZ_TYPE_CHOICES):
+        return redirect("quiz_home")
 
-    if not flashcards.exists():
+    word_ids = sampling.sample_words(request.user, plan.QUIZ_LENGTHS[quiz_type])
+    if not word_ids:
         return redirect("browse")
 
-    word_ids = list(flashcards.values_list("word_id", flat=True))
-    random.shuffle(word_ids)
-
-    session = QuizSession.objects.create(user=request.user, quiz_type=quiz_type, total=10)
+    quiz_plan = plan.build_plan(word_ids, quiz_type)
 
-    request.session["quiz_word_ids"] = word_ids[:10]
-    request.session["quiz_current"] = 0
-    request.session["quiz_score"] = 0
-    request.session["quiz_session_id"] = session.id
+    session = QuizSession.objects.create(
+        user=request.user, quiz_type=quiz_type, total=len(quiz_plan)
+    )
+    plan.start(request, session, quiz_plan)
 
     return redirect("quiz_question")
 
 
 @login_required
 def quiz_question(request):
-    word_ids = request.session.get("quiz_word_ids", [])
-    current = request.session.get("quiz_current", 0)
-    score = request.session.get("quiz_score", 0)
-
-    if current >= len(word_ids):
+    current = plan.current_question(request)
+    if current is None:
         return redirect("quiz_results")
 
-    word_id = word_ids[current]
-    word = get_object_or_404(Word, id=word_id)
-
-    # Select wrong answers only from user's flashcard words to avoid 404 errors
-    # when words are deleted from the database
-    other_word_ids = [wid for wid in word_ids if wid != word_id]
-    if len(other_word_ids) >= 3:
-        wrong_word_ids = random.sample(other_word_ids, 3)
-        wrong_words = Word.objects.filter(id__in=wrong_word_ids)
-    else:
-        # If user has fewer than 4 words, just use what they have
-        wrong_words = Word.objects.filter(id__in=other_word_ids)
-
-    options = list(wrong_words) + [word]
-    random.shuffle(options)
-
+    index, question = current
+    word, options = plan.for_display(question)
+    now = timezone.now()
+    shown_at = timing.mark_shown(request.session, plan.SHOWN_KEY, index, now)
+
+    quiz_type = request.session.get(plan.TYPE_KEY, "MC")
+    time_limit = time_remaining_ms = None
+    if quiz_type == "SP":
+        time_limit = plan.SPEED_SECONDS
+        elapsed = int((now - shown_at).total_seconds() * 1000)
+        time_remaining_ms = max(time_limit * 1000 - elapsed, 0)
     context = {
         "word": word,
         "options": options,
-        "question_num": current + 1,
-        "total": len(word_ids),
-        "score": score,
-        "quiz_type": request.session.get("quiz_session_id"),
+        "question_num": index + 1,
+        "total": len(request.session[plan.PLAN_KEY]),
+        "score": request.session.get(plan.SCORE_KEY, 0),
+        "quiz_type": quiz_type,
+        "typed": quiz_type in plan.TYPED_QUIZZES,
+        "time_limit": time_limit,
+        # Counted from when the question was first shown, so a reload keeps the clock
+        "time_remaining_ms": time_remaining_ms,
+        "time_remaining": math.ceil(time_remaining_ms / 1000) if time_limit else None,
     }
     return render(request, "quiz/question.html", context)
 
@@ -82,83 +79,75 @@ def submit_answer(request):
     if request.method != "POST":
         return redirect("quiz_home")
 
-    word_id = request.POST.get("word_id")
-    answer_id = request.POST.get("answer_id")
-
-    word = get_object_or_404(Word, id=word_id)
-
-    # Handle case where answer word might not exist (e.g., was deleted)
-    try:
-        answer_word = Word.objects.get(id=answer_id)
-        user_answer_text = answer_word.translation
-    except Word.DoesNotExist:
-        # If the answer word was deleted, use the ID as the answer text
-        user_answer_text = f"Unknown word (ID: {answer_id})"
-
-    is_correct = answer_id == word_id
-
-    session_id = request.session.get("quiz_session_id")
-    session = get_object_or_404(QuizSession, id=session_id)
-
-    QuizAnswer.objects.create(
-        session=session,
-        word=word,
-        user_answer=user_answer_text,
-        is_correct=is_correct,
-    )
+    current = plan.current_question(request)
+    if current is None:
+        return redirect("quiz_results")
 
-    if is_correct:
-        request.session["quiz_score"] = request.session.get("quiz_score", 0) + 1
+    index, question = current
+    # A resubmitted form for an earlier question must not count twice
+    if request.POST.get("word_id") != str(question[0]):
+        return redirect("quiz_question")
+
+    now = timezone.now()
+    response_ms = timing.elapsed_ms(request.session, plan.SHOWN_KEY, index, now)
+    quiz_type = request.session.get(plan.TYPE_KEY, "MC")
+    if quiz_type in plan.TYPED_QUIZZES:
+        user_answer_text = request.POST.get("answer", "").strip()[:200]
+        is_correct = matching.is_correct(user_answer_text, question[3])
+        deadline_ms = plan.SPEED_SECONDS * 1000 + plan.SPEED_GRACE_MS
+        if quiz_type == "SP" and (response_ms is None or response_ms > deadline_ms):
+            is_correct = False
+    else:
+        is_correct, user_answer_text = plan.check(question, request.POST.get("answer_id"))
 
-    request.session["quiz_current"] = request.session.get("quiz_current", 0) + 1
+    plan.record_answer(request, question, user_answer_text, is_correct, now, response_ms)
 
     return redirect("quiz_question")
 
 
 @login_required
 def quiz_results(request):
-    session_id = request.session.get("quiz_session_id")
+    session_id = request.session.get(plan.SESSION_KEY)
     if not session_id:
         return redirect("dashboard")
 
-    session = get_object_or_404(QuizSession, id=session_id)
+    session = get_object_or_404(QuizSession, id=session_id, user=request.user)
 
-    score = request.session.get("quiz_score", 0)
+    score = request.session.get(plan.SCORE_KEY, 0)
     total = session.total
-
-    session.score = score
-    session.completed_at = timezone.now()
-    session.save()
-
-    progress, created = UserProgress.objects.get_or_create(user=request.user)
-    progress.total_quizzes += 1
-
-    total_score = (
-        (progress.average_score * (progress.total_quizzes - 1)) + score
-        if progress.total_quizzes > 0
-        else score
-    )
-    progress.average_score = total_score / progress.total_quizzes
-    progress.save()
-
-    today = timezone.now().date()
-    daily, _ = DailyActivity.objects.get_or_create(user=request.user, date=today)
-    daily.quizzes_completed += 1
-    answers = QuizAnswer.objects.filter(session=session)
-    daily.correct_answers += answers.filter(is_correct=True).count()
-    daily.total_answers += answers.count()
-    daily.save()
-
-    del request.session["quiz_word_ids"]
-    del request.session["quiz_current"]
-    del request.session["quiz_score"]
-    del request.session["quiz_session_id"]
-
+    answers = plan.buffered_answers(request, session.id)
+
+    with transaction.atomic():
+        QuizAnswer.objects.bulk_create(answers)
+
+        session.score = score
+        session.completed_at = timezone.now()
+        session.save(update_fields=["score", "completed_at"])
+
+        counters.record_quiz(request.user, score)
+        stats.record_quiz(request.user, score, total)
+        counters.add_activity(
+            request.user,
+            quizzes_completed=1,
+            correct_answers=sum(answer.is_correct for answer in answers),
+            total_answers=len(answers),
+        )
+        counters.flush()
+        sampling.record_answers(
+            request.user, [(answer.word_id, answer.is_correct) for answer in answers]
+        )
+
+    plan.finish(request)
+
+    timings = [answer.response_ms for answer in answers if answer.response_ms is not None]
     context = {
         "session": session,
         "score": score,
         "total": total,
         "percentage": int((score / total) * 100) if total > 0 else 0,
+        "average_seconds": (
+            sum(timings) / len(timings) / 1000 if session.quiz_type == "SP" and timings else None
+        ),
     }
     return render(request, "quiz/results.html", context)
 
@@ -0,0 +1,121 @@
+"""
+Prefix autocomplete over the word bank.
+
+Each worker keeps the normalized Dutch words and translations in one sorted
+list and answers prefix queries with bisect, so keystroke lookups do not touch
+the database. When the word bank version changes, words added since the build
+are merged into the list; edits and deletions trigger a full rebuild.
+"""
+
+import threading
+from bisect import bisect_left
+
+from . import bank
+from .models import Word
+from .normalization import fold, normalize_dutch
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.words = {}
+        # Sorted (normalized key, word id) pairs for the Dutch words and translations
+        self.entries = []
+        self.last_word_id = 0
+        self.version = None
+
+    def add_words(self, rows):
+        added = []
+        for word_id, dutch, translation, source, dutch_key, translation_key in rows:
+            self.words[word_id] = {
+                "id": word_id,
+                "dutch": dutch,
+                "translation": translation,
+                "source": source,
+            }
+            added.append((dutch_key, word_id))
+            added.append((translation_key, word_id))
+            self.last_word_id = max(self.last_word_id, word_id)
+        if added:
+            # Timsort merges the sorted tail into the existing run in linear time
+            added.sort()
+            self.entries.extend(added)
+            self.entries.sort()
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT, source=""):
+        """Words whose normalized Dutch or translation starts with ``prefix``."""
+        limit = max(limit, 1)
+        results = []
+        seen = set()
+        for key in {normalize_dutch(prefix), fold(prefix)}:
+            if not key:
+                continue
+            position = bisect_left(self.entries, (key,))
+            while len(results) < limit and position < len(self.entries):
+                entry_key, word_id = self.entries[position]
+                if not entry_key.startswith(key):
+                    break
+                position += 1
+                word = self.words[word_id]
+                if word_id in seen or (source and word["source"] != source):
+                    continue
+                seen.add(word_id)
+                results.append(word)
+        results.sort(key=lambda word: (normalize_dutch(word["dutch"]), word["id"]))
+        return results
+
+    def duplicates(self, dutch, source=""):
+        """Words whose normalized Dutch equals that of ``dutch``."""
+        key = normalize_dutch(dutch)
+        position = bisect_left(self.entries, (key,))
+        found = []
+        while position < len(self.entries) and self.entries[position][0] == key:
+            word = self.words[self.entries[position][1]]
+            position += 1
+            is_dutch_match = normalize_dutch(word["dutch"]) == key
+            if is_dutch_match and word not in found and (not source or word["source"] == source):
+                found.append(word)
+        return found
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def _load(index, after_id=0):
+    words = Word.objects.filter(id__gt=after_id).order_by("id")
+    index.add_words(
+        words.values_list(
+            "id", "dutch", "translation", "source", "dutch_normalized", "translation_normalized"
+        ).iterator()
+    )
+
+
+def get_index():
+    """Return this worker's index, brought up to date with the word bank."""
+    global _index
+    version, generation = bank.current()
+    index = _index
+    if index is not None and index.version == (version, generation):
+        return index
+
+    with _lock:
+        index = _index
+        if index is None or index.version[1] != generation:
+            index = PrefixIndex()
+            _load(index)
+        elif index.version[0] != version:
+            _load(index, index.last_word_id)
+        index.version = (version, generation)
+        _index = index
+    return index
+
+
+def complete(prefix, limit=DEFAULT_LIMIT, source=""):
+    return get_index().complete(prefix, limit, source)
+
+
+def duplicates(dutch, source=""):
+    return get_index().duplicates(dutch, source)
@@ -0,0 +1,68 @@
+"""
+Version tokens for the shared word bank, used to invalidate per-worker indexes.
+
+``version`` changes whenever a word is added, changed or deleted, or joins or
+leaves a category; ``generation`` only when an existing word changes or is
+deleted. An index that sees a new version but the same generation can load just
+the words added since it was built. A separate ``categories`` token changes
+when a category or its membership changes.
+
+The tokens live in the shared cache backend, so a write handled by one worker
+invalidates the indexes of every other worker. They are only compared for
+equality: a bump writes a fresh random token instead of incrementing, which
+cannot lose an update when two workers bump at once.
+"""
+
+import uuid
+
+from django.core.cache import cache
+
+VERSION_KEY = "words:bank-version"
+GENERATION_KEY = "words:bank-generation"
+CATEGORIES_KEY = "words:categories-version"
+
+
+def _token():
+    return uuid.uuid4().hex
+
+
+def _bump(key):
+    cache.set(key, _token(), None)
+
+
+def _read(key):
+    # A token lost to a cache flush or cull is replaced by a fresh one, which
+    # an index built before it cannot mistake for its own
+    cache.add(key, _token(), None)
+    return cache.get(key)
+
+
+def current():
+    """Return ``(version, generation)``."""
+    values = cache.get_many([VERSION_KEY, GENERATION_KEY])
+    for key in (VERSION_KEY, GENERATION_KEY):
+        if key not in values:
+            values[key] = _read(key)
+    return values[VERSION_KEY], values[GENERATION_KEY]
+
+
+def categories_version():
+    return _read(CATEGORIES_KEY)
+
+
+def words_added():
+    _bump(VERSION_KEY)
+
+
+def words_changed():
+    _bump(VERSION_KEY)
+    _bump(GENERATION_KEY)
+
+
+def membership_changed():
+    _bump(VERSION_KEY)
+    _bump(CATEGORIES_KEY)
+
+
+def categories_changed():
+    _bump(CATEGORIES_KEY)
@@ -0,0 +1,31 @@
+"""
+Batched category lookups for rendering words.
+
+List views attach each word's categories for a whole page with one query, and
+the ``get_word_categories`` template tag reads the attached list instead of
+querying per word.
+"""
+
+from django.db.models import Prefetch, prefetch_related_objects
+
+from .models import CategorizedWord
+
+ATTR = "category_memberships"
+
+
+def categories_prefetch():
+    memberships = CategorizedWord.objects.select_related("category").order_by("category__name")
+    return Prefetch("categorized", queryset=memberships, to_attr=ATTR)
+
+
+def prefetch_categories(words):
+    """Attach categories to already-fetched ``words`` in one query and return them."""
+    prefetch_related_objects(list(words), categories_prefetch())
+    return words
+
+
+def categories_of(word):
+    memberships = getattr(word, ATTR, None)
+    if memberships is None:
+        memberships = CategorizedWord.objects.filter(word=word).select_related("category")
+    return [membership.category for membership in memberships]
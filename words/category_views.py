@@ -1,22 +1,45 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.db.models import Count
 from django.shortcuts import get_object_or_404, redirect, render
 
+from . import bank
 from .models import CategorizedWord, Category, Word
+from .pagination import CachedCountPaginator
+
+CATEGORY_SORTS = {"name": ("name",), "size": ("-word_count", "name")}
+CACHE_TIMEOUT = 3600
+
+
+def _with_word_counts(categories):
+    return categories.annotate(word_count=Count("categorized_words"))
 
 
 @login_required
 def categories_list(request):
-    categories = Category.objects.all()
+    sort = request.GET.get("sort")
+    if sort not in CATEGORY_SORTS:
+        sort = "name"
+    categories = _with_word_counts(Category.objects.all()).order_by(*CATEGORY_SORTS[sort])
 
-    paginator = Paginator(categories, 12)
+    version = bank.categories_version()
+    paginator = CachedCountPaginator(categories, 12, count_key=f"categories:{version}")
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
+    # Membership and category edits bump the version, so stale pages are never read
+    key = f"words:categories:{version}:{sort}:{page_obj.number}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(page_obj.object_list)
+        cache.set(key, rows, CACHE_TIMEOUT)
+    page_obj.object_list = rows
+
     context = {
         "categories": categories,
         "page_obj": page_obj,
+        "sort": sort,
     }
     return render(request, "words/categories.html", context)
 
@@ -25,17 +48,16 @@ def categories_list(request):
 def category_detail(request, category_id):
     category = get_object_or_404(Category, id=category_id)
 
-    categorized_words = CategorizedWord.objects.filter(category=category)
-    words = [cw.word for cw in categorized_words]
+    words = Word.objects.filter(categorized__category=category).order_by("dutch", "id")
 
-    paginator = Paginator(words, 20)
+    paginator = CachedCountPaginator(words, 20, count_key=f"category:{category.id}")
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     context = {
         "category": category,
         "words": page_obj,
-        "word_count": len(words),
+        "word_count": paginator.count,
     }
     return render(request, "words/category_detail.html", context)
 
@@ -110,7 +132,7 @@ def remove_from_category(request, word_id, category_id):
 
 @login_required
 def edit_category(request, category_id):
-    category = get_object_or_404(Category, id=category_id)
+    category = get_object_or_404(_with_word_counts(Category.objects.all()), id=category_id)
 
     if request.method == "POST":
         name = request.POST.get("name", "").strip()
@@ -135,7 +157,7 @@ def edit_category(request, category_id):
 
 @login_required
 def delete_category(request, category_id):
-    category = get_object_or_404(Category, id=category_id)
+    category = get_object_or_404(_with_word_counts(Category.objects.all()), id=category_id)
 
     if request.method == "POST":
         category_name = category.name
@@ -143,10 +165,8 @@ def delete_category(request, category_id):
         messages.success(request, f'Category "{category_name}" deleted successfully!')
         return redirect("categories_list")
 
-    word_count = CategorizedWord.objects.filter(category=category).count()
-
     context = {
         "category": category,
-        "word_count": word_count,
+        "word_count": category.word_count,
     }
     return render(request, "words/delete_category.html", context)
@@ -0,0 +1,39 @@
+"""
+The per-user Favorites list and per-word favorite/flashcard flags.
+
+The list is created at signup and its id stored on the user row, which the
+auth middleware already loads, so views no longer get_or_create it. Lists views
+annotate ``is_favorite`` and ``has_flashcard`` with EXISTS subqueries in the
+same SELECT as the words.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
+
+from .models import Flashcard, WordList
+
+FAVORITES_NAME = "Favorites"
+
+
+def favorites_list_id(user):
+    """Return the id of the user's Favorites list, creating it for users who predate it."""
+    if user.favorites_list_id is None:
+        favorite_list, _ = WordList.objects.get_or_create(
+            user=user, name=FAVORITES_NAME, defaults={"list_type": "FAV"}
+        )
+        get_user_model().objects.filter(pk=user.pk).update(favorites_list=favorite_list)
+        user.favorites_list_id = favorite_list.id
+    return user.favorites_list_id
+
+
+def favorites_list(user):
+    return WordList.objects.get(id=favorites_list_id(user))
+
+
+def with_flags(words, user):
+    """Annotate a Word queryset with ``is_favorite`` and ``has_flashcard`` for ``user``."""
+    favorites = WordList.words.through.objects.filter(
+        wordlist_id=favorites_list_id(user), word_id=OuterRef("pk")
+    )
+    flashcards = Flashcard.objects.filter(user=user, word_id=OuterRef("pk"))
+    return words.annotate(is_favorite=Exists(favorites), has_flashcard=Exists(flashcards))
@@ -0,0 +1,134 @@
+"""
+Typo-tolerant "did you mean" lookup over the word bank.
+
+Each worker keeps a trigram inverted index of the normalized Dutch words and
+translations, built on first use. Candidates sharing enough trigrams with the
+query are verified with a bounded Levenshtein distance. When the word bank
+version changes, words added since the build are indexed incrementally; edits
+and deletions trigger a full rebuild.
+"""
+
+import threading
+from collections import Counter
+
+from . import bank
+from .models import Word
+from .normalization import fold, normalize_dutch
+
+MAX_SUGGESTIONS = 5
+
+
+def max_distance(term):
+    return 1 if len(term) <= 4 else 2
+
+
+def trigrams(term):
+    padded = f" {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(a, b, limit, transpositions=False):
+    """
+    Edit distance between ``a`` and ``b``, or None if it is more than ``limit``.
+
+    With ``transpositions``, swapping two adjacent characters counts as one edit
+    (optimal string alignment distance).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if transpositions and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class FuzzyIndex:
+    def __init__(self):
+        self.terms = []
+        self.term_ids = {}
+        self.labels = []
+        self.postings = {}
+        self.last_word_id = 0
+        self.version = None
+
+    def add_term(self, term, label):
+        if not term or term in self.term_ids:
+            return
+        self.term_ids[term] = len(self.terms)
+        self.terms.append(term)
+        self.labels.append(label)
+        for trigram in trigrams(term):
+            self.postings.setdefault(trigram, []).append(self.term_ids[term])
+
+    def add_words(self, words):
+        for word_id, dutch, translation in words:
+            self.add_term(normalize_dutch(dutch), dutch)
+            self.add_term(fold(translation), translation)
+            self.last_word_id = max(self.last_word_id, word_id)
+
+    def suggest(self, query, limit=MAX_SUGGESTIONS):
+        term = normalize_dutch(query)
+        if not term:
+            return []
+        limit_distance = max_distance(term)
+        query_trigrams = trigrams(term)
+        # Each edit changes at most three trigrams
+        min_shared = max(1, len(query_trigrams) - 3 * limit_distance)
+
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.postings.get(trigram, ()))
+
+        matches = []
+        for term_id, count in shared.items():
+            if count < min_shared:
+                continue
+            distance = bounded_levenshtein(term, self.terms[term_id], limit_distance)
+            if distance is not None:
+                matches.append((distance, -count, self.terms[term_id], term_id))
+
+        matches.sort()
+        return [self.labels[term_id] for *_, term_id in matches[:limit]]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def _load(index, after_id=0):
+    words = Word.objects.filter(id__gt=after_id).order_by("id")
+    index.add_words(words.values_list("id", "dutch", "translation").iterator())
+
+
+def get_index():
+    """Return this worker's index, brought up to date with the word bank."""
+    global _index
+    version, generation = bank.current()
+    index = _index
+    if index is not None and index.version == (version, generation):
+        return index
+
+    with _lock:
+        index = _index
+        if index is None or index.version[1] != generation:
+            index = FuzzyIndex()
+            _load(index)
+        elif index.version[0] != version:
+            _load(index, index.last_word_id)
+        index.version = (version, generation)
+        _index = index
+    return index
+
+
+def suggest(query, limit=MAX_SUGGESTIONS):
+    """Words and translations within a few typos of ``query``, closest first."""
+    return get_index().suggest(query, limit)
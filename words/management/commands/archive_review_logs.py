@@ -0,0 +1,87 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from words.models import ReviewLog
+
+
+class Command(BaseCommand):
+    help = "Move old review log rows into a compressed JSON Lines archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Archive rows older than this many days (default: 365)",
+        )
+        parser.add_argument(
+            "--output-dir",
+            type=str,
+            default="backups",
+            help="Directory to save the archive (default: backups/)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows to archive per batch (default: 5000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows would be archived",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        old_logs = ReviewLog.objects.filter(reviewed_at__lt=cutoff).order_by("id")
+
+        total = old_logs.count()
+        if options["dry_run"] or total == 0:
+            self.stdout.write(f"{total} review logs older than {cutoff:%Y-%m-%d} to archive")
+            return
+
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        archive_path = output_dir / f"review_logs_{timestamp}.jsonl.gz"
+
+        fields = [
+            "id",
+            "user_id",
+            "word_id",
+            "card_id",
+            "rating",
+            "elapsed_ms",
+            "previous_interval",
+            "new_interval",
+            "reviewed_at",
+        ]
+        archived = 0
+        last_id = 0
+
+        with gzip.open(archive_path, "wt", encoding="utf-8") as archive:
+            while True:
+                batch = list(
+                    old_logs.filter(id__gt=last_id).values(*fields)[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+
+                for row in batch:
+                    row["reviewed_at"] = row["reviewed_at"].isoformat()
+                    archive.write(json.dumps(row) + "\n")
+                archive.flush()
+
+                last_id = batch[-1]["id"]
+                with transaction.atomic():
+                    ReviewLog.objects.filter(id__in=[row["id"] for row in batch]).delete()
+                archived += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} review logs to {archive_path}"))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from words import bank
+from words.models import Word
+
+
+class Command(BaseCommand):
+    help = "Recompute the normalized search columns, e.g. after the normalization rules change"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Words to update per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many words would change",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        changed = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                Word.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "dutch", "translation", "dutch_normalized", "translation_normalized")[
+                    :batch_size
+                ]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            stale = []
+            for word in batch:
+                normalized = (word.dutch_normalized, word.translation_normalized)
+                word.normalize()
+                if (word.dutch_normalized, word.translation_normalized) != normalized:
+                    stale.append(word)
+
+            changed += len(stale)
+            if stale and not options["dry_run"]:
+                Word.objects.bulk_update(stale, ["dutch_normalized", "translation_normalized"])
+
+        if changed and not options["dry_run"]:
+            bank.words_changed()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{changed} words normalized" + (" (dry run)" if options["dry_run"] else "")
+            )
+        )
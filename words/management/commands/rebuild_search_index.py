@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from words.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index over words"
+
+    def handle(self, *args, **options):
+        if not rebuild_index():
+            self.stderr.write(
+                self.style.WARNING("This database backend has no search index to rebuild")
+            )
+            return
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
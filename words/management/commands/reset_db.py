@@ -2,9 +2,9 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from accounts.models import CustomUser
-from progress.models import DailyActivity, UserProgress
+from progress.models import DailyActivity, UserProgress, UserStats
 from quiz.models import QuizAnswer, QuizSession
-from words.models import Example, Flashcard, Word, WordList
+from words.models import Example, Flashcard, ReviewLog, Word, WordList
 
 
 class Command(BaseCommand):
@@ -49,6 +49,9 @@ class Command(BaseCommand):
             self.stdout.write("Clearing quiz sessions...")
             QuizSession.objects.all().delete()
 
+            self.stdout.write("Clearing review logs...")
+            ReviewLog.objects.all().delete()
+
             self.stdout.write("Clearing flashcards...")
             Flashcard.objects.all().delete()
 
@@ -61,6 +64,7 @@ class Command(BaseCommand):
             self.stdout.write("Clearing progress data...")
             DailyActivity.objects.all().delete()
             UserProgress.objects.all().delete()
+            UserStats.objects.all().delete()
 
             self.stdout.write("Clearing users...")
             CustomUser.objects.all().delete()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0006_alter_word_source'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='categorizedword',
+            index=models.Index(fields=['category', 'word'], name='categorizedword_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flashcard',
+            index=models.Index(fields=['user', 'next_review'], name='flashcard_user_due_idx'),
+        ),
+    ]
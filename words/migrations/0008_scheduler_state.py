@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0007_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flashcard',
+            name='difficulty',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='flashcard',
+            name='interval',
+            field=models.FloatField(default=0.0, help_text='Current interval in days'),
+        ),
+        migrations.AddField(
+            model_name='flashcard',
+            name='repetitions',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='flashcard',
+            name='stability',
+            field=models.FloatField(default=0.0),
+        ),
+    ]
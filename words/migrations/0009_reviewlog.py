@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:26
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0008_scheduler_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.PositiveSmallIntegerField(choices=[(1, 'Again'), (2, 'Hard'), (3, 'Good'), (4, 'Easy')])),
+                ('elapsed_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('previous_interval', models.FloatField()),
+                ('new_interval', models.FloatField()),
+                ('reviewed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_logs', to='words.flashcard')),
+            ],
+        ),
+    ]
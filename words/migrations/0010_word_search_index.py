@@ -0,0 +1,84 @@
+from django.db import migrations
+
+FIELDS = ("dutch", "translation", "context", "example")
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE words_word_fts USING fts5(
+        dutch, translation, context, example,
+        content='words_word', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER words_word_fts_insert AFTER INSERT ON words_word BEGIN
+        INSERT INTO words_word_fts(rowid, dutch, translation, context, example)
+        VALUES (new.id, new.dutch, new.translation, new.context, new.example);
+    END
+    """,
+    """
+    CREATE TRIGGER words_word_fts_delete AFTER DELETE ON words_word BEGIN
+        INSERT INTO words_word_fts(words_word_fts, rowid, dutch, translation, context, example)
+        VALUES ('delete', old.id, old.dutch, old.translation, old.context, old.example);
+    END
+    """,
+    """
+    CREATE TRIGGER words_word_fts_update AFTER UPDATE ON words_word BEGIN
+        INSERT INTO words_word_fts(words_word_fts, rowid, dutch, translation, context, example)
+        VALUES ('delete', old.id, old.dutch, old.translation, old.context, old.example);
+        INSERT INTO words_word_fts(rowid, dutch, translation, context, example)
+        VALUES (new.id, new.dutch, new.translation, new.context, new.example);
+    END
+    """,
+    "INSERT INTO words_word_fts(words_word_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS words_word_fts_insert",
+    "DROP TRIGGER IF EXISTS words_word_fts_delete",
+    "DROP TRIGGER IF EXISTS words_word_fts_update",
+    "DROP TABLE IF EXISTS words_word_fts",
+]
+
+POSTGRES_FORWARD = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+    f"CREATE INDEX words_word_{field}_trgm ON words_word USING gin (UPPER({field}) gin_trgm_ops)"
+    for field in FIELDS
+]
+
+POSTGRES_BACKWARD = [f"DROP INDEX IF EXISTS words_word_{field}_trgm" for field in FIELDS]
+
+
+def _sqlite_has_trigram(connection):
+    # The FTS5 trigram tokenizer was added in SQLite 3.34
+    return connection.Database.sqlite_version_info >= (3, 34, 0)
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite" and _sqlite_has_trigram(schema_editor.connection):
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0009_reviewlog'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
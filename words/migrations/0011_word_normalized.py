@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0010_word_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='dutch_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='translation_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['dutch_normalized'], name='word_dutch_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['translation_normalized'], name='word_translation_norm_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0012_word_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flashcard',
+            name='error_rate',
+            field=models.FloatField(default=0.0, help_text='Recent share of wrong quiz answers (moving average)'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_owner_from_card(apps, schema_editor):
+    ReviewLog = apps.get_model('words', 'ReviewLog')
+    Flashcard = apps.get_model('words', 'Flashcard')
+    cards = Flashcard.objects.filter(id=OuterRef('card_id'))
+    ReviewLog.objects.update(
+        user_id=Subquery(cards.values('user_id')[:1]),
+        word_id=Subquery(cards.values('word_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0013_flashcard_error_rate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewlog',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='review_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='reviewlog',
+            name='word',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_logs', to='words.word'),
+        ),
+        migrations.RunPython(copy_owner_from_card, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='reviewlog',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='reviewlog',
+            name='card',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_logs', to='words.flashcard'),
+        ),
+    ]
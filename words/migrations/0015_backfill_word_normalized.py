@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:40
+
+from django.db import migrations
+
+from words.normalization import fold, normalize_dutch
+
+BATCH_SIZE = 2000
+
+
+def backfill_normalized(apps, schema_editor):
+    # Historical models have no save() override, so compute the columns here
+    Word = apps.get_model('words', 'Word')
+    last_id = 0
+    while True:
+        batch = list(
+            Word.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .only('id', 'dutch', 'translation')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        for word in batch:
+            word.dutch_normalized = normalize_dutch(word.dutch)
+            word.translation_normalized = fold(word.translation)
+        Word.objects.bulk_update(batch, ['dutch_normalized', 'translation_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0014_reviewlog_user_word'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
+
+from .normalization import fold, normalize_dutch
 
 User = get_user_model()
 
@@ -15,15 +18,36 @@ class Word(models.Model):
     part_of_speech = models.CharField(max_length=50, blank=True, default="")
     context = models.TextField(blank=True, default="")
     example = models.TextField(blank=True, default="")
+    dutch_normalized = models.CharField(max_length=200, blank=True, default="", editable=False)
+    translation_normalized = models.CharField(
+        max_length=200, blank=True, default="", editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ["dutch", "translation", "source"]
         ordering = ["dutch"]
+        indexes = [
+            models.Index(fields=["dutch", "id"], name="word_dutch_id_idx"),
+            models.Index(fields=["source", "dutch", "id"], name="word_source_dutch_id_idx"),
+            models.Index(fields=["dutch_normalized"], name="word_dutch_norm_idx"),
+            models.Index(fields=["translation_normalized"], name="word_translation_norm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.dutch} - {self.translation}"
 
+    def normalize(self):
+        self.dutch_normalized = normalize_dutch(self.dutch)
+        self.translation_normalized = fold(self.translation)
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"dutch", "translation"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "dutch_normalized", "translation_normalized"}
+        super().save(*args, **kwargs)
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -49,6 +73,9 @@ class CategorizedWord(models.Model):
     class Meta:
         unique_together = ["word", "category"]
         ordering = ["category__name"]
+        indexes = [
+            models.Index(fields=["category", "word"], name="categorizedword_category_idx"),
+        ]
 
 
 class Flashcard(models.Model):
@@ -59,15 +86,50 @@ class Flashcard(models.Model):
     next_review = models.DateTimeField(null=True, blank=True)
     last_reviewed = models.DateTimeField(null=True, blank=True)
     ease_factor = models.FloatField(default=2.5)
+    interval = models.FloatField(default=0.0, help_text="Current interval in days")
+    repetitions = models.IntegerField(default=0)
+    stability = models.FloatField(default=0.0)
+    difficulty = models.FloatField(default=0.0)
+    error_rate = models.FloatField(
+        default=0.0, help_text="Recent share of wrong quiz answers (moving average)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ["user", "word"]
+        indexes = [
+            models.Index(fields=["user", "next_review"], name="flashcard_user_due_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.word.dutch} (Box {self.box})"
 
 
+class ReviewLog(models.Model):
+    RATING_CHOICES = [
+        (1, "Again"),
+        (2, "Hard"),
+        (3, "Good"),
+        (4, "Easy"),
+    ]
+    # The log outlives the card, so removing a flashcard keeps its review history
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="review_logs")
+    word = models.ForeignKey(
+        Word, on_delete=models.SET_NULL, null=True, blank=True, related_name="review_logs"
+    )
+    card = models.ForeignKey(
+        Flashcard, on_delete=models.SET_NULL, null=True, blank=True, related_name="review_logs"
+    )
+    rating = models.PositiveSmallIntegerField(choices=RATING_CHOICES)
+    elapsed_ms = models.PositiveIntegerField(null=True, blank=True)
+    previous_interval = models.FloatField()
+    new_interval = models.FloatField()
+    reviewed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.card_id} - {self.get_rating_display()} ({self.reviewed_at:%Y-%m-%d})"
+
+
 class WordList(models.Model):
     LIST_TYPE_CHOICES = [
         ("FAV", "Favorites"),
@@ -0,0 +1,30 @@
+"""
+Normalized forms of words for search.
+
+``fold`` case-folds (so Cyrillic and other scripts compare case-insensitively)
+and strips diacritics (é -> e, ë -> e); ``normalize_dutch`` also drops a
+leading article, so "de fiets", "Fiets" and "fiets" share one key.
+"""
+
+import unicodedata
+
+DUTCH_ARTICLES = ("de", "het", "een", "'t")
+
+
+def fold(text):
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+def normalize_dutch(text):
+    folded = fold(text)
+    article, _, rest = folded.partition(" ")
+    if article in DUTCH_ARTICLES and rest:
+        return rest
+    return folded
+
+
+def prefix_range(field, prefix):
+    """Lookups for ``field`` starting with ``prefix`` as an index-friendly range."""
+    return {f"{field}__gte": prefix, f"{field}__lt": prefix + "\U0010ffff"}
@@ -0,0 +1,136 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are fetched with ``WHERE (a, b) > (last_a, last_b) ORDER BY a, b LIMIT n``
+instead of OFFSET, so every page costs one index range scan however deep it is.
+Cursors are opaque URL-safe tokens holding the direction and the boundary key.
+
+``CachedCountPaginator`` is for numbered pages: the page itself is a LIMIT/OFFSET
+query, and the total is cached until the word bank version changes.
+"""
+
+import base64
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from . import bank
+
+PAGE_SIZE = 50
+
+
+def encode_cursor(direction, key):
+    data = json.dumps([direction, list(key)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return ``(direction, key)``, or None for a missing or malformed cursor."""
+    if not token:
+        return None
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        direction, key = json.loads(data)
+    except (ValueError, TypeError):
+        return None
+    if direction not in ("after", "before") or not isinstance(key, list):
+        return None
+    return direction, key
+
+
+def _clean_key(model, fields, key):
+    """Return ``key`` converted to the types of ``fields``, or None if it does not fit them."""
+    if len(key) != len(fields):
+        return None
+    cleaned = []
+    for field, value in zip(fields, key, strict=True):
+        if value is None or isinstance(value, (bool, list, dict)):
+            return None
+        try:
+            cleaned.append(model._meta.get_field(field).to_python(value))
+        except ValidationError:
+            return None
+    return cleaned
+
+
+def _beyond(fields, key, lookup):
+    # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y). The redundant a >= x bound
+    # lets the database start an index range scan at the cursor.
+    condition = Q()
+    for i, field in enumerate(fields):
+        equal = dict(zip(fields[:i], key[:i], strict=True))
+        condition |= Q(**equal, **{f"{field}__{lookup}": key[i]})
+    return Q(**{f"{fields[0]}__{lookup}e": key[0]}) & condition
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, prev_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_page(queryset, fields, cursor=None, size=PAGE_SIZE):
+    """Return the page of ``queryset`` ordered by ``fields`` that ``cursor`` points to."""
+    decoded = decode_cursor(cursor)
+    if decoded is not None:
+        key = _clean_key(queryset.model, fields, decoded[1])
+        decoded = (decoded[0], key) if key is not None else None
+
+    if decoded is None:
+        direction = "after"
+        rows = list(queryset.order_by(*fields)[: size + 1])
+    else:
+        direction, key = decoded
+        if direction == "after":
+            rows = list(queryset.filter(_beyond(fields, key, "gt")).order_by(*fields)[: size + 1])
+        else:
+            descending = [f"-{field}" for field in fields]
+            rows = list(
+                queryset.filter(_beyond(fields, key, "lt")).order_by(*descending)[: size + 1]
+            )
+
+    has_more = len(rows) > size
+    items = rows[:size]
+    if direction == "before":
+        items.reverse()
+
+    def key_of(item):
+        return [getattr(item, field) for field in fields]
+
+    next_cursor = prev_cursor = None
+    if items:
+        if direction == "before" or has_more:
+            next_cursor = encode_cursor("after", key_of(items[-1]))
+        if (direction == "after" and decoded is not None) or (direction == "before" and has_more):
+            prev_cursor = encode_cursor("before", key_of(items[0]))
+    return KeysetPage(items, next_cursor, prev_cursor)
+
+
+class CachedCountPaginator(Paginator):
+    """A Paginator whose COUNT(*) is cached under ``count_key`` and the bank version."""
+
+    count_timeout = 3600
+
+    def __init__(self, object_list, per_page, count_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        key = f"words:count:{bank.current()[0]}:{self.count_key}"
+        total = cache.get(key)
+        if total is None:
+            total = super().count
+            cache.set(key, total, self.count_timeout)
+        return total
@@ -0,0 +1,96 @@
+"""
+Per-worker cache of browse and search results.
+
+Only the ordered word ids are cached, keyed by the word bank version plus the
+normalized query, source and cursor, so a repeated query costs one version
+lookup and one ``id__in`` fetch, which also applies the per-user annotations.
+Any Word or CategorizedWord write bumps the version, which orphans old entries;
+they age out through LRU eviction.
+"""
+
+import threading
+from collections import OrderedDict
+
+from . import bank, search
+from .normalization import fold
+from .pagination import KeysetPage, keyset_page
+
+MAX_ENTRIES = 1024
+
+
+class LRUCache:
+    """A thread-safe mapping that drops the least recently used key when full."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def info(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+_cache = LRUCache()
+
+
+def cache_info():
+    return _cache.info()
+
+
+def _fetch(words, ids):
+    found = words.in_bulk(ids)
+    return [found[word_id] for word_id in ids if word_id in found]
+
+
+def search_words(words, query, source=""):
+    """``search.search_words`` with the result ids cached; ``words`` supplies annotations."""
+    key = (bank.current()[0], "search", fold(query), source)
+    ids = _cache.get(key)
+    if ids is not None:
+        return _fetch(words, ids)
+    found = search.search_words(query, source, words=words)
+    _cache.set(key, [word.id for word in found])
+    return found
+
+
+def browse_page(words, source="", cursor=None):
+    """A keyset page of ``words`` (optionally from one source), with its ids cached."""
+    key = (bank.current()[0], "browse", source, cursor or "")
+    cached = _cache.get(key)
+    if cached is not None:
+        ids, next_cursor, prev_cursor = cached
+        return KeysetPage(_fetch(words, ids), next_cursor, prev_cursor)
+    if source:
+        words = words.filter(source=source)
+    page = keyset_page(words, ("dutch", "id"), cursor)
+    _cache.set(key, ([word.id for word in page.items], page.next_cursor, page.prev_cursor))
+    return page
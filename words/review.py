@@ -0,0 +1,263 @@
+"""
+Server-side review session queue for flashcard reviews.
+
+A batch of due cards is selected once (with their words joined in) and kept in
+the user's session, so showing and rating each card does not re-run the due-card
+queries. Rating a card only updates the card itself: its review log row, its
+activity and progress counts and its box move are buffered in the session and
+written in bulk once ``REVIEW_FLUSH_SIZE`` ratings have piled up, when the next
+batch is selected and when the user logs out. A session that simply expires
+loses the log rows and counts of fewer than ``REVIEW_FLUSH_SIZE`` ratings; the
+card schedules themselves are saved as each card is rated.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from nederlandse_workbook.utils import timing
+from progress import counters, stats
+from progress.models import UserProgress
+
+from . import scheduling, signals
+from .models import Flashcard, ReviewLog, Word
+from .scheduling import GRADES, STATE_FIELDS
+
+REVIEW_BATCH_SIZE = 20
+REVIEW_FLUSH_SIZE = 10
+
+QUEUE_KEY = "review_queue"
+TOTAL_KEY = "review_total"
+SCHEDULER_KEY = "review_scheduler"
+SHOWN_KEY = "review_shown"
+PENDING_KEY = "review_pending"
+
+
+def _serialize_card(card):
+    return {
+        "id": card.id,
+        **{field: getattr(card, field) for field in STATE_FIELDS},
+        "last_reviewed": card.last_reviewed.isoformat() if card.last_reviewed else None,
+        "error_rate": card.error_rate,
+        "word": {
+            "id": card.word_id,
+            "dutch": card.word.dutch,
+            "translation": card.word.translation,
+            "example": card.word.example,
+        },
+    }
+
+
+def get_queue(request):
+    """Return the queued cards for this session (may be empty)."""
+    return request.session.get(QUEUE_KEY, [])
+
+
+def fill_queue(request):
+    """Select the next batch of due cards for the user and store it in the session."""
+    flush_reviews(request)
+    due_cards = Flashcard.objects.filter(
+        user=request.user, next_review__lte=timezone.now()
+    ).order_by("next_review")
+    batch = list(due_cards.select_related("word")[:REVIEW_BATCH_SIZE])
+    total = due_cards.count() if len(batch) == REVIEW_BATCH_SIZE else len(batch)
+
+    queue = [_serialize_card(card) for card in batch]
+    request.session[QUEUE_KEY] = queue
+    request.session[TOTAL_KEY] = total
+    if queue:
+        request.session[SCHEDULER_KEY] = user_scheduler(request.user)
+    return queue
+
+
+def reset_queue(request):
+    """Forget the queued cards, e.g. after the user's cards were rescheduled."""
+    request.session.pop(QUEUE_KEY, None)
+    request.session.pop(TOTAL_KEY, None)
+    request.session.pop(SCHEDULER_KEY, None)
+
+
+def user_scheduler(user):
+    scheduler = UserProgress.objects.filter(user=user).values_list("scheduler", flat=True).first()
+    return scheduler or "leitner"
+
+
+def session_scheduler(request):
+    """Return the scheduling algorithm recorded when the queue was filled."""
+    if SCHEDULER_KEY not in request.session:
+        request.session[SCHEDULER_KEY] = user_scheduler(request.user)
+    return request.session[SCHEDULER_KEY]
+
+
+def remaining_count(request):
+    return request.session.get(TOTAL_KEY, 0)
+
+
+def last_reviewed(entry):
+    return datetime.fromisoformat(entry["last_reviewed"]) if entry["last_reviewed"] else None
+
+
+def card_for_display(entry):
+    """Return a queue entry in the shape the review template expects."""
+    return {**entry, "last_reviewed": last_reviewed(entry)}
+
+
+def pop_card(request, card_id):
+    """Remove a card from the queue and return its entry, or None if it is not queued."""
+    queue = get_queue(request)
+    for index, entry in enumerate(queue):
+        if entry["id"] == card_id:
+            del queue[index]
+            request.session[QUEUE_KEY] = queue
+            request.session[TOTAL_KEY] = max(remaining_count(request) - 1, 0)
+            return entry
+    return None
+
+
+def discard_word(request, word_id):
+    """Drop any queued card for a word, e.g. after its flashcard was removed."""
+    queue = get_queue(request)
+    kept = [entry for entry in queue if entry["word"]["id"] != word_id]
+    if len(kept) != len(queue):
+        request.session[QUEUE_KEY] = kept
+        request.session[TOTAL_KEY] = max(remaining_count(request) - (len(queue) - len(kept)), 0)
+
+
+def record_review(request, card_id, word_id, rating, state, changes, now):
+    """Buffer the log row and counts of a card rated from ``state`` until flush_reviews."""
+    pending = request.session.get(PENDING_KEY, [])
+    pending.append(
+        {
+            "card_id": card_id,
+            "word_id": word_id,
+            "rating": GRADES[rating],
+            "elapsed_ms": timing.elapsed_ms(request.session, SHOWN_KEY, card_id, now),
+            "previous_interval": state.interval,
+            "new_interval": changes["interval"],
+            "boxes": [state.box, changes["box"]],
+            "reviewed_at": now.isoformat(),
+        }
+    )
+    request.session[PENDING_KEY] = pending
+    if len(pending) >= REVIEW_FLUSH_SIZE:
+        flush_reviews(request)
+
+
+def flush_reviews(request, user=None):
+    """Write the buffered review log rows with one INSERT and count them; returns the count."""
+    pending = request.session.pop(PENDING_KEY, None)
+    if not pending:
+        return 0
+    user = user or request.user
+
+    # Cards removed since they were rated keep their history without the link
+    cards = set(
+        Flashcard.objects.filter(id__in={r["card_id"] for r in pending}).values_list(
+            "id", flat=True
+        )
+    )
+    orphaned = {r["word_id"] for r in pending if r["card_id"] not in cards}
+    words = set(Word.objects.filter(id__in=orphaned).values_list("id", flat=True))
+
+    logs = [
+        ReviewLog(
+            user=user,
+            word_id=r["word_id"] if r["card_id"] in cards or r["word_id"] in words else None,
+            card_id=r["card_id"] if r["card_id"] in cards else None,
+            rating=r["rating"],
+            elapsed_ms=r["elapsed_ms"],
+            previous_interval=r["previous_interval"],
+            new_interval=r["new_interval"],
+            reviewed_at=datetime.fromisoformat(r["reviewed_at"]),
+        )
+        for r in pending
+    ]
+    with transaction.atomic():
+        ReviewLog.objects.bulk_create(logs)
+        _count_reviews(user, logs)
+        # Applied for removed cards too, as their removal took the new box off
+        stats.cards_reviewed(user, [tuple(r["boxes"]) for r in pending])
+    return len(logs)
+
+
+def _count_reviews(user, logs):
+    """Add a set of reviews to DailyActivity (per day) and UserProgress in one pass."""
+    per_day = Counter(log.reviewed_at.date() for log in logs)
+    for day, count in per_day.items():
+        counters.add_activity(user, day, words_reviewed=count)
+    counters.add_progress(user, total_reviews=len(logs))
+
+
+def submit_batch(user, reviews, now=None):
+    """
+    Apply many ratings at once, e.g. ones queued by an offline client.
+
+    ``reviews`` is a list of dicts with ``card_id``, ``rating`` and ``reviewed_at``
+    (a timezone-aware datetime). Returns the accepted count and a list of
+    ``(card_id, reason)`` rejections.
+    """
+    now = now or timezone.now()
+    cards = Flashcard.objects.filter(user=user, id__in={r["card_id"] for r in reviews}).in_bulk()
+    algorithm = user_scheduler(user)
+    original_boxes = {card_id: card.box for card_id, card in cards.items()}
+
+    rejected = []
+    logs = []
+    changed = {}
+    for item in sorted(reviews, key=lambda r: r["reviewed_at"]):
+        card = cards.get(item["card_id"])
+        if card is None:
+            rejected.append((item["card_id"], "unknown card"))
+            continue
+
+        reviewed_at = min(item["reviewed_at"], now)
+        if card.last_reviewed is not None and reviewed_at <= card.last_reviewed:
+            rejected.append((card.id, "already reviewed"))
+            continue
+
+        state = scheduling.card_state(card)
+        changes = scheduling.apply_review(
+            state, item["rating"], algorithm, card.last_reviewed, reviewed_at
+        )
+        if changes is None:
+            rejected.append((card.id, "unknown rating"))
+            continue
+
+        for field, value in changes.items():
+            setattr(card, field, value)
+        changed[card.id] = card
+        logs.append(
+            ReviewLog(
+                user=user,
+                word_id=card.word_id,
+                card=card,
+                rating=GRADES[item["rating"]],
+                elapsed_ms=item.get("elapsed_ms"),
+                previous_interval=state.interval,
+                new_interval=changes["interval"],
+                reviewed_at=reviewed_at,
+            )
+        )
+
+    if logs:
+        with transaction.atomic():
+            Flashcard.objects.bulk_update(
+                changed.values(), ["next_review", "last_reviewed", *STATE_FIELDS]
+            )
+            ReviewLog.objects.bulk_create(logs)
+            _count_reviews(user, logs)
+            stats.cards_reviewed(
+                user, [(original_boxes[card_id], card.box) for card_id, card in changed.items()]
+            )
+        signals.cards_rescheduled.send(
+            sender=Flashcard,
+            user_id=user.pk,
+            cards=[
+                (card.word_id, card.error_rate, card.box, card.last_reviewed)
+                for card in changed.values()
+            ],
+        )
+
+    return len(logs), rejected
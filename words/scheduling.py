@@ -0,0 +1,257 @@
+"""
+Spaced-repetition scheduling strategies for flashcards.
+
+Each strategy is a pure function ``(state, grade, elapsed_days) -> CardState`` so it
+can be applied to one card per request or mapped over a whole deck at once.
+"""
+
+import math
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.utils import timezone
+
+from . import signals
+from .models import Flashcard
+
+GRADES = {"again": 1, "hard": 2, "good": 3, "easy": 4}
+
+LEITNER_INTERVALS = {1: 1, 2: 3, 3: 7, 4: 14, 5: 30}
+
+SM2_MIN_EASE = 1.3
+
+# FSRS-4.5 default parameters and constants
+FSRS_WEIGHTS = (
+    0.4872,
+    1.4003,
+    3.7145,
+    13.8206,
+    5.1618,
+    1.2298,
+    0.8975,
+    0.031,
+    1.6474,
+    0.1367,
+    1.0461,
+    2.1072,
+    0.0793,
+    0.3246,
+    1.587,
+    0.2272,
+    2.8755,
+)
+FSRS_DECAY = -0.5
+FSRS_FACTOR = 19 / 81
+FSRS_RETENTION = 0.9
+FSRS_MAX_INTERVAL = 36500
+
+
+class CardState(NamedTuple):
+    box: int = 1
+    ease_factor: float = 2.5
+    interval: float = 0.0
+    repetitions: int = 0
+    stability: float = 0.0
+    difficulty: float = 0.0
+
+
+STATE_FIELDS = CardState._fields
+
+
+def box_for_interval(interval):
+    """Map an interval in days onto the 1-5 box scale used by the dashboards."""
+    for box, days in LEITNER_INTERVALS.items():
+        if interval <= days:
+            return box
+    return 5
+
+
+def leitner(state, grade, elapsed_days=0.0):
+    if grade == 1:
+        box = 1
+    elif grade == 2:
+        box = max(state.box, 2)
+    elif grade == 3:
+        box = min(state.box + 1, 5)
+    else:
+        box = min(state.box + 2, 5)
+    return state._replace(
+        box=box,
+        interval=float(LEITNER_INTERVALS[box]),
+        repetitions=0 if grade == 1 else state.repetitions + 1,
+    )
+
+
+def sm2(state, grade, elapsed_days=0.0):
+    quality = {1: 0, 2: 3, 3: 4, 4: 5}[grade]
+    ease = state.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    ease = max(ease, SM2_MIN_EASE)
+
+    if quality < 3:
+        repetitions, interval = 0, 1.0
+    else:
+        if state.repetitions == 0:
+            interval = 1.0
+        elif state.repetitions == 1:
+            interval = 6.0
+        else:
+            interval = float(round(max(state.interval, 1.0) * ease))
+        repetitions = state.repetitions + 1
+
+    return state._replace(
+        box=box_for_interval(interval),
+        ease_factor=ease,
+        interval=interval,
+        repetitions=repetitions,
+    )
+
+
+def _fsrs_initial_difficulty(grade):
+    w = FSRS_WEIGHTS
+    return min(max(w[4] - (grade - 3) * w[5], 1.0), 10.0)
+
+
+def _fsrs_retrievability(elapsed_days, stability):
+    return (1 + FSRS_FACTOR * elapsed_days / stability) ** FSRS_DECAY
+
+
+def fsrs(state, grade, elapsed_days=0.0):
+    w = FSRS_WEIGHTS
+
+    if state.stability <= 0:
+        stability = w[grade - 1]
+        difficulty = _fsrs_initial_difficulty(grade)
+    else:
+        retrievability = _fsrs_retrievability(max(elapsed_days, 0.0), state.stability)
+        difficulty = state.difficulty - w[6] * (grade - 3)
+        difficulty = w[7] * _fsrs_initial_difficulty(3) + (1 - w[7]) * difficulty
+        difficulty = min(max(difficulty, 1.0), 10.0)
+
+        if grade == 1:
+            stability = (
+                w[11]
+                * state.difficulty ** -w[12]
+                * ((state.stability + 1) ** w[13] - 1)
+                * math.exp(w[14] * (1 - retrievability))
+            )
+        else:
+            hard_penalty = w[15] if grade == 2 else 1.0
+            easy_bonus = w[16] if grade == 4 else 1.0
+            stability = state.stability * (
+                1
+                + math.exp(w[8])
+                * (11 - state.difficulty)
+                * state.stability ** -w[9]
+                * (math.exp(w[10] * (1 - retrievability)) - 1)
+                * hard_penalty
+                * easy_bonus
+            )
+
+    interval = stability / FSRS_FACTOR * (FSRS_RETENTION ** (1 / FSRS_DECAY) - 1)
+    interval = float(min(max(round(interval), 1), FSRS_MAX_INTERVAL))
+
+    return state._replace(
+        box=box_for_interval(interval),
+        interval=interval,
+        repetitions=0 if grade == 1 else state.repetitions + 1,
+        stability=stability,
+        difficulty=difficulty,
+    )
+
+
+SCHEDULERS = {
+    "leitner": leitner,
+    "sm2": sm2,
+    "fsrs": fsrs,
+}
+
+
+def review(state, rating, algorithm="leitner", elapsed_days=0.0):
+    """Return the card state after a rating, or None for an unknown rating."""
+    grade = GRADES.get(rating)
+    if grade is None:
+        return None
+    return SCHEDULERS[algorithm](state, grade, elapsed_days)
+
+
+def preview(state, algorithm="leitner", elapsed_days=0.0):
+    """Return the interval in days each rating would schedule the card for."""
+    scheduler = SCHEDULERS[algorithm]
+    return {
+        rating: int(scheduler(state, grade, elapsed_days).interval)
+        for rating, grade in GRADES.items()
+    }
+
+
+def convert(state, algorithm, reviewed=True):
+    """Carry a card's progress over to another algorithm's state representation.
+
+    ``reviewed`` is False for a card that has never been rated.
+    """
+    interval = state.interval or float(LEITNER_INTERVALS.get(state.box, 1))
+
+    if algorithm == "leitner":
+        box = box_for_interval(state.interval) if state.interval else state.box
+        return state._replace(box=box, interval=float(LEITNER_INTERVALS[box]))
+    if algorithm == "sm2":
+        repetitions = state.repetitions or (0 if state.box == 1 else state.box)
+        return state._replace(interval=interval, repetitions=repetitions)
+    if algorithm == "fsrs":
+        if not reviewed:
+            # Left at zero so the first rating picks the initial stability
+            return state._replace(stability=0.0, difficulty=0.0)
+        difficulty = state.difficulty or min(max(5 + (2.5 - state.ease_factor) * 4, 1.0), 10.0)
+        return state._replace(
+            interval=interval,
+            stability=state.stability or interval,
+            difficulty=difficulty,
+        )
+    raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+
+
+def elapsed_days(last_reviewed, now):
+    if last_reviewed is None:
+        return 0.0
+    return max((now - last_reviewed).total_seconds() / 86400, 0.0)
+
+
+def card_state(card):
+    """Build a CardState from a Flashcard instance or a dict with the same keys."""
+    if isinstance(card, dict):
+        return CardState(**{field: card[field] for field in STATE_FIELDS})
+    return CardState(**{field: getattr(card, field) for field in STATE_FIELDS})
+
+
+def reschedule_deck(user, algorithm):
+    """Convert every card of a user to another algorithm and persist them in one batch."""
+    cards = list(
+        Flashcard.objects.filter(user=user).only(
+            "id", "last_reviewed", "next_review", *STATE_FIELDS
+        )
+    )
+    states = [
+        convert(card_state(card), algorithm, reviewed=card.last_reviewed is not None)
+        for card in cards
+    ]
+
+    for card, state in zip(cards, states, strict=True):
+        for field, value in zip(STATE_FIELDS, state, strict=True):
+            setattr(card, field, value)
+        if card.last_reviewed is not None:
+            card.next_review = card.last_reviewed + timedelta(days=state.interval)
+
+    Flashcard.objects.bulk_update(cards, ["next_review", *STATE_FIELDS], batch_size=500)
+    signals.cards_rescheduled.send(sender=Flashcard, user_id=user.pk, cards=None)
+    return len(cards)
+
+
+def apply_review(card_state_before, rating, algorithm, last_reviewed, now=None):
+    """Return the model field changes for a rating, or None for an unknown rating."""
+    now = now or timezone.now()
+    state = review(card_state_before, rating, algorithm, elapsed_days(last_reviewed, now))
+    if state is None:
+        return None
+    changes = dict(zip(STATE_FIELDS, state, strict=True))
+    changes["next_review"] = now + timedelta(days=state.interval)
+    changes["last_reviewed"] = now
+    return changes
@@ -0,0 +1,177 @@
+"""
+Full-text word search.
+
+Words are first matched by prefix on their normalized columns (see
+words.normalization). On SQLite, words are also indexed in an FTS5 table with
+the trigram tokenizer (see migration 0010), kept in sync with ``words_word`` by
+triggers and ranked with bm25. On PostgreSQL the same migration adds pg_trgm GIN indexes, which back
+the ``icontains`` filter, and results are ranked by trigram similarity. Other
+backends use an unindexed filter for substring matches; queries too short to
+form a trigram only use the prefix lookup.
+"""
+
+from django.db import connection, connections
+from django.db.models import Case, F, FloatField, Func, Q, Value, When
+from django.db.models.functions import Greatest
+
+from .models import Word
+from .normalization import fold, normalize_dutch, prefix_range
+
+SEARCH_FIELDS = ("dutch", "translation", "context", "example")
+FTS_TABLE = "words_word_fts"
+# bm25 column weights: dutch, translation, context, example
+FTS_WEIGHTS = (10.0, 10.0, 2.0, 1.0)
+MIN_QUERY_LENGTH = 3
+PG_TRGM_INDEXES = tuple(f"words_word_{field}_trgm" for field in SEARCH_FIELDS)
+
+# Recreated after every migrate: SQLite drops a table's triggers when a migration
+# rebuilds it (e.g. to add a column)
+FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON words_word BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, dutch, translation, context, example)
+        VALUES (new.id, new.dutch, new.translation, new.context, new.example);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON words_word BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, dutch, translation, context, example)
+        VALUES ('delete', old.id, old.dutch, old.translation, old.context, old.example);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE ON words_word BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, dutch, translation, context, example)
+        VALUES ('delete', old.id, old.dutch, old.translation, old.context, old.example);
+        INSERT INTO {FTS_TABLE}(rowid, dutch, translation, context, example)
+        VALUES (new.id, new.dutch, new.translation, new.context, new.example);
+    END
+    """,
+]
+
+_fts_available = None
+
+
+def fts_available():
+    """Whether the SQLite FTS5 table exists; checked once per process."""
+    global _fts_available
+    if connection.vendor != "sqlite":
+        return False
+    if _fts_available is None:
+        _fts_available = FTS_TABLE in connection.introspection.table_names()
+    return _fts_available
+
+
+def ensure_triggers(using="default", **kwargs):
+    """post_migrate handler that restores the FTS5 sync triggers if they are missing."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    if FTS_TABLE not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for statement in FTS_TRIGGERS:
+            cursor.execute(statement)
+
+
+def _contains(query):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__icontains": query})
+    return condition
+
+
+def _match_expression(query):
+    # A quoted phrase matches the query as a substring under the trigram tokenizer
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _fts_ids(query, source, limit):
+    sql = (
+        f"SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE} "
+        f"JOIN {Word._meta.db_table} ON {Word._meta.db_table}.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [_match_expression(query)]
+    if source:
+        sql += f" AND {Word._meta.db_table}.source = %s"
+        params.append(source)
+    weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+    sql += f" ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _similarity(field, query):
+    return Func(F(field), Value(query), function="similarity", output_field=FloatField())
+
+
+def _prefix_matches(query, words):
+    """Words whose normalized dutch or translation starts with ``query``, exact ones first."""
+    dutch_key, translation_key = normalize_dutch(query), fold(query)
+    exact = Q(dutch_normalized=dutch_key) | Q(translation_normalized=translation_key)
+    return (
+        words.filter(
+            Q(**prefix_range("dutch_normalized", dutch_key))
+            | Q(**prefix_range("translation_normalized", translation_key))
+        )
+        .annotate(exact=Case(When(exact, then=Value(0)), default=Value(1)))
+        .order_by("exact", "dutch_normalized", "id")
+    )
+
+
+def _substring_matches(query, words, source, limit):
+    if fts_available():
+        ids = _fts_ids(query, source, limit)
+        found = words.in_bulk(ids)
+        return [found[word_id] for word_id in ids if word_id in found]
+
+    words = words.filter(_contains(query))
+    if connection.vendor == "postgresql":
+        words = words.annotate(
+            rank=Greatest(_similarity("dutch", query), _similarity("translation", query))
+        ).order_by("-rank", "dutch")
+    return list(words[:limit])
+
+
+def search_words(query, source="", limit=100, words=None):
+    """
+    Return up to ``limit`` words matching ``query``, best matches first.
+
+    ``words`` is an optional base queryset, e.g. one with annotations to keep.
+
+    Headwords and translations starting with the normalized query come first
+    (an indexed range lookup); longer queries are then filled up with substring
+    matches from the full-text index.
+    """
+    query = query.strip()
+    words = Word.objects.all() if words is None else words
+    if source:
+        words = words.filter(source=source)
+    if not fold(query):
+        return []
+
+    results = list(_prefix_matches(query, words)[:limit])
+    if len(results) < limit and len(query) >= MIN_QUERY_LENGTH:
+        seen = {word.id for word in results}
+        for word in _substring_matches(query, words, source, limit):
+            if word.id not in seen:
+                results.append(word)
+    return results[:limit]
+
+
+def rebuild_index():
+    """Rebuild the search index from ``words_word``; returns False if there is none."""
+    with connection.cursor() as cursor:
+        if fts_available():
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+            return True
+        if connection.vendor == "postgresql":
+            for name in PG_TRGM_INDEXES:
+                cursor.execute(f"REINDEX INDEX {name}")
+            return True
+    return False
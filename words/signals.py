@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import bank, favorites, review
+from .models import CategorizedWord, Category, Word
+
+# Sent after cards are rescheduled with queryset updates, which skip post_save.
+# ``cards`` holds (word_id, error_rate, box, last_reviewed) tuples, or is None
+# when the whole deck of ``user_id`` changed.
+cards_rescheduled = Signal()
+
+
+@receiver(post_save, sender=Word)
+def word_saved(sender, instance, created, **kwargs):
+    if created:
+        bank.words_added()
+    else:
+        bank.words_changed()
+
+
+@receiver(post_delete, sender=Word)
+def word_deleted(sender, instance, **kwargs):
+    bank.words_changed()
+
+
+@receiver(post_save, sender=CategorizedWord)
+@receiver(post_delete, sender=CategorizedWord)
+def category_membership_changed(sender, instance, **kwargs):
+    bank.membership_changed()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    bank.categories_changed()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        favorites.favorites_list_id(instance)
+
+
+@receiver(user_logged_out)
+def logged_out(sender, request, user, **kwargs):
+    if user is not None and hasattr(request, "session"):
+        review.flush_reviews(request, user)
@@ -1,12 +1,11 @@
 from django import template
 
-from words.models import CategorizedWord
+from words.categories import categories_of
 
 register = template.Library()
 
 
 @register.simple_tag
 def get_word_categories(word):
-    """Get all categories for a given word"""
-    categorized_words = CategorizedWord.objects.filter(word=word).select_related("category")
-    return [cw.category for cw in categorized_words]
+    """Get all categories for a given word, using prefetched ones when present"""
+    return categories_of(word)
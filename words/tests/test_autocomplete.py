@@ -0,0 +1,113 @@
+"""
+Tests for prefix autocomplete and the add_word duplicate warning.
+"""
+
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words import autocomplete, bank
+from words.models import Word
+from words.normalization import normalize_dutch
+
+
+class AutocompleteTests(TestCase):
+    """Tests for the in-memory prefix index."""
+
+    def setUp(self):
+        cache.clear()
+        autocomplete._index = None
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.fiets = Word.objects.create(dutch="de fiets", translation="the bicycle", source="EN")
+        self.fietser = Word.objects.create(
+            dutch="de fietser", translation="the cyclist", source="EN"
+        )
+        Word.objects.create(dutch="het huis", translation="будинок", source="UK")
+
+    def complete(self, query, **params):
+        response = self.client.get(reverse("autocomplete_words"), {"q": query, **params})
+        return [word["dutch"] for word in response.json()["results"]]
+
+    def test_prefix_matches(self):
+        """Test that Dutch words and translations complete on their normalized prefix."""
+        self.assertEqual(self.complete("Fie"), ["de fiets", "de fietser"])
+        self.assertEqual(self.complete("de fietse"), ["de fietser"])
+        self.assertEqual(self.complete("БУД"), ["het huis"])
+        self.assertEqual(self.complete("fie", limit=1), ["de fiets"])
+        self.assertEqual(self.complete("huis", source="EN"), [])
+
+    def test_limit_is_clamped(self):
+        """Test that a zero or negative limit still returns one match."""
+        self.assertEqual(self.complete("fie", limit=-1), ["de fiets"])
+        self.assertEqual(self.complete("fie", limit=0), ["de fiets"])
+
+    def test_matching_stops_at_the_limit(self):
+        """Test that no more matches are collected once the limit is reached."""
+        index = autocomplete.get_index()
+
+        self.assertEqual(len(index.complete("fie", limit=1)), 1)
+        self.assertEqual(len(index.complete("the", limit=1)), 1)
+        self.assertEqual(len(index.complete("the", limit=5)), 2)
+
+    def test_warm_index_skips_database(self):
+        """Test that keystroke lookups are answered without queries once the index is built."""
+        autocomplete.get_index()
+
+        with CaptureQueriesContext(connection) as context:
+            autocomplete.complete("fie")
+
+        self.assertEqual(context.captured_queries, [])
+
+    def test_rebuilt_after_word_bank_change(self):
+        """Test that a new word is visible after the bank version bump."""
+        self.assertEqual(self.complete("olif"), [])
+
+        Word.objects.create(dutch="de olifant", translation="the elephant", source="EN")
+
+        self.assertEqual(self.complete("olif"), ["de olifant"])
+
+    def test_new_words_are_loaded_incrementally(self):
+        """Test that an added word is merged in with one query for the new rows."""
+        index = autocomplete.get_index()
+        olifant = Word.objects.create(dutch="de olifant", translation="the elephant", source="EN")
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertIs(autocomplete.get_index(), index)
+
+        word_queries = [q["sql"] for q in context.captured_queries if "words_word" in q["sql"]]
+        self.assertEqual(len(word_queries), 1)
+        self.assertIn(f'"id" > {olifant.id - 1}', word_queries[0])
+        self.assertEqual(self.complete("olif"), ["de olifant"])
+
+    def test_rebuilt_after_change_by_another_worker(self):
+        """Test that a generation bump from another cache connection rebuilds the index."""
+        self.assertEqual(self.complete("fie"), ["de fiets", "de fietser"])
+
+        # Another worker renames a word and bumps the shared version
+        Word.objects.filter(pk=self.fietser.pk).update(
+            dutch="de loper", dutch_normalized=normalize_dutch("de loper")
+        )
+        other_worker = caches.create_connection("default")
+        other_worker.set(bank.VERSION_KEY, "elsewhere", None)
+        other_worker.set(bank.GENERATION_KEY, "elsewhere", None)
+
+        self.assertEqual(self.complete("fie"), ["de fiets"])
+        self.assertEqual(self.complete("lop"), ["de loper"])
+
+    def test_add_word_warns_about_duplicates(self):
+        """Test that add_word asks for confirmation before adding a known Dutch word."""
+        data = {"dutch": "Fiets", "translation": "bike", "source": "EN"}
+
+        response = self.client.post(reverse("add_word"), data)
+        self.assertEqual([word["id"] for word in response.context["duplicates"]], [self.fiets.id])
+        self.assertContains(response, "already in the word bank")
+        self.assertFalse(Word.objects.filter(translation="bike").exists())
+
+        self.client.post(reverse("add_word"), {**data, "confirm_duplicate": "1"})
+        self.assertTrue(Word.objects.filter(translation="bike").exists())
@@ -0,0 +1,123 @@
+"""
+Tests for category pages and batched category lookups.
+"""
+
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words import bank
+from words.models import CategorizedWord, Category, Word
+
+
+class CategoriesListTests(TestCase):
+    """Tests for Count()-annotated and cached category pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.animals = Category.objects.create(name="Animals")
+        self.food = Category.objects.create(name="Food")
+        self.words = [
+            Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            for i in range(3)
+        ]
+        for word in self.words:
+            CategorizedWord.objects.create(word=word, category=self.food)
+        CategorizedWord.objects.create(word=self.words[0], category=self.animals)
+
+    def listed(self, **params):
+        response = self.client.get(reverse("categories_list"), params)
+        return [(c.name, c.word_count) for c in response.context["page_obj"]]
+
+    def test_counts_and_sorting(self):
+        """Test that word counts are annotated and sort=size orders by them."""
+        self.assertEqual(self.listed(), [("Animals", 1), ("Food", 3)])
+        self.assertEqual(self.listed(sort="size"), [("Food", 3), ("Animals", 1)])
+
+    def test_repeat_page_is_cached(self):
+        """Test that a repeated page makes no category queries."""
+        with CaptureQueriesContext(connection) as context:
+            self.listed()
+        category_queries = [q for q in context.captured_queries if "words_category" in q["sql"]]
+        self.assertEqual(len(category_queries), 2)
+
+        with CaptureQueriesContext(connection) as context:
+            self.listed()
+        category_queries = [q for q in context.captured_queries if "words_category" in q["sql"]]
+        self.assertEqual(category_queries, [])
+
+    def test_invalidated_by_changes(self):
+        """Test that membership changes and new categories show up immediately."""
+        self.listed()
+
+        CategorizedWord.objects.create(word=self.words[1], category=self.animals)
+        self.assertEqual(self.listed(), [("Animals", 2), ("Food", 3)])
+
+        Category.objects.create(name="Colors")
+        self.assertEqual(self.listed(), [("Animals", 2), ("Colors", 0), ("Food", 3)])
+
+    def test_invalidated_by_another_worker(self):
+        """Test that a categories version bump from another cache connection is seen."""
+        self.listed()
+
+        # Another worker adds a member and bumps the shared version
+        CategorizedWord.objects.bulk_create(
+            [CategorizedWord(word=self.words[2], category=self.animals)]
+        )
+        caches.create_connection("default").set(bank.CATEGORIES_KEY, "elsewhere", None)
+
+        self.assertEqual(self.listed(), [("Animals", 2), ("Food", 3)])
+
+    def test_delete_page_uses_annotation(self):
+        """Test that the delete confirmation reports the member count."""
+        response = self.client.get(reverse("delete_category", args=[self.food.id]))
+
+        self.assertEqual(response.context["word_count"], 3)
+
+
+class WordCategoriesTagTests(TestCase):
+    """Tests for batched category lookups in word views."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.categories = [Category.objects.create(name=f"Categorie{i}") for i in range(2)]
+        self.words = []
+        for i in range(6):
+            word = Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            for category in self.categories[: i % 3]:
+                CategorizedWord.objects.create(word=word, category=category)
+            self.words.append(word)
+
+    def table_queries(self, url, table):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, [q for q in context.captured_queries if f'"{table}"' in q["sql"]]
+
+    def test_browse_fetches_categories_once(self):
+        """Test that a browse page loads categories for all rows in one query."""
+        response, queries = self.table_queries(reverse("browse"), "words_categorizedword")
+
+        self.assertEqual(len(queries), 1)
+        self.assertContains(response, 'title="Categorie1"', count=2)
+
+    def test_word_detail_prefetches(self):
+        """Test that word_detail loads examples and categories with one query each."""
+        url = reverse("word_detail", args=[self.words[2].id])
+
+        response, queries = self.table_queries(url, "words_categorizedword")
+        self.assertEqual(len(queries), 1)
+        self.assertContains(response, "Categorie0")
+        self.assertContains(response, "Categorie1")
+
+        _, queries = self.table_queries(url, "words_example")
+        self.assertEqual(len(queries), 1)
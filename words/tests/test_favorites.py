@@ -0,0 +1,70 @@
+"""
+Tests for favorite and flashcard flags on word views.
+"""
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from words import favorites
+from words.models import Flashcard, Word, WordList
+
+
+class FavoriteFlagTests(TestCase):
+    """Tests for Exists()-annotated flags and the stored Favorites list id."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.words = [
+            Word.objects.create(dutch=f"woord{i}", translation=f"word{i}", source="EN")
+            for i in range(5)
+        ]
+        favorites.favorites_list(self.user).words.add(self.words[1])
+        Flashcard.objects.create(user=self.user, word=self.words[2], next_review=timezone.now())
+
+    def test_browse_flags_in_one_query(self):
+        """Test that the word list query carries both flags."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("browse"))
+
+        word_queries = [q for q in context.captured_queries if "words_word" in q["sql"]]
+        self.assertEqual(len(word_queries), 1)
+        flags = {w.dutch: (w.is_favorite, w.has_flashcard) for w in response.context["words"]}
+        self.assertEqual(flags["woord1"], (True, False))
+        self.assertEqual(flags["woord2"], (False, True))
+        self.assertEqual(flags["woord0"], (False, False))
+
+    def test_search_results_keep_flags(self):
+        """Test that search results are annotated too."""
+        response = self.client.get(reverse("browse"), {"q": "woord1"})
+
+        self.assertTrue(response.context["words"][0].is_favorite)
+
+    def test_toggle_favorite(self):
+        """Test that toggling adds and removes the word without creating another list."""
+        url = reverse("toggle_favorite", args=[self.words[0].id])
+
+        self.client.get(url)
+        response = self.client.get(reverse("word_detail", args=[self.words[0].id]))
+        self.assertTrue(response.context["is_favorite"])
+
+        self.client.get(url)
+        response = self.client.get(reverse("word_detail", args=[self.words[0].id]))
+        self.assertFalse(response.context["is_favorite"])
+        self.assertEqual(WordList.objects.filter(user=self.user).count(), 1)
+
+    def test_list_linked_for_existing_users(self):
+        """Test that users without a stored list id get their existing list linked."""
+        list_id = self.user.favorites_list_id
+        CustomUser.objects.filter(pk=self.user.pk).update(favorites_list=None)
+        self.user.refresh_from_db()
+
+        self.assertEqual(favorites.favorites_list_id(self.user), list_id)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.favorites_list_id, list_id)
@@ -0,0 +1,87 @@
+"""
+Tests for the fuzzy "did you mean" index.
+"""
+
+from django.core.cache import cache, caches
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words import bank, fuzzy
+from words.models import Word
+
+
+class FuzzyIndexTests(TestCase):
+    """Tests for typo-tolerant suggestions."""
+
+    def setUp(self):
+        cache.clear()
+        fuzzy._index = None
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        Word.objects.create(dutch="de fiets", translation="the bicycle", source="EN")
+        Word.objects.create(dutch="de vis", translation="the fish", source="EN")
+        Word.objects.create(dutch="het huis", translation="будинок", source="UK")
+
+    def test_bounded_levenshtein(self):
+        """Test that distances above the limit are cut off."""
+        self.assertEqual(fuzzy.bounded_levenshtein("fiets", "fietz", 2), 1)
+        self.assertEqual(fuzzy.bounded_levenshtein("fiets", "fiets", 1), 0)
+        self.assertIsNone(fuzzy.bounded_levenshtein("fiets", "vis", 1))
+        self.assertIsNone(fuzzy.bounded_levenshtein("a", "abcdef", 2))
+
+    def test_bounded_levenshtein_transpositions(self):
+        """Test that a swap of adjacent letters counts once only when asked to."""
+        self.assertEqual(fuzzy.bounded_levenshtein("olifnat", "olifant", 2), 2)
+        self.assertEqual(fuzzy.bounded_levenshtein("olifnat", "olifant", 2, transpositions=True), 1)
+        self.assertEqual(fuzzy.bounded_levenshtein("kitten", "sitting", 3, transpositions=True), 3)
+        self.assertIsNone(fuzzy.bounded_levenshtein("kitten", "sitting", 2, transpositions=True))
+
+    def test_suggests_close_words(self):
+        """Test that typos in either language find the intended word."""
+        self.assertEqual(fuzzy.suggest("fietz"), ["de fiets"])
+        self.assertEqual(fuzzy.suggest("de fiest"), ["de fiets"])
+        self.assertEqual(fuzzy.suggest("будинк"), ["будинок"])
+        self.assertEqual(fuzzy.suggest("olifant"), [])
+
+    def test_added_words_are_indexed_incrementally(self):
+        """Test that new words are appended to the existing index."""
+        index = fuzzy.get_index()
+
+        Word.objects.create(dutch="de olifant", translation="the elephant", source="EN")
+
+        self.assertIs(fuzzy.get_index(), index)
+        self.assertEqual(fuzzy.suggest("olifnt"), ["de olifant"])
+
+    def test_changed_words_rebuild_the_index(self):
+        """Test that editing a word replaces the index."""
+        index = fuzzy.get_index()
+
+        word = Word.objects.get(dutch="de vis")
+        word.dutch = "de walvis"
+        word.save()
+
+        self.assertIsNot(fuzzy.get_index(), index)
+        self.assertEqual(fuzzy.suggest("walvsi"), ["de walvis"])
+
+    def test_edits_by_another_worker_rebuild_the_index(self):
+        """Test that a generation bump from another cache connection replaces the index."""
+        index = fuzzy.get_index()
+
+        # Another worker renames the word and bumps the shared tokens
+        Word.objects.filter(dutch="de vis").update(dutch="de walvis")
+        other_worker = caches.create_connection("default")
+        other_worker.set_many({bank.VERSION_KEY: "elsewhere", bank.GENERATION_KEY: "elsewhere"})
+
+        self.assertIsNot(fuzzy.get_index(), index)
+        self.assertEqual(fuzzy.suggest("walvsi"), ["de walvis"])
+
+    def test_browse_shows_suggestions(self):
+        """Test that a search without results offers did-you-mean links."""
+        response = self.client.get(reverse("browse"), {"q": "fietz"})
+
+        self.assertEqual(list(response.context["words"]), [])
+        self.assertEqual(response.context["suggestions"], ["de fiets"])
+        self.assertContains(response, "Did you mean")
@@ -0,0 +1,87 @@
+"""
+Tests for normalized search columns and the normalize_words command.
+"""
+
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+
+from words import search
+from words.models import Word
+from words.normalization import fold, normalize_dutch
+
+
+class NormalizationTests(TestCase):
+    """Tests for the normalization helpers and the columns they fill."""
+
+    def test_fold(self):
+        """Test that folding lowercases any script and strips diacritics."""
+        self.assertEqual(fold("  Café  Noël "), "cafe noel")
+        self.assertEqual(fold("ПРИВІТ"), "привіт")
+        self.assertEqual(fold("Привіт"), fold("привіт"))
+
+    def test_normalize_dutch_drops_articles(self):
+        """Test that a leading Dutch article is removed but a bare article is kept."""
+        self.assertEqual(normalize_dutch("De Fiets"), "fiets")
+        self.assertEqual(normalize_dutch("het huis"), "huis")
+        self.assertEqual(normalize_dutch("'t Is"), "is")
+        self.assertEqual(normalize_dutch("een"), "een")
+        self.assertEqual(normalize_dutch("dertig"), "dertig")
+
+    def test_columns_filled_on_save(self):
+        """Test that saving a word fills its normalized columns, also with update_fields."""
+        word = Word.objects.create(dutch="de Ëzel", translation="The Donkey", source="EN")
+        self.assertEqual(
+            (word.dutch_normalized, word.translation_normalized), ("ezel", "the donkey")
+        )
+
+        word.dutch = "het paard"
+        word.save(update_fields=["dutch"])
+
+        word.refresh_from_db()
+        self.assertEqual(word.dutch_normalized, "paard")
+
+    def test_search_ignores_case_accents_and_articles(self):
+        """Test that search matches normalized prefixes in any script."""
+        cafe = Word.objects.create(dutch="het café", translation="the pub", source="EN")
+        hello = Word.objects.create(dutch="hallo", translation="Привіт", source="UK")
+
+        self.assertEqual(search.search_words("CAFE"), [cafe])
+        self.assertEqual(search.search_words("de caf"), [cafe])
+        self.assertEqual(search.search_words("прив"), [hello])
+
+    def test_exact_match_first(self):
+        """Test that an exact normalized match is listed before longer prefixes."""
+        Word.objects.create(dutch="de fietser", translation="the cyclist", source="EN")
+        fiets = Word.objects.create(dutch="de fiets", translation="the bicycle", source="EN")
+
+        self.assertEqual(search.search_words("Fiets")[0], fiets)
+
+    def test_normalize_words_command(self):
+        """Test that the command refreshes stale normalized columns."""
+        word = Word.objects.create(dutch="de Kat", translation="the cat", source="EN")
+        Word.objects.filter(id=word.id).update(dutch_normalized="", translation_normalized="")
+
+        out = StringIO()
+        call_command("normalize_words", dry_run=True, stdout=out)
+        self.assertIn("1 words normalized (dry run)", out.getvalue())
+
+        call_command("normalize_words", stdout=StringIO())
+        word.refresh_from_db()
+        self.assertEqual((word.dutch_normalized, word.translation_normalized), ("kat", "the cat"))
+
+    def test_migration_backfills_existing_words(self):
+        """Test that the data migration fills columns of words saved before they existed."""
+        word = Word.objects.create(dutch="het Ziekenhuis", translation="Будинок", source="UK")
+        Word.objects.filter(id=word.id).update(dutch_normalized="", translation_normalized="")
+
+        migration = import_module("words.migrations.0015_backfill_word_normalized")
+        migration.backfill_normalized(apps, None)
+
+        word.refresh_from_db()
+        self.assertEqual(
+            (word.dutch_normalized, word.translation_normalized), ("ziekenhuis", "будинок")
+        )
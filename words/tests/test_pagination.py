@@ -0,0 +1,126 @@
+"""
+Tests for keyset pagination of the word list.
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words.models import CategorizedWord, Category, Word
+from words.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+class KeysetPaginationTests(TestCase):
+    """Tests for cursor-based paging on (dutch, id)."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        # Duplicate Dutch words make the id tie-breaker matter
+        for i in range(7):
+            Word.objects.create(dutch=f"woord{i // 2}", translation=f"word{i}", source="EN")
+        self.ordered = list(Word.objects.order_by("dutch", "id"))
+
+    def test_cursor_round_trip(self):
+        """Test that cursors decode to what was encoded and bad tokens are ignored."""
+        token = encode_cursor("after", ["woord", 3])
+
+        self.assertEqual(decode_cursor(token), ("after", ["woord", 3]))
+        self.assertIsNone(decode_cursor("not a cursor"))
+        self.assertIsNone(decode_cursor(""))
+
+    def test_mistyped_cursor_falls_back_to_first_page(self):
+        """Test that a cursor whose key does not fit (dutch, id) shows the first page."""
+        for key in (["m", "abc"], [None, 1], ["m", [1]]):
+            with self.subTest(key=key):
+                page = keyset_page(Word.objects.all(), ("dutch", "id"), encode_cursor("after", key))
+                self.assertEqual(page.items, self.ordered)
+
+        response = self.client.get(
+            reverse("browse"), {"cursor": encode_cursor("after", ["m", "abc"])}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_forward_and_back(self):
+        """Test that next and previous cursors walk the full ordering without gaps."""
+        fields = ("dutch", "id")
+        first = keyset_page(Word.objects.all(), fields, size=3)
+        second = keyset_page(Word.objects.all(), fields, first.next_cursor, size=3)
+        third = keyset_page(Word.objects.all(), fields, second.next_cursor, size=3)
+
+        self.assertIsNone(first.prev_cursor)
+        self.assertEqual(first.items + second.items + third.items, self.ordered)
+        self.assertIsNone(third.next_cursor)
+
+        back = keyset_page(Word.objects.all(), fields, third.prev_cursor, size=3)
+        self.assertEqual(back.items, second.items)
+        back = keyset_page(Word.objects.all(), fields, back.prev_cursor, size=3)
+        self.assertEqual(back.items, first.items)
+        self.assertIsNone(back.prev_cursor)
+
+    def test_browse_pages(self):
+        """Test that browse_words exposes a next cursor past the first page."""
+        for i in range(60):
+            Word.objects.create(dutch=f"zin{i:02}", translation=f"sentence{i}", source="EN")
+
+        response = self.client.get(reverse("browse"))
+        page = response.context["page"]
+        self.assertEqual(len(page.items), 50)
+        self.assertContains(response, "Next")
+
+        response = self.client.get(reverse("browse"), {"cursor": page.next_cursor})
+        self.assertEqual(len(response.context["words"]), 17)
+        self.assertIsNotNone(response.context["page"].prev_cursor)
+
+
+class CategoryDetailPaginationTests(TestCase):
+    """Tests for the SQL-paginated category word list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.category = Category.objects.create(name="Dieren")
+        for i in range(45):
+            word = Word.objects.create(dutch=f"dier{i:02}", translation=f"animal{i}", source="EN")
+            CategorizedWord.objects.create(word=word, category=self.category)
+        Word.objects.create(dutch="de fiets", translation="the bicycle", source="EN")
+        self.url = reverse("category_detail", args=[self.category.id])
+
+    def test_page_contents(self):
+        """Test that pages hold the category's words in Dutch order with the total count."""
+        response = self.client.get(self.url, {"page": 3})
+
+        self.assertEqual(response.context["word_count"], 45)
+        self.assertEqual(
+            [w.dutch for w in response.context["words"]],
+            ["dier40", "dier41", "dier42", "dier43", "dier44"],
+        )
+        self.assertEqual(response.context["words"].paginator.num_pages, 3)
+
+    def test_query_count_is_constant(self):
+        """Test that a page costs one word query and the count is cached."""
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {"page": 2})
+
+        word_queries = [q["sql"] for q in context.captured_queries if "words_word" in q["sql"]]
+        self.assertEqual(len(word_queries), 1)
+        self.assertIn("LIMIT 20", word_queries[0])
+
+    def test_count_refreshed_after_membership_change(self):
+        """Test that removing a word from the category updates the cached count."""
+        self.client.get(self.url)
+        CategorizedWord.objects.filter(category=self.category).first().delete()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context["word_count"], 44)
@@ -0,0 +1,86 @@
+"""
+Query plan checks for the hot per-user query paths.
+
+Each test runs EXPLAIN QUERY PLAN on a view's main queries and fails when SQLite
+falls back to scanning a whole table instead of searching an index.
+"""
+
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress.models import DailyActivity
+from quiz.models import QuizAnswer, QuizSession
+from words import pagination, search
+from words.models import CategorizedWord, Category, Flashcard, Word
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class QueryPlanTests(TestCase):
+    """Tests that the main view queries are served by indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        cls.category = Category.objects.create(name="Animals")
+        cls.session = QuizSession.objects.create(user=cls.user, quiz_type="MC", total=10)
+
+    def assert_uses_index(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        scans = [step for step in plan if step.startswith("SCAN")]
+        self.assertEqual(scans, [], f"Full scan in query plan: {plan}\nSQL: {sql}")
+
+    def test_due_flashcards(self):
+        """Test the due-card lookup used by the dashboard and the review queue."""
+        now = timezone.now()
+        due = Flashcard.objects.filter(user=self.user, next_review__lte=now)
+
+        self.assert_uses_index(due.order_by("next_review").select_related("word"))
+        self.assert_uses_index(due.values("id"))
+
+    def test_quiz_history(self):
+        """Test the completed-quiz lookups used by quiz_history and progress_dashboard."""
+        sessions = QuizSession.objects.filter(user=self.user, completed_at__isnull=False)
+
+        self.assert_uses_index(sessions.order_by("-started_at")[:50])
+
+    def test_quiz_answers(self):
+        """Test the answer counts used by quiz_results."""
+        answers = QuizAnswer.objects.filter(session=self.session)
+
+        self.assert_uses_index(answers.values("id"))
+        self.assert_uses_index(answers.filter(is_correct=True).values("id"))
+
+    def test_daily_activity_range(self):
+        """Test the activity range used by progress_dashboard and streak_view."""
+        week_ago = timezone.now().date() - timedelta(days=7)
+
+        self.assert_uses_index(
+            DailyActivity.objects.filter(user=self.user, date__gte=week_ago).order_by("date")
+        )
+
+    def test_category_words(self):
+        """Test the membership lookup used by category_detail and delete_category."""
+        self.assert_uses_index(
+            CategorizedWord.objects.filter(category=self.category).values("word_id")
+        )
+
+    def test_word_prefix_search(self):
+        """Test the normalized prefix lookup used by browse_words."""
+        self.assert_uses_index(search._prefix_matches("fiets", Word.objects.all()))
+        self.assert_uses_index(search._prefix_matches("fiets", Word.objects.filter(source="EN")))
+
+    def test_word_list_pages(self):
+        """Test the keyset page lookups used by browse_words."""
+        after = pagination._beyond(("dutch", "id"), ["m", 10], "gt")
+
+        self.assert_uses_index(Word.objects.filter(after).order_by("dutch", "id")[:51])
+        self.assert_uses_index(Word.objects.filter(after, source="EN").order_by("dutch", "id")[:51])
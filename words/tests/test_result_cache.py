@@ -0,0 +1,114 @@
+"""
+Tests for the cached browse and search results.
+"""
+
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words import bank, results
+from words.models import CategorizedWord, Category, Word
+from words.results import LRUCache
+
+
+class ResultCacheTests(TestCase):
+    """Tests for the version-keyed result id cache."""
+
+    def setUp(self):
+        cache.clear()
+        results._cache.clear()
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.fiets = Word.objects.create(dutch="de fiets", translation="the bicycle", source="EN")
+        Word.objects.create(dutch="het huis", translation="the house", source="EN")
+
+    def word_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("browse"), params)
+        queries = [q["sql"] for q in context.captured_queries if '"words_word' in q["sql"]]
+        return response, queries
+
+    def test_repeated_search_is_one_fetch(self):
+        """Test that a repeated search skips the search and fetches the cached ids."""
+        self.word_queries({"q": "fiets"})
+
+        response, queries = self.word_queries({"q": "FIETS"})
+
+        self.assertEqual(list(response.context["words"]), [self.fiets])
+        self.assertEqual(len(queries), 1)
+        self.assertIn(" IN (", queries[0])
+        self.assertEqual(results.cache_info()["hits"], 1)
+
+    def test_repeated_browse_page_is_one_fetch(self):
+        """Test that a repeated browse page is served from the cached ids."""
+        first, _ = self.word_queries({})
+
+        response, queries = self.word_queries({})
+
+        self.assertEqual(list(response.context["words"]), list(first.context["words"]))
+        self.assertEqual(len(queries), 1)
+        self.assertFalse(response.context["words"][0].has_flashcard)
+
+    def test_invalidated_by_word_writes(self):
+        """Test that adding or editing a word makes cached results stale."""
+        self.word_queries({"q": "fiets"})
+
+        fietser = Word.objects.create(dutch="de fietser", translation="the cyclist", source="EN")
+        response, _ = self.word_queries({"q": "fiets"})
+        self.assertIn(fietser, response.context["words"])
+
+        fietser.dutch = "de loper"
+        fietser.save()
+        response, _ = self.word_queries({"q": "fiets"})
+        self.assertNotIn(fietser, response.context["words"])
+        self.assertEqual(results.cache_info()["hits"], 0)
+
+    def test_invalidated_by_category_membership(self):
+        """Test that adding a word to a category bumps the word bank version."""
+        self.word_queries({})
+        category = Category.objects.create(name="Transport")
+
+        CategorizedWord.objects.create(word=self.fiets, category=category)
+        self.word_queries({})
+
+        self.assertEqual(results.cache_info()["misses"], 2)
+
+    def test_invalidated_by_another_worker(self):
+        """Test that a version bump made through another cache connection is seen."""
+        self.word_queries({"q": "fiets"})
+
+        # Another worker adds a word and bumps the version through its own backend
+        Word.objects.bulk_create([Word(dutch="de fietser", translation="the cyclist", source="EN")])
+        other_worker = caches.create_connection("default")
+        other_worker.set(bank.VERSION_KEY, "bumped-elsewhere", None)
+
+        response, _ = self.word_queries({"q": "fiets"})
+        self.assertEqual(bank.current()[0], "bumped-elsewhere")
+        self.assertIn("de fietser", [word.dutch for word in response.context["words"]])
+
+    def test_version_lookup_skips_database(self):
+        """Test that reading the shared word bank version makes no queries."""
+        bank.current()
+
+        with CaptureQueriesContext(connection) as context:
+            bank.current()
+            bank.categories_version()
+
+        self.assertEqual(context.captured_queries, [])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used key is evicted and counters add up."""
+        lru = LRUCache(max_entries=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.info(), {"hits": 2, "misses": 1, "entries": 2, "max_entries": 2})
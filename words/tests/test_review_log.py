@@ -0,0 +1,182 @@
+"""
+Tests for the review log and the archive_review_logs command.
+"""
+
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress.models import DailyActivity, UserProgress
+from words import review
+from words.models import Flashcard, ReviewLog, Word
+
+
+class ReviewLogTests(TestCase):
+    """Tests for logging ratings made through the review queue."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        word = Word.objects.create(dutch="de hond", translation="the dog", source="EN")
+        self.card = Flashcard.objects.create(
+            user=self.user, word=word, box=2, interval=3, next_review=timezone.now()
+        )
+
+    def test_log_is_written_when_the_queue_refills(self):
+        """Test that a rating's log row is buffered until the next batch is selected."""
+        self.client.get(reverse("flashcards"))
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+
+        self.assertFalse(ReviewLog.objects.exists())
+
+        self.client.get(reverse("flashcards"))
+
+        log = ReviewLog.objects.get()
+        self.assertEqual(log.card, self.card)
+        self.assertEqual((log.user, log.word), (self.user, self.card.word))
+        self.assertEqual(log.rating, 3)
+        self.assertEqual(log.previous_interval, 3)
+        self.assertEqual(log.new_interval, 7)
+        self.assertIsNotNone(log.elapsed_ms)
+
+    def test_buffered_logs_are_written_in_one_insert(self):
+        """Test that a full buffer is flushed with a single INSERT."""
+        word = Word.objects.create(dutch="de kat", translation="the cat", source="EN")
+        other = Flashcard.objects.create(user=self.user, word=word, next_review=timezone.now())
+        self.client.get(reverse("flashcards"))
+
+        with mock.patch.object(review, "REVIEW_FLUSH_SIZE", 2):
+            self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(reverse("rate_card", args=[other.id, "again"]))
+
+        inserts = [q["sql"] for q in context.captured_queries if "words_reviewlog" in q["sql"]]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(ReviewLog.objects.count(), 2)
+        daily = DailyActivity.objects.get(user=self.user, date=timezone.now().date())
+        self.assertEqual(daily.words_reviewed, 2)
+
+    def test_logout_flushes_buffered_logs(self):
+        """Test that logging out writes the reviews still buffered in the session."""
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+
+        self.client.post(reverse("logout"))
+
+        self.assertEqual(ReviewLog.objects.count(), 1)
+        self.assertEqual(UserProgress.objects.get(user=self.user).total_reviews, 1)
+
+    def test_reload_keeps_the_answer_timer(self):
+        """Test that showing the same card again does not restart its elapsed time."""
+        self.client.get(reverse("flashcards"))
+        session = self.client.session
+        session[review.SHOWN_KEY][1] = (timezone.now() - timedelta(seconds=30)).isoformat()
+        session.save()
+
+        self.client.get(reverse("flashcards"))
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+        self.client.get(reverse("flashcards"))
+
+        self.assertGreaterEqual(ReviewLog.objects.get().elapsed_ms, 30000)
+
+    def test_log_survives_card_deletion(self):
+        """Test that removing a flashcard keeps its review history."""
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+        self.client.get(reverse("flashcards"))
+
+        self.card.delete()
+
+        log = ReviewLog.objects.get()
+        self.assertIsNone(log.card)
+        self.assertEqual((log.user, log.word.dutch), (self.user, "de hond"))
+
+    def test_card_removed_before_the_flush_keeps_its_log(self):
+        """Test that a card deleted while its review is buffered is logged without the link."""
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+        Flashcard.objects.filter(id=self.card.id).delete()
+
+        self.client.get(reverse("flashcards"))
+
+        log = ReviewLog.objects.get()
+        self.assertIsNone(log.card)
+        self.assertEqual(log.word.dutch, "de hond")
+
+    def test_rating_a_removed_queued_card_is_not_logged(self):
+        """Test that a card deleted after the batch was selected is skipped."""
+        self.client.get(reverse("flashcards"))
+        Flashcard.objects.filter(id=self.card.id).delete()
+
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+        self.client.get(reverse("flashcards"))
+
+        self.assertFalse(ReviewLog.objects.exists())
+
+    def test_unknown_rating_is_not_logged(self):
+        """Test that an unknown rating does not produce a log row."""
+        self.client.get(reverse("flashcards"))
+        self.client.get(reverse("rate_card", args=[self.card.id, "maybe"]))
+        self.client.get(reverse("flashcards"))
+
+        self.assertFalse(ReviewLog.objects.exists())
+
+
+class ArchiveReviewLogsCommandTests(TestCase):
+    """Tests for the archive_review_logs management command."""
+
+    def setUp(self):
+        user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        word = Word.objects.create(dutch="de kat", translation="the cat", source="EN")
+        card = Flashcard.objects.create(user=user, word=word)
+
+        now = timezone.now()
+        ReviewLog.objects.bulk_create(
+            [
+                ReviewLog(
+                    user=user,
+                    word=word,
+                    card=card,
+                    rating=3,
+                    previous_interval=1,
+                    new_interval=3,
+                    reviewed_at=now - timedelta(days=days),
+                )
+                for days in (1, 400, 500)
+            ]
+        )
+
+    def test_archives_and_deletes_old_rows(self):
+        """Test that rows older than the cutoff are written out and removed."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            call_command(
+                "archive_review_logs", output_dir=output_dir, batch_size=1, stdout=StringIO()
+            )
+
+            archives = list(Path(output_dir).glob("review_logs_*.jsonl.gz"))
+            self.assertEqual(len(archives), 1)
+            with gzip.open(archives[0], "rt", encoding="utf-8") as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(ReviewLog.objects.count(), 1)
+
+    def test_dry_run_keeps_rows(self):
+        """Test that --dry-run only reports the number of rows."""
+        stdout = StringIO()
+
+        call_command("archive_review_logs", dry_run=True, stdout=stdout)
+
+        self.assertIn("2 review logs", stdout.getvalue())
+        self.assertEqual(ReviewLog.objects.count(), 3)
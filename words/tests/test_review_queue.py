@@ -0,0 +1,112 @@
+"""
+Tests for the server-side flashcard review queue.
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress import stats
+from progress.models import DailyActivity, UserProgress, UserStats
+from words.models import Flashcard, Word
+
+
+def _table_queries(context, table):
+    return [q["sql"] for q in context.captured_queries if table in q["sql"]]
+
+
+class ReviewQueueTests(TestCase):
+    """Tests for flashcards_review and rate_card."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        past = timezone.now() - timedelta(hours=1)
+        self.cards = []
+        for i, dutch in enumerate(["de hond", "de kat", "het huis"]):
+            word = Word.objects.create(dutch=dutch, translation=f"word {i}", source="EN")
+            self.cards.append(
+                Flashcard.objects.create(
+                    user=self.user, word=word, next_review=past + timedelta(minutes=i)
+                )
+            )
+
+    def test_review_shows_first_due_card(self):
+        """Test that the earliest due card is shown with the remaining count."""
+        response = self.client.get(reverse("flashcards"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["card"]["id"], self.cards[0].id)
+        self.assertEqual(response.context["card"]["word"]["dutch"], "de hond")
+        self.assertEqual(response.context["remaining_count"], 3)
+
+    def test_next_card_is_served_from_queue(self):
+        """Test that showing the next card does not query flashcards again."""
+        self.client.get(reverse("flashcards"))
+        self.client.get(reverse("rate_card", args=[self.cards[0].id, "good"]))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("flashcards"))
+
+        self.assertEqual(response.context["card"]["id"], self.cards[1].id)
+        self.assertEqual(response.context["remaining_count"], 2)
+        self.assertEqual(_table_queries(context, "words_flashcard"), [])
+
+    def test_rating_defers_everything_but_the_card_update(self):
+        """Test that the card UPDATE is the only write besides the session."""
+        self.client.get(reverse("flashcards"))
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("rate_card", args=[self.cards[0].id, "good"]))
+
+        writes = [
+            q["sql"].split()[:3]
+            for q in context.captured_queries
+            if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+            and "django_session" not in q["sql"]
+        ]
+        self.assertEqual(writes, [["UPDATE", '"words_flashcard"', "SET"]])
+
+        card = Flashcard.objects.get(id=self.cards[0].id)
+        self.assertEqual(card.box, 2)
+        self.assertIsNotNone(card.last_reviewed)
+        self.assertGreater(card.next_review, timezone.now() + timedelta(days=2))
+
+    def test_reviews_are_counted_when_the_queue_drains(self):
+        """Test that the buffered ratings are counted once when the queue runs out."""
+        stats.get_stats(self.user)
+        self.client.get(reverse("flashcards"))
+        for card in self.cards:
+            self.client.get(reverse("rate_card", args=[card.id, "good"]))
+        response = self.client.get(reverse("flashcards"))
+        self.client.get(reverse("flashcards"))
+
+        self.assertTemplateUsed(response, "words/no_cards.html")
+        daily = DailyActivity.objects.get(user=self.user, date=timezone.now().date())
+        self.assertEqual(daily.words_reviewed, 3)
+        self.assertEqual(UserProgress.objects.get(user=self.user).total_reviews, 3)
+        self.assertEqual(UserStats.objects.get(user=self.user).box_2, 3)
+
+    def test_rating_card_outside_queue(self):
+        """Test that a card not in the queue can still be rated."""
+        self.client.get(reverse("rate_card", args=[self.cards[2].id, "easy"]))
+
+        self.assertEqual(Flashcard.objects.get(id=self.cards[2].id).box, 3)
+
+    def test_cannot_rate_other_users_card(self):
+        """Test that rating another user's card returns 404."""
+        other = CustomUser.objects.create_user(username="other", password="testpass123")
+        word = Word.objects.create(dutch="de fiets", translation="the bike", source="EN")
+        card = Flashcard.objects.create(user=other, word=word, next_review=timezone.now())
+
+        response = self.client.get(reverse("rate_card", args=[card.id, "good"]))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Flashcard.objects.get(id=card.id).box, 1)
@@ -0,0 +1,151 @@
+"""
+Tests for the spaced-repetition scheduling strategies.
+"""
+
+from datetime import timedelta
+
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress.models import UserProgress
+from words import scheduling
+from words.models import Flashcard, Word
+from words.scheduling import CardState
+
+
+class SchedulerTests(SimpleTestCase):
+    """Tests for the pure scheduling functions."""
+
+    def test_leitner_matches_box_intervals(self):
+        """Test that Leitner keeps the original box/interval table."""
+        state = CardState(box=2)
+
+        self.assertEqual(scheduling.review(state, "again", "leitner").box, 1)
+        self.assertEqual(scheduling.review(state, "hard", "leitner").interval, 3)
+        self.assertEqual(scheduling.review(state, "good", "leitner").box, 3)
+        self.assertEqual(scheduling.review(state, "good", "leitner").interval, 7)
+        self.assertEqual(scheduling.review(CardState(box=4), "easy", "leitner").box, 5)
+
+    def test_unknown_rating(self):
+        """Test that unknown ratings leave the card unscheduled."""
+        self.assertIsNone(scheduling.review(CardState(), "perfect", "sm2"))
+
+    def test_sm2_interval_progression(self):
+        """Test the classic SM-2 1, 6, interval * ease progression."""
+        state = CardState()
+        intervals = []
+        for _ in range(3):
+            state = scheduling.review(state, "good", "sm2")
+            intervals.append(state.interval)
+
+        self.assertEqual(intervals[:2], [1.0, 6.0])
+        self.assertEqual(intervals[2], round(6 * state.ease_factor))
+        self.assertEqual(state.ease_factor, 2.5)
+
+    def test_sm2_uses_ease_factor(self):
+        """Test that a lower ease factor gives a shorter interval."""
+        easy_card = CardState(ease_factor=2.5, interval=10, repetitions=3)
+        hard_card = CardState(ease_factor=1.3, interval=10, repetitions=3)
+
+        self.assertGreater(
+            scheduling.review(easy_card, "good", "sm2").interval,
+            scheduling.review(hard_card, "good", "sm2").interval,
+        )
+
+    def test_sm2_failure_resets_repetitions(self):
+        """Test that 'again' resets SM-2 repetitions and lowers the ease factor."""
+        state = scheduling.review(CardState(interval=20, repetitions=4), "again", "sm2")
+
+        self.assertEqual(state.repetitions, 0)
+        self.assertEqual(state.interval, 1.0)
+        self.assertLess(state.ease_factor, 2.5)
+        self.assertEqual(state.box, 1)
+
+    def test_fsrs_first_review_uses_initial_stability(self):
+        """Test that a new card gets the FSRS initial stability for its grade."""
+        state = scheduling.review(CardState(), "good", "fsrs")
+
+        self.assertAlmostEqual(state.stability, scheduling.FSRS_WEIGHTS[2])
+        self.assertEqual(state.interval, round(scheduling.FSRS_WEIGHTS[2]))
+
+    def test_fsrs_successful_reviews_grow_interval(self):
+        """Test that FSRS intervals grow on success and shrink on a lapse."""
+        state = scheduling.review(CardState(), "good", "fsrs")
+        grown = scheduling.review(state, "good", "fsrs", elapsed_days=state.interval)
+        lapsed = scheduling.review(grown, "again", "fsrs", elapsed_days=grown.interval)
+
+        self.assertGreater(grown.interval, state.interval)
+        self.assertLess(lapsed.stability, grown.stability)
+
+    def test_batch_review_matches_single_reviews(self):
+        """Test that mapping a strategy over a deck equals reviewing each card."""
+        states = [CardState(box=box) for box in range(1, 6)]
+
+        batch = [scheduling.review(state, "good", "sm2") for state in states]
+
+        self.assertEqual(batch[2], scheduling.review(CardState(box=3), "good", "sm2"))
+
+    def test_convert_between_algorithms(self):
+        """Test that converting keeps the card's current interval."""
+        state = CardState(box=4)
+
+        sm2_state = scheduling.convert(state, "sm2")
+        fsrs_state = scheduling.convert(state, "fsrs")
+
+        self.assertEqual(sm2_state.interval, 14)
+        self.assertEqual(fsrs_state.stability, 14)
+        self.assertEqual(scheduling.convert(fsrs_state, "leitner").box, 4)
+
+        new_card = scheduling.convert(CardState(), "fsrs", reviewed=False)
+        self.assertEqual(
+            scheduling.preview(new_card, "fsrs"), scheduling.preview(CardState(), "fsrs")
+        )
+        self.assertEqual(list(scheduling.preview(new_card, "fsrs").values()), [1, 1, 4, 14])
+
+
+class SchedulerSettingTests(TestCase):
+    """Tests for switching a user's scheduling algorithm."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.reviewed_at = timezone.now() - timedelta(days=2)
+        word = Word.objects.create(dutch="de hond", translation="the dog", source="EN")
+        self.card = Flashcard.objects.create(
+            user=self.user,
+            word=word,
+            box=3,
+            last_reviewed=self.reviewed_at,
+            next_review=self.reviewed_at + timedelta(days=7),
+        )
+
+    def test_switching_reschedules_deck(self):
+        """Test that switching algorithm converts and reschedules every card."""
+        response = self.client.post(reverse("set_scheduler"), {"scheduler": "fsrs"})
+
+        self.assertRedirects(response, reverse("progress"))
+        self.assertEqual(UserProgress.objects.get(user=self.user).scheduler, "fsrs")
+        card = Flashcard.objects.get(id=self.card.id)
+        self.assertEqual(card.stability, 7)
+        self.assertEqual(card.next_review, self.reviewed_at + timedelta(days=7))
+
+    def test_invalid_scheduler_is_ignored(self):
+        """Test that an unknown algorithm name is ignored."""
+        self.client.post(reverse("set_scheduler"), {"scheduler": "random"})
+
+        self.assertEqual(UserProgress.objects.get(user=self.user).scheduler, "leitner")
+
+    def test_rating_uses_selected_scheduler(self):
+        """Test that rate_card schedules with the user's algorithm."""
+        UserProgress.objects.create(user=self.user, scheduler="sm2")
+        Flashcard.objects.filter(id=self.card.id).update(interval=10, repetitions=3)
+
+        self.client.get(reverse("rate_card", args=[self.card.id, "good"]))
+
+        card = Flashcard.objects.get(id=self.card.id)
+        self.assertEqual(card.interval, 25)
+        self.assertEqual(card.repetitions, 4)
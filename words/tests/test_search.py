@@ -0,0 +1,78 @@
+"""
+Tests for full-text word search and the rebuild_search_index command.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from words import search
+from words.models import Word
+
+
+class SearchTests(TestCase):
+    """Tests for searching words through the search index."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.fiets = Word.objects.create(
+            dutch="de fiets", translation="the bicycle", source="EN", example="Ik fiets graag."
+        )
+        self.fietser = Word.objects.create(
+            dutch="de fietser", translation="the cyclist", source="EN"
+        )
+        self.ride = Word.objects.create(
+            dutch="rijden", translation="to ride", source="EN", context="met de fiets"
+        )
+        self.privet = Word.objects.create(dutch="hallo", translation="Привіт", source="UK")
+
+    def test_index_is_available(self):
+        """Test that the migration created the FTS5 table on SQLite."""
+        if connection.vendor != "sqlite":
+            self.skipTest("FTS5 is SQLite only")
+        self.assertTrue(search.fts_available())
+
+    def test_ranks_headword_matches_first(self):
+        """Test that matches in dutch outrank matches in context."""
+        results = search.search_words("fiets")
+
+        self.assertEqual(set(results), {self.fiets, self.fietser, self.ride})
+        self.assertEqual(results[-1], self.ride)
+
+    def test_case_insensitive_cyrillic(self):
+        """Test that Cyrillic queries match regardless of case."""
+        self.assertEqual(search.search_words("ПРИВІТ"), [self.privet])
+        self.assertEqual(search.search_words("привіт", source="EN"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that the triggers keep the index in sync with the words table."""
+        self.fietser.dutch = "de wielrenner"
+        self.fietser.save()
+        self.ride.delete()
+
+        self.assertEqual(search.search_words("fiets"), [self.fiets])
+        self.assertEqual(search.search_words("wielren"), [self.fietser])
+
+    def test_short_query_falls_back_to_filter(self):
+        """Test that queries shorter than a trigram still match."""
+        self.assertIn(self.ride, search.search_words("ri"))
+
+    def test_browse_uses_search(self):
+        """Test that the browse page lists search results."""
+        response = self.client.get(reverse("browse"), {"q": "cyclist"})
+
+        self.assertEqual(list(response.context["words"]), [self.fietser])
+
+    def test_rebuild_command(self):
+        """Test that rebuild_search_index leaves the index searchable."""
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out, stderr=StringIO())
+
+        self.assertEqual(search.search_words("bicycle"), [self.fiets])
@@ -0,0 +1,166 @@
+"""
+Tests for the batch review submission endpoint.
+"""
+
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from progress.models import DailyActivity, UserProgress
+from words.models import Flashcard, ReviewLog, Word
+from words.views import MAX_BATCH_REVIEWS, MAX_ELAPSED_MS
+
+
+class SubmitReviewsTests(TestCase):
+    """Tests for submit_reviews."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = CustomUser.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+        self.cards = []
+        for dutch in ["de hond", "de kat", "het huis"]:
+            word = Word.objects.create(dutch=dutch, translation=dutch, source="EN")
+            self.cards.append(
+                Flashcard.objects.create(user=self.user, word=word, next_review=timezone.now())
+            )
+
+    def post(self, reviews):
+        return self.client.post(
+            reverse("submit_reviews"),
+            data=json.dumps({"reviews": reviews}),
+            content_type="application/json",
+        )
+
+    def test_batch_is_applied(self):
+        """Test that all ratings are scheduled, logged and counted once."""
+        reviewed_at = (timezone.now() - timedelta(minutes=5)).isoformat()
+        reviews = [
+            {"card_id": card.id, "rating": "good", "reviewed_at": reviewed_at}
+            for card in self.cards
+        ]
+
+        response = self.post(reviews)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"accepted": 3, "rejected": []})
+        self.assertEqual(set(Flashcard.objects.values_list("box", flat=True)), {2})
+        self.assertEqual(ReviewLog.objects.count(), 3)
+        daily = DailyActivity.objects.get(user=self.user, date=timezone.now().date())
+        self.assertEqual(daily.words_reviewed, 3)
+        self.assertEqual(UserProgress.objects.get(user=self.user).total_reviews, 3)
+
+    def test_ownership_is_checked_in_one_query(self):
+        """Test that other users' cards are rejected with a single ownership query."""
+        other = CustomUser.objects.create_user(username="other", password="testpass123")
+        word = Word.objects.create(dutch="de fiets", translation="the bike", source="EN")
+        foreign_card = Flashcard.objects.create(user=other, word=word, next_review=timezone.now())
+
+        reviews = [{"card_id": card.id, "rating": "easy"} for card in self.cards]
+        reviews.append({"card_id": foreign_card.id, "rating": "easy"})
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(reviews)
+
+        selects = [
+            q["sql"]
+            for q in context.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "words_flashcard"' in q["sql"]
+        ]
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(
+            response.json()["rejected"], [{"card_id": foreign_card.id, "reason": "unknown card"}]
+        )
+        self.assertEqual(Flashcard.objects.get(id=foreign_card.id).box, 1)
+
+    def test_repeated_ratings_are_applied_in_order(self):
+        """Test that several ratings of one card are applied by client timestamp."""
+        now = timezone.now()
+        card = self.cards[0]
+        reviews = [
+            {"card_id": card.id, "rating": "good", "reviewed_at": now.isoformat()},
+            {
+                "card_id": card.id,
+                "rating": "again",
+                "reviewed_at": (now - timedelta(minutes=1)).isoformat(),
+            },
+        ]
+
+        self.post(reviews)
+
+        logs = list(ReviewLog.objects.order_by("reviewed_at").values_list("rating", flat=True))
+        self.assertEqual(logs, [1, 3])
+        self.assertEqual(Flashcard.objects.get(id=card.id).box, 2)
+
+    def test_resubmitted_batch_is_rejected(self):
+        """Test that retrying an already applied batch does not apply it twice."""
+        reviews = [
+            {"card_id": self.cards[0].id, "rating": "good", "reviewed_at": "2026-01-01T10:00:00Z"}
+        ]
+        self.post(reviews)
+
+        response = self.post(reviews)
+
+        self.assertEqual(response.json()["accepted"], 0)
+        self.assertEqual(ReviewLog.objects.count(), 1)
+
+    def test_invalid_items_are_rejected_individually(self):
+        """Test that malformed reviews are rejected while the rest of the batch is applied."""
+        response = self.post(
+            [
+                {"card_id": "abc", "rating": "good"},
+                {"card_id": self.cards[1].id, "rating": "good", "reviewed_at": "yesterday"},
+                None,
+                {"card_id": self.cards[0].id, "rating": "good"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "accepted": 1,
+                "rejected": [
+                    {"card_id": "abc", "reason": "invalid review"},
+                    {"card_id": self.cards[1].id, "reason": "invalid review"},
+                    {"card_id": None, "reason": "invalid review"},
+                ],
+            },
+        )
+        self.assertEqual(Flashcard.objects.get(id=self.cards[0].id).box, 2)
+
+    def test_wrongly_shaped_payload(self):
+        """Test that reviews that are not a list return 400 instead of failing."""
+        for reviews in ({"card_id": self.cards[0].id}, "good"):
+            with self.subTest(reviews=reviews):
+                self.assertEqual(self.post(reviews).status_code, 400)
+
+        response = self.post([1, ["good"], None])
+        self.assertEqual(response.json()["accepted"], 0)
+        self.assertEqual(len(response.json()["rejected"]), 3)
+
+    def test_elapsed_time_is_clamped(self):
+        """Test that a huge elapsed_ms is stored as the maximum instead of overflowing."""
+        self.post([{"card_id": self.cards[0].id, "rating": "good", "elapsed_ms": 10**20}])
+
+        self.assertEqual(ReviewLog.objects.get().elapsed_ms, MAX_ELAPSED_MS)
+
+    def test_oversized_batch_is_rejected_before_parsing(self):
+        """Test that a batch over the limit is rejected even if its items are malformed."""
+        response = self.post([None] * (MAX_BATCH_REVIEWS + 1))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(MAX_BATCH_REVIEWS), response.json()["error"])
+
+    def test_requires_post(self):
+        """Test that GET is not allowed."""
+        response = self.client.get(reverse("submit_reviews"))
+
+        self.assertEqual(response.status_code, 405)
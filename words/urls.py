@@ -5,6 +5,7 @@ from . import category_views, views
 urlpatterns = [
     path("", views.dashboard, name="dashboard"),
     path("browse/", views.browse_words, name="browse"),
+    path("autocomplete/", views.autocomplete_words, name="autocomplete_words"),
     path("add/", views.add_word, name="add_word"),
     path("word/<int:word_id>/", views.word_detail, name="word_detail"),
     path("word/<int:word_id>/add-flashcard/", views.add_flashcard, name="add_flashcard"),
@@ -20,6 +21,7 @@ urlpatterns = [
     ),
     path("flashcards/", views.flashcards_review, name="flashcards"),
     path("flashcards/rate/<int:card_id>/<str:rating>/", views.rate_card, name="rate_card"),
+    path("flashcards/sync/", views.submit_reviews, name="submit_reviews"),
     path("favorites/", views.favorites_list, name="favorites"),
     path("word/<int:word_id>/add-example/", views.add_example, name="add_example"),
     path("example/<int:example_id>/edit/", views.edit_example, name="edit_example"),
@@ -1,18 +1,21 @@
 import json
-import re
 from contextlib import suppress
-from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_POST
 
+from nederlandse_workbook.utils import timing
 from nederlandse_workbook.utils.openrouter import OpenRouterClient
+from progress import counters, stats
 from progress.models import DailyActivity, UserProgress
 
-from .models import Category, Example, Flashcard, Word, WordList
+from . import autocomplete, categories, favorites, fuzzy, results, review, scheduling, signals
+from .models import Category, Example, Flashcard, Word
 
 
 @login_required
@@ -25,6 +28,11 @@ def add_word(request):
         example = request.POST.get("example", "").strip()
 
         if dutch and translation:
+            duplicates = autocomplete.duplicates(dutch, source)
+            if duplicates and not request.POST.get("confirm_duplicate"):
+                context = {"duplicates": duplicates, "values": request.POST}
+                return render(request, "words/add_word.html", context)
+
             word, created = Word.objects.get_or_create(
                 dutch=dutch,
                 translation=translation,
@@ -44,20 +52,30 @@ def add_word(request):
                     box=1,
                     next_review=timezone.now(),
                 )
-                progress, _ = UserProgress.objects.get_or_create(user=request.user)
-                progress.words_learned += 1
-                progress.save()
-
-                today = timezone.now().date()
-                daily, _ = DailyActivity.objects.get_or_create(user=request.user, date=today)
-                daily.new_words += 1
-                daily.save()
+                counters.add_progress(request.user, words_learned=1)
+                counters.add_activity(request.user, new_words=1)
 
                 return redirect("word_detail", word_id=word.id)
 
     return render(request, "words/add_word.html")
 
 
+@login_required
+def autocomplete_words(request):
+    """Top prefix matches for the search and add-word forms, served from memory."""
+    query = request.GET.get("q", "").strip()
+    try:
+        limit = int(request.GET.get("limit", autocomplete.DEFAULT_LIMIT))
+        limit = max(1, min(limit, autocomplete.MAX_LIMIT))
+    except ValueError:
+        limit = autocomplete.DEFAULT_LIMIT
+
+    results = []
+    if query:
+        results = autocomplete.complete(query, limit, request.GET.get("source", ""))
+    return JsonResponse({"results": results})
+
+
 @login_required
 def dashboard(request):
     progress, created = UserProgress.objects.get_or_create(user=request.user)
@@ -68,18 +86,13 @@ def dashboard(request):
     except DailyActivity.DoesNotExist:
         daily = DailyActivity.objects.create(user=request.user, date=today)
 
-    flashcards = Flashcard.objects.filter(user=request.user)
-    due_cards = flashcards.filter(next_review__lte=timezone.now())
-
-    favorite_list, _ = WordList.objects.get_or_create(
-        user=request.user, name="Favorites", defaults={"list_type": "FAV"}
-    )
+    user_stats = stats.get_stats(request.user)
 
     context = {
         "progress": progress,
-        "due_cards_count": due_cards.count(),
-        "total_cards": flashcards.count(),
-        "favorite_count": favorite_list.words.count(),
+        "due_cards_count": user_stats.due_count,
+        "total_cards": user_stats.total_cards,
+        "favorite_count": user_stats.favorites_count,
         "daily": daily,
     }
     return render(request, "words/dashboard.html", context)
@@ -90,56 +103,38 @@ def browse_words(request):
     query = request.GET.get("q", "")
     source = request.GET.get("source", "")
 
-    words = Word.objects.all()
-
+    suggestions = []
+    page = None
+    words = favorites.with_flags(Word.objects.all(), request.user)
     if query:
-        # For Cyrillic characters, use regex search for proper case insensitivity
-        if any(ord(c) > 127 for c in query):  # Contains non-ASCII characters
-            # Use regex for Cyrillic case insensitive search
-            dutch_q = Q(dutch__regex=f"(?i){re.escape(query)}")
-            translation_q = Q(translation__regex=f"(?i){re.escape(query)}")
-            words = words.filter(dutch_q | translation_q)
-        else:
-            # Use standard icontains for ASCII characters
-            words = words.filter(dutch__icontains=query) | words.filter(
-                translation__icontains=query
-            )
-
-    if source:
-        words = words.filter(source=source)
-
-    words = words[:100]
-
-    favorite_list, _ = WordList.objects.get_or_create(
-        user=request.user, name="Favorites", defaults={"list_type": "FAV"}
-    )
-
-    favorites_ids = list(favorite_list.words.values_list("id", flat=True))
+        words = results.search_words(words, query, source)
+        if not words:
+            suggestions = fuzzy.suggest(query)
+    else:
+        page = results.browse_page(words, source, request.GET.get("cursor"))
+        words = page.items
+    categories.prefetch_categories(words)
 
     context = {
         "words": words,
         "query": query,
         "source": source,
-        "favorites_ids": favorites_ids,
+        "suggestions": suggestions,
+        "page": page,
     }
     return render(request, "words/browse.html", context)
 
 
 @login_required
 def word_detail(request, word_id):
-    word = get_object_or_404(Word, id=word_id)
-
-    has_flashcard = Flashcard.objects.filter(user=request.user, word=word).exists()
-
-    favorite_list, _ = WordList.objects.get_or_create(
-        user=request.user, name="Favorites", defaults={"list_type": "FAV"}
-    )
-    is_favorite = favorite_list.words.filter(id=word_id).exists()
+    words = favorites.with_flags(Word.objects.all(), request.user)
+    words = words.prefetch_related("examples", categories.categories_prefetch())
+    word = get_object_or_404(words, id=word_id)
 
     context = {
         "word": word,
-        "has_flashcard": has_flashcard,
-        "is_favorite": is_favorite,
+        "has_flashcard": word.has_flashcard,
+        "is_favorite": word.is_favorite,
     }
     return render(request, "words/detail.html", context)
 
@@ -158,14 +153,8 @@ def add_flashcard(request, word_id):
     )
 
     if created:
-        progress, _ = UserProgress.objects.get_or_create(user=request.user)
-        progress.words_learned += 1
-        progress.save()
-
-        today = timezone.now().date()
-        daily, _ = DailyActivity.objects.get_or_create(user=request.user, date=today)
-        daily.new_words += 1
-        daily.save()
+        counters.add_progress(request.user, words_learned=1)
+        counters.add_activity(request.user, new_words=1)
 
     return redirect("word_detail", word_id=word_id)
 
@@ -174,6 +163,7 @@ def add_flashcard(request, word_id):
 def remove_flashcard(request, word_id):
     word = get_object_or_404(Word, id=word_id)
     Flashcard.objects.filter(user=request.user, word=word).delete()
+    review.discard_word(request, word.id)
     return redirect("word_detail", word_id=word_id)
 
 
@@ -181,9 +171,7 @@ def remove_flashcard(request, word_id):
 def toggle_favorite(request, word_id):
     word = get_object_or_404(Word, id=word_id)
 
-    favorite_list, _ = WordList.objects.get_or_create(
-        user=request.user, name="Favorites", defaults={"list_type": "FAV"}
-    )
+    favorite_list = favorites.favorites_list(request.user)
 
     if favorite_list.words.filter(id=word_id).exists():
         favorite_list.words.remove(word)
@@ -195,25 +183,24 @@ def toggle_favorite(request, word_id):
 
 @login_required
 def flashcards_review(request):
-    due_cards = Flashcard.objects.filter(
-        user=request.user, next_review__lte=timezone.now()
-    ).order_by("next_review")
+    queue = review.get_queue(request) or review.fill_queue(request)
 
-    if not due_cards.exists():
+    if not queue:
         return render(request, "words/no_cards.html")
 
-    # Get the first due card for review
-    current_card = due_cards.first()
-    remaining_count = due_cards.count()
+    remaining_count = review.remaining_count(request)
+    card = review.card_for_display(queue[0])
+    intervals = scheduling.preview(
+        scheduling.card_state(card),
+        review.session_scheduler(request),
+        scheduling.elapsed_days(card["last_reviewed"], timezone.now()),
+    )
 
-    # Update daily activity
-    today = timezone.now().date()
-    daily, _ = DailyActivity.objects.get_or_create(user=request.user, date=today)
-    daily.words_reviewed += 1
-    daily.save()
+    timing.mark_shown(request.session, review.SHOWN_KEY, card["id"])
 
     context = {
-        "card": current_card,
+        "card": card,
+        "intervals": intervals,
         "remaining_count": remaining_count,
         "total_due": remaining_count,
     }
@@ -222,36 +209,112 @@ def flashcards_review(request):
 
 @login_required
 def rate_card(request, card_id, rating):
-    card = get_object_or_404(Flashcard, id=card_id, user=request.user)
-
-    intervals = {1: 1, 2: 3, 3: 7, 4: 14, 5: 30}
-
-    if rating == "again":
-        card.box = 1
-        card.next_review = timezone.now() + timedelta(days=1)
-    elif rating == "hard":
-        card.box = max(card.box, 2)
-        card.next_review = timezone.now() + timedelta(days=intervals.get(card.box, 1))
-    elif rating == "good":
-        card.box = min(card.box + 1, 5)
-        card.next_review = timezone.now() + timedelta(days=intervals.get(card.box, 1))
-    elif rating == "easy":
-        card.box = min(card.box + 2, 5)
-        card.next_review = timezone.now() + timedelta(days=intervals.get(card.box, 1))
-
-    card.last_reviewed = timezone.now()
-    card.save()
+    entry = review.pop_card(request, card_id)
+    if entry is not None:
+        state = scheduling.card_state(entry)
+        last_reviewed = review.last_reviewed(entry)
+        word_id = entry["word"]["id"]
+        error_rate = entry.get("error_rate", 0.0)
+    else:
+        card = get_object_or_404(Flashcard, id=card_id, user=request.user)
+        state = scheduling.card_state(card)
+        last_reviewed = card.last_reviewed
+        word_id = card.word_id
+        error_rate = card.error_rate
+
+    now = timezone.now()
+    changes = scheduling.apply_review(
+        state, rating, review.session_scheduler(request), last_reviewed, now
+    )
+    if changes is None:
+        Flashcard.objects.filter(id=card_id, user=request.user).update(last_reviewed=now)
+    else:
+        updated = Flashcard.objects.filter(id=card_id, user=request.user).update(**changes)
+        # A queued card removed since the batch was selected has nothing to log
+        if updated:
+            review.record_review(request, card_id, word_id, rating, state, changes, now)
+            signals.cards_rescheduled.send(
+                sender=Flashcard,
+                user_id=request.user.pk,
+                cards=[(word_id, error_rate, changes["box"], now)],
+            )
 
     # Redirect back to review page to show next card
     return redirect("flashcards")
 
 
+MAX_BATCH_REVIEWS = 500
+# Longer answer times are clamped, they only mean the client was left open
+MAX_ELAPSED_MS = 24 * 60 * 60 * 1000
+
+
+def _parse_review(item, now):
+    if not isinstance(item, dict):
+        raise TypeError("Review must be an object")
+
+    reviewed_at = now
+    if item.get("reviewed_at"):
+        reviewed_at = parse_datetime(item["reviewed_at"])
+        if reviewed_at is None:
+            raise ValueError("Invalid reviewed_at")
+        if timezone.is_naive(reviewed_at):
+            reviewed_at = timezone.make_aware(reviewed_at)
+
+    elapsed_ms = item.get("elapsed_ms")
+    if elapsed_ms is not None:
+        elapsed_ms = min(max(int(elapsed_ms), 0), MAX_ELAPSED_MS)
+
+    return {
+        "card_id": int(item["card_id"]),
+        "rating": str(item["rating"]),
+        "reviewed_at": reviewed_at,
+        "elapsed_ms": elapsed_ms,
+    }
+
+
 @login_required
-def favorites_list(request):
-    favorite_list, _ = WordList.objects.get_or_create(
-        user=request.user, name="Favorites", defaults={"list_type": "FAV"}
+@require_POST
+def submit_reviews(request):
+    """Apply a batch of ratings sent as JSON, e.g. ones queued by an offline client."""
+    now = timezone.now()
+    try:
+        items = json.loads(request.body)["reviews"]
+    except (ValueError, KeyError, TypeError):
+        items = None
+    if not isinstance(items, list):
+        return JsonResponse({"error": "Invalid review batch."}, status=400)
+
+    # Checked before parsing, so an oversized batch costs no per-item work
+    if len(items) > MAX_BATCH_REVIEWS:
+        return JsonResponse(
+            {"error": f"At most {MAX_BATCH_REVIEWS} reviews per batch."}, status=400
+        )
+
+    reviews, invalid = [], []
+    for item in items:
+        try:
+            reviews.append(_parse_review(item, now))
+        except (ValueError, KeyError, TypeError, OverflowError):
+            card_id = item.get("card_id") if isinstance(item, dict) else None
+            invalid.append((card_id, "invalid review"))
+
+    accepted, rejected = review.submit_batch(request.user, reviews, now) if reviews else (0, [])
+    rejected = invalid + rejected
+    if accepted:
+        review.reset_queue(request)
+
+    return JsonResponse(
+        {
+            "accepted": accepted,
+            "rejected": [{"card_id": card_id, "reason": reason} for card_id, reason in rejected],
+        }
     )
 
+
+@login_required
+def favorites_list(request):
+    favorite_list = favorites.favorites_list(request.user)
+
     words = favorite_list.words.all()
 
     context = {